@@ -1,6 +1,12 @@
 from django.contrib import admin
+from django.db import transaction
+from django.utils import timezone
 from django.utils.html import format_html
+from .author_stats import refresh_author_stats
+from .cache import bump_blog_generation, bump_comments_generation
+from .comment_counts import recompute_comment_counts
 from .models import Article, Category, Tag, Comment
+from .taxonomy_counts import recompute_taxonomy_counts
 
 
 @admin.register(Category)
@@ -56,6 +62,7 @@ class ArticleAdmin(admin.ModelAdmin):
         "published_at",
         "view_count",
         "comment_count_display",
+        "pending_comment_count",
         "created_at",
     ]
     list_filter = ["status", "created_at", "published_at", "categories"]
@@ -73,10 +80,20 @@ class ArticleAdmin(admin.ModelAdmin):
         ),
         ("Relationships", {"fields": ("author", "categories", "tags")}),
         ("Status & Dates", {"fields": ("status", "published_at")}),
-        ("Statistics", {"fields": ("view_count",), "classes": ("collapse",)}),
+        (
+            "Statistics",
+            {
+                "fields": (
+                    "view_count",
+                    "approved_comment_count",
+                    "pending_comment_count",
+                ),
+                "classes": ("collapse",),
+            },
+        ),
     )
 
-    readonly_fields = ["view_count"]
+    readonly_fields = ["view_count", "approved_comment_count", "pending_comment_count"]
     inlines = [CommentInline]
 
     def comment_count_display(self, obj):
@@ -108,8 +125,19 @@ class ArticleAdmin(admin.ModelAdmin):
         """
         Bulk action to publish selected articles.
         """
-        updated = queryset.update(status="published")
-        self.message_user(request, f"{updated} articles were published.")
+        now = timezone.now()
+        queryset.filter(published_at__isnull=True).update(published_at=now)
+        updated = queryset.filter(published_at__lte=now).update(status="published")
+        # Future-dated articles go live through publish_scheduled_articles
+        scheduled = queryset.filter(published_at__gt=now).update(status="scheduled")
+        # queryset.update() skips the signals that keep these up to date
+        recompute_taxonomy_counts()
+        refresh_author_stats(queryset.values_list("author_id", flat=True))
+        transaction.on_commit(bump_blog_generation)
+        message = f"{updated} articles were published."
+        if scheduled:
+            message += f" {scheduled} articles were scheduled."
+        self.message_user(request, message)
 
     make_published.short_description = "Publish selected articles"
 
@@ -118,6 +146,10 @@ class ArticleAdmin(admin.ModelAdmin):
         Bulk action to move selected articles back to draft status.
         """
         updated = queryset.update(status="draft")
+        # queryset.update() skips the signals that keep these up to date
+        recompute_taxonomy_counts()
+        refresh_author_stats(queryset.values_list("author_id", flat=True))
+        transaction.on_commit(bump_blog_generation)
         self.message_user(request, f"{updated} articles were moved to draft.")
 
     make_draft.short_description = "Mark selected articles as draft"
@@ -149,6 +181,7 @@ class CommentAdmin(admin.ModelAdmin):
         Bulk action to approve selected comments.
         """
         updated = queryset.update(is_approved=True)
+        self.invalidate_threads(queryset)
         self.message_user(request, f"{updated} comments were approved.")
 
     approve_comments.short_description = "Approve selected comments"
@@ -158,6 +191,21 @@ class CommentAdmin(admin.ModelAdmin):
         Bulk action to disapprove selected comments.
         """
         updated = queryset.update(is_approved=False)
+        self.invalidate_threads(queryset)
         self.message_user(request, f"{updated} comments were disapproved.")
 
     disapprove_comments.short_description = "Disapprove selected comments"
+
+    def invalidate_threads(self, queryset):
+        """
+        Refresh the comment counters and cached threads of the affected
+        articles, since queryset.update() skips the Comment signals.
+        """
+        article_ids = set(queryset.values_list("article_id", flat=True))
+        recompute_comment_counts(article_ids)
+
+        def bump():
+            for article_id in article_ids:
+                bump_comments_generation(article_id)
+
+        transaction.on_commit(bump)
@@ -0,0 +1,94 @@
+from collections import defaultdict
+
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    Max,
+    PositiveBigIntegerField,
+    Q,
+    Sum,
+    Value,
+    When,
+)
+
+from articles.models import Article, AuthorStats
+
+STATS_FIELDS = ["published_count", "total_views", "latest_published_at"]
+
+
+def refresh_author_stats(author_ids=None):
+    """
+    Recompute the rollup rows of the given authors, or of every author
+    when author_ids is None, from one aggregate query over their
+    articles. Authors left without articles keep a zeroed row. Returns
+    the number of rows written.
+    """
+    articles = Article.objects.all()
+    if author_ids is not None:
+        author_ids = {author_id for author_id in author_ids if author_id}
+        if not author_ids:
+            return 0
+        articles = articles.filter(author_id__in=author_ids)
+
+    published = Q(status="published")
+    totals = {
+        row["author_id"]: row
+        for row in articles.values("author_id")
+        .annotate(
+            published_count=Count("id", filter=published),
+            total_views=Sum("view_count", filter=published, default=0),
+            latest_published_at=Max("published_at", filter=published),
+        )
+        .order_by()
+    }
+    if author_ids is None:
+        author_ids = set(totals) | set(
+            AuthorStats.objects.values_list("author_id", flat=True)
+        )
+
+    rows = []
+    for author_id in author_ids:
+        total = totals.get(author_id, {})
+        rows.append(
+            AuthorStats(
+                author_id=author_id,
+                published_count=total.get("published_count", 0),
+                total_views=total.get("total_views", 0),
+                latest_published_at=total.get("latest_published_at"),
+            )
+        )
+    AuthorStats.objects.bulk_create(
+        rows,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=["author"],
+        update_fields=STATS_FIELDS + ["updated_at"],
+    )
+    return len(rows)
+
+
+def add_author_views(article_views):
+    """
+    Add flushed views, given as {article_id: views}, to the total_views
+    of the authors of those published articles with one UPDATE.
+    """
+    author_views = defaultdict(int)
+    articles = Article.objects.filter(
+        pk__in=list(article_views), status="published"
+    ).values_list("pk", "author_id")
+    for article_id, author_id in articles:
+        author_views[author_id] += article_views[article_id]
+    if not author_views:
+        return
+    AuthorStats.objects.filter(author_id__in=author_views).update(
+        total_views=F("total_views")
+        + Case(
+            *[
+                When(author_id=author_id, then=Value(views))
+                for author_id, views in author_views.items()
+            ],
+            default=Value(0),
+            output_field=PositiveBigIntegerField(),
+        )
+    )
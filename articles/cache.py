@@ -0,0 +1,33 @@
+from django.conf import settings
+
+from core.cache import bump_generation
+
+BLOG_NAMESPACE = "blog"
+
+BLOG_SIDEBAR_CACHE_KEY = "articles:sidebar"
+
+BLOG_SIDEBAR_CACHE_TIMEOUT = getattr(settings, "BLOG_SIDEBAR_CACHE_TIMEOUT", 10 * 60)
+
+COMMENT_THREAD_CACHE_TIMEOUT = getattr(
+    settings, "COMMENT_THREAD_CACHE_TIMEOUT", 10 * 60
+)
+
+
+def bump_blog_generation():
+    """Invalidate every cached blog-wide snapshot in one step."""
+    return bump_generation(BLOG_NAMESPACE)
+
+
+def comments_namespace(article_id):
+    """Return the generation namespace of one article's comment thread."""
+    return f"article-comments:{article_id}"
+
+
+def bump_comments_generation(article_id):
+    """Invalidate the cached comment thread of an article."""
+    return bump_generation(comments_namespace(article_id))
+
+
+def comment_thread_cache_key(article_id):
+    """Build the cache key for the rendered comment thread of an article."""
+    return f"articles:comment-thread:{article_id}"
@@ -0,0 +1,63 @@
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
+
+from articles.models import Article, Comment
+
+
+def adjust_comment_counts(article_id, approved=0, pending=0):
+    """
+    Add to the approved and pending comment counters of an article with
+    one F() update, so concurrent writers do not overwrite each other.
+    Counters never drop below zero.
+    """
+    changes = {}
+    if approved:
+        changes["approved_comment_count"] = Greatest(
+            F("approved_comment_count") + approved, 0
+        )
+    if pending:
+        changes["pending_comment_count"] = Greatest(
+            F("pending_comment_count") + pending, 0
+        )
+    if article_id is not None and changes:
+        Article.objects.filter(pk=article_id).update(**changes)
+
+
+def recompute_comment_counts(article_ids=None):
+    """
+    Rebuild the comment counters of the given articles, or of every
+    article, from one aggregate query. Returns the number of articles
+    whose counters changed.
+    """
+    articles = Article.objects.only(
+        "pk", "approved_comment_count", "pending_comment_count"
+    )
+    comments = Comment.objects.all()
+    if article_ids is not None:
+        article_ids = list(article_ids)
+        articles = articles.filter(pk__in=article_ids)
+        comments = comments.filter(article_id__in=article_ids)
+
+    counts = {
+        article_id: (approved, pending)
+        for article_id, approved, pending in comments.values_list("article_id")
+        .annotate(
+            approved=Count("id", filter=Q(is_approved=True)),
+            pending=Count("id", filter=Q(is_approved=False)),
+        )
+        .order_by()
+    }
+    stale = []
+    for article in articles.iterator(chunk_size=2000):
+        approved, pending = counts.get(article.pk, (0, 0))
+        if (article.approved_comment_count, article.pending_comment_count) != (
+            approved,
+            pending,
+        ):
+            article.approved_comment_count = approved
+            article.pending_comment_count = pending
+            stale.append(article)
+    Article.objects.bulk_update(
+        stale, ["approved_comment_count", "pending_comment_count"], batch_size=1000
+    )
+    return len(stale)
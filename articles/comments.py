@@ -0,0 +1,60 @@
+from django.template.loader import render_to_string
+
+from articles.cache import (
+    COMMENT_THREAD_CACHE_TIMEOUT,
+    comment_thread_cache_key,
+    comments_namespace,
+)
+from articles.models import Comment
+from core.cache import get_versioned, set_versioned
+
+COMMENT_THREAD_TEMPLATE = "articles/partials/comment_thread.html"
+
+
+def build_comment_tree(comments):
+    """
+    Group approved comments into threads in memory.
+
+    Returns the top-level comments, each with a thread_replies list of
+    every reply below it, in the order given. Replies
+    whose chain leads to a missing (unapproved) comment are left out.
+    """
+    by_id = {comment.pk: comment for comment in comments}
+    roots = []
+    for comment in comments:
+        comment.thread_replies = []
+        if comment.parent_id is None:
+            roots.append(comment)
+
+    for comment in comments:
+        root, seen = comment, set()
+        while root is not None and root.parent_id is not None:
+            if root.pk in seen:
+                root = None
+                break
+            seen.add(root.pk)
+            root = by_id.get(root.parent_id)
+        if root is not None and root is not comment:
+            root.thread_replies.append(comment)
+    return roots
+
+
+def get_comment_thread(article_id):
+    """
+    Return {"html": ..., "count": ...} for the approved comments of an
+    article. The thread is built from one query and cached rendered until
+    a comment of the article changes.
+    """
+    key = comment_thread_cache_key(article_id)
+    thread, generation, is_current = get_versioned(comments_namespace(article_id), key)
+    if not is_current:
+        comments = list(Comment.objects.filter(article_id=article_id, is_approved=True))
+        thread = {
+            "html": render_to_string(
+                COMMENT_THREAD_TEMPLATE, {"comments": build_comment_tree(comments)}
+            ),
+            "count": len(comments),
+        }
+        # The TTL also bounds how stale the "... ago" timestamps get
+        set_versioned(key, thread, generation, COMMENT_THREAD_CACHE_TIMEOUT)
+    return thread
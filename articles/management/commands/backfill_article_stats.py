@@ -0,0 +1,86 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.core.management.base import BaseCommand
+
+from articles.models import Article
+from articles.text_stats import text_stats_batch
+
+
+class Command(BaseCommand):
+    help = "Compute stored word counts, reading times and previews of articles"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of worker processes",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Number of articles sent to a worker at a time",
+        )
+        parser.add_argument(
+            "--missing-only",
+            action="store_true",
+            help="Only process articles without a stored word count",
+        )
+
+    def handle(self, *args, **options):
+        articles = Article.objects.order_by("pk")
+        if options["missing_only"]:
+            articles = articles.filter(word_count=0)
+
+        total = articles.count()
+        if not total:
+            self.stdout.write(self.style.SUCCESS("All article statistics are set."))
+            return
+
+        self.stdout.write(
+            f"Processing {total} articles with {options['workers']} workers..."
+        )
+
+        self.total, self.done = total, 0
+        # Keep a few batches in flight so bodies are never all in memory
+        max_pending = options["workers"] * 2
+        with ProcessPoolExecutor(max_workers=options["workers"]) as executor:
+            pending = set()
+            for batch in self.iter_batches(articles, options["batch_size"]):
+                pending.add(executor.submit(text_stats_batch, batch))
+                if len(pending) >= max_pending:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    self.save_finished(finished)
+            self.save_finished(wait(pending).done)
+
+        self.stdout.write(self.style.SUCCESS(f"Updated {self.done} articles."))
+
+    # --------------------------------------------------
+    # Helpers
+    # --------------------------------------------------
+
+    def iter_batches(self, articles, batch_size):
+        """Yield lists of (pk, content) without loading every body at once."""
+        batch = []
+        for row in articles.values_list("pk", "content").iterator(
+            chunk_size=batch_size
+        ):
+            batch.append(row)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def save_finished(self, futures):
+        """Write the statistics of finished batches, one bulk_update each."""
+        for future in futures:
+            articles = [
+                Article(pk=pk, word_count=words, reading_time=minutes, preview=preview)
+                for pk, words, minutes, preview in future.result()
+            ]
+            Article.objects.bulk_update(articles, Article.TEXT_STAT_FIELDS)
+            self.done += len(articles)
+            self.stdout.write(f"  {self.done}/{self.total} articles processed")
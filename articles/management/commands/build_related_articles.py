@@ -0,0 +1,307 @@
+import re
+import time
+from array import array
+from collections import Counter, defaultdict
+
+import numpy as np
+from scipy import sparse
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Q
+from django.utils import timezone
+
+from articles.cache import bump_blog_generation
+from articles.models import Article, RelatedArticle
+from articles.search import normalize_persian
+from articles.text_stats import plain_text
+
+# Letters-only tokens of two or more characters
+TOKEN_PATTERN = re.compile(r"[^\W\d_]{2,}")
+
+# Repeat short, descriptive fields so they outweigh body text
+FIELD_WEIGHTS = {"title": 3, "excerpt": 2, "taxonomy": 2, "content": 1}
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(normalize_persian(text).lower())
+
+
+class Command(BaseCommand):
+    help = (
+        "Build content-similar related articles from TF-IDF vectors of "
+        "published article text"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top-k",
+            type=int,
+            default=6,
+            help="Number of neighbours stored per article",
+        )
+        parser.add_argument(
+            "--min-score",
+            type=float,
+            default=0.05,
+            help="Minimum cosine similarity for a neighbour to be kept",
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help=(
+                "Only refresh articles published or edited since their last "
+                "build, and the articles they now outrank neighbours of"
+            ),
+        )
+        parser.add_argument(
+            "--watch",
+            action="store_true",
+            help=(
+                "Keep running and build incrementally every --interval "
+                "seconds, once articles are published or edited"
+            ),
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=600,
+            help="Seconds between checks while watching",
+        )
+        parser.add_argument(
+            "--block-size",
+            type=int,
+            default=500,
+            help="Articles compared against the corpus per matrix product",
+        )
+
+    def handle(self, *args, **options):
+        self.top_k = options["top_k"]
+        self.min_score = options["min_score"]
+        if not options["watch"]:
+            self.build(options["incremental"], options["block_size"])
+            return
+
+        self.stdout.write("Watching for published and edited articles...")
+        signature = None
+        while True:
+            # Vectorizing the corpus is skipped until an article is
+            # published, unpublished or edited
+            current = self.corpus_signature()
+            if current != signature:
+                self.build(incremental=True, block_size=options["block_size"])
+                signature = current
+            time.sleep(options["interval"])
+
+    # --------------------------------------------------
+    # Helpers
+    # --------------------------------------------------
+
+    def build(self, incremental, block_size):
+        # Edits saved while the build runs leave their article stale
+        started = timezone.now()
+        self.stdout.write("Vectorizing published articles...")
+        article_ids, vectors = self.build_vectors()
+        if not article_ids:
+            self.stdout.write(self.style.WARNING("No published articles found."))
+            return
+        self.stdout.write(
+            f"{len(article_ids)} articles, {vectors.shape[1]} distinct terms"
+        )
+
+        if incremental:
+            rows = self.find_stale_rows(article_ids, vectors)
+            if not rows:
+                self.stdout.write(
+                    self.style.SUCCESS("Related articles are up to date.")
+                )
+                return
+        else:
+            rows = range(len(article_ids))
+
+        self.stdout.write(f"Computing neighbours of {len(rows)} articles...")
+        written, changed = self.store_neighbours(
+            article_ids,
+            vectors,
+            list(rows),
+            block_size,
+            replace_all=not incremental,
+            built_at=started,
+        )
+        if changed:
+            # Article pages validate against the blog generation
+            bump_blog_generation()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Stored {written} related articles for {len(rows)} articles"
+                + ("." if changed else " (no links changed).")
+            )
+        )
+
+    def build_vectors(self):
+        """
+        Return the published article ids and their L2-normalised TF-IDF
+        vectors as a sparse articles x terms matrix. Term frequencies are
+        sublinear (1 + log tf) and kept in compact arrays while streaming.
+        """
+        taxonomy = defaultdict(list)
+        for relation, name_field in (("categories", "category"), ("tags", "tag")):
+            links = (
+                getattr(Article, relation)
+                .through.objects.filter(article__in=Article.published.all())
+                .values_list("article_id", f"{name_field}__name")
+            )
+            for article_id, name in links.iterator():
+                taxonomy[article_id].append(name)
+
+        vocabulary = {}
+        article_ids = []
+        indptr = array("q", [0])
+        indices = array("q")
+        weights = array("f")
+
+        articles = (
+            Article.published.with_content()
+            .order_by("pk")
+            .values_list("pk", "title", "excerpt", "content")
+        )
+        for pk, title, excerpt, content in articles.iterator(chunk_size=500):
+            fields = {
+                "title": title,
+                "excerpt": excerpt,
+                "taxonomy": " ".join(taxonomy.get(pk, ())),
+                "content": plain_text(content),
+            }
+            counts = Counter()
+            for field, text in fields.items():
+                for token in tokenize(text):
+                    counts[token] += FIELD_WEIGHTS[field]
+
+            article_ids.append(pk)
+            for token, count in counts.items():
+                indices.append(vocabulary.setdefault(token, len(vocabulary)))
+                weights.append(1 + np.log(count))
+            indptr.append(len(indices))
+
+        if not article_ids:
+            return [], None
+
+        tf = sparse.csr_matrix(
+            (
+                np.frombuffer(weights, dtype=np.float32),
+                np.frombuffer(indices, dtype=np.int64),
+                np.frombuffer(indptr, dtype=np.int64),
+            ),
+            shape=(len(article_ids), len(vocabulary)),
+        )
+        document_frequency = np.bincount(tf.indices, minlength=len(vocabulary))
+        idf = np.log((1 + len(article_ids)) / (1 + document_frequency)) + 1
+        tfidf = (tf @ sparse.diags(idf.astype(np.float32))).tocsr()
+
+        norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+        inverse_norm = sparse.diags(1 / np.maximum(norms, 1e-12))
+        return article_ids, (inverse_norm @ tfidf).tocsr()
+
+    def corpus_signature(self):
+        return Article.published.aggregate(
+            total=Count("pk"),
+            latest_edit=Max("updated_at"),
+            latest_publication=Max("published_at"),
+        )
+
+    def stale_articles(self):
+        """Published articles never built or edited since their last build."""
+        return Article.published.filter(
+            Q(related_built_at__isnull=True) | Q(updated_at__gt=F("related_built_at"))
+        )
+
+    def find_stale_rows(self, article_ids, vectors):
+        """
+        Return the rows to refresh: articles never built or edited since
+        their last build, plus articles whose weakest stored neighbour is
+        now beaten by one of those.
+        """
+        position = {pk: row for row, pk in enumerate(article_ids)}
+        stale = self.stale_articles().values_list("pk", flat=True)
+        rows = {position[pk] for pk in stale if pk in position}
+        if not rows:
+            return []
+
+        # Cosine similarity is symmetric: column j of changed x corpus is
+        # how close article j is to the changed articles
+        best_match = (vectors[sorted(rows)] @ vectors.T).max(axis=0).toarray().ravel()
+
+        thresholds = RelatedArticle.objects.values("article_id").annotate(
+            stored=Count("id"), weakest=Min("score")
+        )
+        weakest = {
+            entry["article_id"]: entry["weakest"]
+            for entry in thresholds
+            if entry["stored"] >= self.top_k
+        }
+        for pk, row in position.items():
+            if best_match[row] >= self.min_score and best_match[row] > weakest.get(
+                pk, 0
+            ):
+                rows.add(row)
+        return sorted(rows)
+
+    def store_neighbours(
+        self, article_ids, vectors, rows, block_size, replace_all, built_at
+    ):
+        """
+        Replace the stored neighbours of the given rows, comparing one
+        block of articles against the whole corpus per sparse product,
+        and date the rows' build. Returns the number of links written and
+        whether any article's list of related articles changed.
+        """
+        built_ids = [article_ids[row] for row in rows]
+        written = 0
+        with transaction.atomic():
+            previous = RelatedArticle.objects.all()
+            if not replace_all:
+                previous = previous.filter(article_id__in=built_ids)
+            before = set(previous.values_list("article_id", "related_id", "rank"))
+            previous.delete()
+            after = set()
+
+            for start in range(0, len(rows), block_size):
+                block_rows = rows[start : start + block_size]
+                similarity = (vectors[block_rows] @ vectors.T).tocsr()
+
+                batch = []
+                for offset, row in enumerate(block_rows):
+                    begin, end = (
+                        similarity.indptr[offset],
+                        similarity.indptr[offset + 1],
+                    )
+                    scores = similarity.data[begin:end]
+                    neighbours = similarity.indices[begin:end]
+
+                    keep = (neighbours != row) & (scores >= self.min_score)
+                    scores, neighbours = scores[keep], neighbours[keep]
+                    if len(scores) > self.top_k:
+                        best = np.argpartition(-scores, self.top_k)[: self.top_k]
+                    else:
+                        best = np.arange(len(scores))
+                    best = best[np.argsort(-scores[best], kind="stable")]
+
+                    for rank, position in enumerate(best, 1):
+                        batch.append(
+                            RelatedArticle(
+                                article_id=article_ids[row],
+                                related_id=article_ids[neighbours[position]],
+                                score=float(scores[position]),
+                                rank=rank,
+                            )
+                        )
+
+                RelatedArticle.objects.bulk_create(batch)
+                written += len(batch)
+                after.update(
+                    (link.article_id, link.related_id, link.rank) for link in batch
+                )
+
+            Article.objects.filter(pk__in=built_ids).update(related_built_at=built_at)
+
+        return written, before != after
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from articles.view_counts import FLUSH_BATCH_SIZE, flush_views
+
+
+class Command(BaseCommand):
+    help = "Write article views buffered in Redis into Article.view_count"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=FLUSH_BATCH_SIZE,
+            help="Number of articles updated per UPDATE statement",
+        )
+        parser.add_argument(
+            "--watch",
+            action="store_true",
+            help="Keep running and flush every --interval seconds",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=60,
+            help="Seconds between flushes while watching",
+        )
+
+    def handle(self, *args, **options):
+        self.flush(options["batch_size"])
+        if not options["watch"]:
+            return
+
+        self.stdout.write("Flushing article views...")
+        while True:
+            time.sleep(options["interval"])
+            self.flush(options["batch_size"])
+
+    # --------------------------------------------------
+    # Helpers
+    # --------------------------------------------------
+
+    def flush(self, batch_size):
+        flushed = flush_views(batch_size=batch_size)
+        if flushed:
+            self.stdout.write(self.style.SUCCESS(f"Flushed {flushed} article views."))
@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from articles.scheduler import next_publication_at, publish_due_articles
+
+
+class Command(BaseCommand):
+    help = (
+        "Publish scheduled articles whose publish date has passed. Without "
+        "--watch this catches up on every overdue article and exits"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--watch",
+            action="store_true",
+            help="Keep running and publish each article at its publish date",
+        )
+        parser.add_argument(
+            "--max-sleep",
+            type=float,
+            default=30,
+            help=(
+                "Longest pause in seconds between checks while watching, "
+                "bounding how late a newly scheduled article can go live"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        self.publish()
+        if not options["watch"]:
+            return
+
+        self.stdout.write("Watching for scheduled articles...")
+        while True:
+            time.sleep(self.seconds_until_next(options["max_sleep"]))
+            self.publish()
+
+    # --------------------------------------------------
+    # Helpers
+    # --------------------------------------------------
+
+    def publish(self):
+        published = publish_due_articles()
+        if published:
+            self.stdout.write(
+                self.style.SUCCESS(f"Published {len(published)} scheduled articles.")
+            )
+
+    def seconds_until_next(self, max_sleep):
+        """Sleep until the next publish date, but never past max_sleep."""
+        next_at = next_publication_at()
+        if next_at is None:
+            return max_sleep
+        remaining = (next_at - timezone.now()).total_seconds()
+        return min(max(remaining, 0), max_sleep)
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from articles.models import Article
+from articles.search import update_search_vectors
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search document of every article"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of articles loaded per batch",
+        )
+
+    def handle(self, *args, **options):
+        article_ids = list(Article.objects.order_by("pk").values_list("pk", flat=True))
+        batch_size = options["batch_size"]
+        for start in range(0, len(article_ids), batch_size):
+            update_search_vectors(article_ids[start : start + batch_size])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt the search index of {len(article_ids)} articles."
+            )
+        )
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from articles.author_stats import refresh_author_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the per-author article statistics rollup from the "
+        "article table, repairing any drift"
+    )
+
+    def handle(self, *args, **options):
+        written = refresh_author_stats()
+        self.stdout.write(
+            self.style.SUCCESS(f"Refreshed article statistics of {written} authors.")
+        )
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from articles.comment_counts import recompute_comment_counts
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the approved and pending comment counters of articles "
+        "from the comment table, repairing any drift"
+    )
+
+    def handle(self, *args, **options):
+        changed = recompute_comment_counts()
+        self.stdout.write(
+            self.style.SUCCESS(f"Updated comment counters of {changed} articles.")
+        )
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from articles.taxonomy_counts import recompute_taxonomy_counts
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the published article counters of blog categories and "
+        "tags from the relation tables, repairing any drift"
+    )
+
+    def handle(self, *args, **options):
+        changed = recompute_taxonomy_counts()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Updated article counters of {changed} categories and tags."
+            )
+        )
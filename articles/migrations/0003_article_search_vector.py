@@ -0,0 +1,108 @@
+# Generated by Django 5.2.9 on 2026-10-19 04:55
+
+import re
+from html import unescape
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import Value
+from django.utils.html import strip_tags
+
+# Frozen copies of the articles.search helpers as of this migration, so
+# later changes to the app code do not change what it does
+
+PERSIAN_CHARACTERS = str.maketrans(
+    {
+        "ي": "ی",
+        "ى": "ی",
+        "ك": "ک",
+        "ة": "ه",
+        "ۀ": "ه",
+        "أ": "ا",
+        "إ": "ا",
+        "ٱ": "ا",
+        "\u200c": " ",
+        "\u200f": "",
+        "\u0640": "",
+        **{chr(0x06F0 + digit): str(digit) for digit in range(10)},
+        **{chr(0x0660 + digit): str(digit) for digit in range(10)},
+    }
+)
+DIACRITICS = re.compile("[\u064b-\u065f\u0670]")
+
+
+def normalize_persian(text):
+    return DIACRITICS.sub("", (text or "").translate(PERSIAN_CHARACTERS))
+
+
+def plain_text(content):
+    text = unescape(strip_tags((content or "").replace("<", " <")))
+    return " ".join(text.split())
+
+
+def search_vector_expression(title, excerpt, content, extra):
+    weighted = (
+        (title, "A"),
+        (excerpt, "B"),
+        (plain_text(content), "C"),
+        (extra, "D"),
+    )
+    vector = None
+    for text, weight in weighted:
+        part = SearchVector(
+            Value(normalize_persian(text)), weight=weight, config="simple"
+        )
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def fill_search_vectors(apps, schema_editor):
+    """Build the search document of every existing article."""
+    Article = apps.get_model("articles", "Article")
+    Profile = apps.get_model("accounts", "Profile")
+
+    profiles = {
+        profile.user_id: (profile.first_name, profile.last_name)
+        for profile in Profile.objects.all()
+    }
+    articles = Article.objects.prefetch_related("categories", "tags")
+    for article in articles.iterator(chunk_size=500):
+        names = [category.name for category in article.categories.all()]
+        names += [tag.name for tag in article.tags.all()]
+        names += profiles.get(article.author_id, ())
+        Article.objects.filter(pk=article.pk).update(
+            search_vector=search_vector_expression(
+                article.title,
+                article.excerpt,
+                article.content,
+                " ".join(name for name in names if name),
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0002_alter_article_featured_image"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="article_search_gin"
+            ),
+        ),
+        migrations.RunPython(fill_search_vectors, migrations.RunPython.noop),
+    ]
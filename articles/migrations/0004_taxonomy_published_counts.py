@@ -0,0 +1,57 @@
+# Generated by Django 5.2.9 on 2026-10-19 04:58
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_counts(apps, schema_editor):
+    """Count the published articles of every category and tag."""
+    Article = apps.get_model("articles", "Article")
+    for model_name, relation in (("Category", "categories"), ("Tag", "tags")):
+        model = apps.get_model("articles", model_name)
+        counts = dict(
+            getattr(Article, relation)
+            .through.objects.filter(article__status="published")
+            .values_list(f"{model_name.lower()}_id")
+            .annotate(total=Count("article_id"))
+            .order_by()
+        )
+        objects = list(model.objects.all())
+        for obj in objects:
+            obj.published_article_count = counts.get(obj.pk, 0)
+        model.objects.bulk_update(objects, ["published_article_count"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0003_article_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="published_article_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="tag",
+            name="published_article_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(
+                fields=["-published_article_count"],
+                name="articles_ca_publish_ad0d9d_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tag",
+            index=models.Index(
+                fields=["-published_article_count"],
+                name="articles_ta_publish_a4d370_idx",
+            ),
+        ),
+        migrations.RunPython(fill_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.9 on 2026-10-19 05:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, Q, Sum
+
+
+def fill_stats(apps, schema_editor):
+    """Roll up the published articles of every author."""
+    Article = apps.get_model("articles", "Article")
+    AuthorStats = apps.get_model("articles", "AuthorStats")
+    published = Q(status="published")
+    totals = (
+        Article.objects.values("author_id")
+        .annotate(
+            published_count=Count("id", filter=published),
+            total_views=Sum("view_count", filter=published, default=0),
+            latest_published_at=Max("published_at", filter=published),
+        )
+        .order_by()
+    )
+    AuthorStats.objects.bulk_create(
+        [AuthorStats(**total) for total in totals], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0001_initial"),
+        ("articles", "0006_relatedarticle"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AuthorStats",
+            fields=[
+                (
+                    "author",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="article_stats",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Author",
+                    ),
+                ),
+                ("published_count", models.PositiveIntegerField(default=0)),
+                ("total_views", models.PositiveBigIntegerField(default=0)),
+                ("latest_published_at", models.DateTimeField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Author statistics",
+                "verbose_name_plural": "Author statistics",
+                "indexes": [
+                    models.Index(
+                        fields=["-published_count"],
+                        name="articles_au_publish_7933e7_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(fill_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 5.2.9 on 2026-10-19 05:09
+
+from django.db import migrations, models
+from django.db.models import Count, F, Max, Q, Sum
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+
+def schedule_future_articles(apps, schema_editor):
+    """
+    Move published articles dated in the future to scheduled and take
+    them back out of the taxonomy counters and author statistics.
+    """
+    Article = apps.get_model("articles", "Article")
+    AuthorStats = apps.get_model("articles", "AuthorStats")
+    future = Article.objects.filter(status="published", published_at__gt=timezone.now())
+    article_ids = list(future.values_list("pk", flat=True))
+    if not article_ids:
+        return
+
+    for model_name, relation in (("Category", "categories"), ("Tag", "tags")):
+        model = apps.get_model("articles", model_name)
+        column = f"{model_name.lower()}_id"
+        counts = (
+            getattr(Article, relation)
+            .through.objects.filter(article_id__in=article_ids)
+            .values_list(column)
+            .annotate(total=Count("article_id"))
+            .order_by()
+        )
+        for object_id, total in counts:
+            model.objects.filter(pk=object_id).update(
+                published_article_count=Greatest(
+                    F("published_article_count") - total, 0
+                )
+            )
+
+    author_ids = set(future.values_list("author_id", flat=True))
+    future.update(status="scheduled")
+
+    published = Q(status="published")
+    totals = {
+        row["author_id"]: row
+        for row in Article.objects.filter(author_id__in=author_ids)
+        .values("author_id")
+        .annotate(
+            published_count=Count("id", filter=published),
+            total_views=Sum("view_count", filter=published, default=0),
+            latest_published_at=Max("published_at", filter=published),
+        )
+        .order_by()
+    }
+    for author_id in author_ids:
+        total = totals.get(author_id, {})
+        AuthorStats.objects.filter(author_id=author_id).update(
+            published_count=total.get("published_count", 0),
+            total_views=total.get("total_views", 0),
+            latest_published_at=total.get("latest_published_at"),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0007_author_stats"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="article",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("draft", "Draft"),
+                    ("scheduled", "Scheduled"),
+                    ("published", "Published"),
+                ],
+                default="draft",
+                max_length=10,
+            ),
+        ),
+        migrations.RunPython(schedule_future_articles, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.9 on 2026-10-19 05:11
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def fill_counts(apps, schema_editor):
+    """Count the approved and pending comments of every article."""
+    Article = apps.get_model("articles", "Article")
+    Comment = apps.get_model("articles", "Comment")
+    counts = {
+        article_id: (approved, pending)
+        for article_id, approved, pending in Comment.objects.values_list("article_id")
+        .annotate(
+            approved=Count("id", filter=Q(is_approved=True)),
+            pending=Count("id", filter=Q(is_approved=False)),
+        )
+        .order_by()
+    }
+    articles = list(Article.objects.filter(pk__in=counts).only("pk"))
+    for article in articles:
+        article.approved_comment_count, article.pending_comment_count = counts[
+            article.pk
+        ]
+    Article.objects.bulk_update(
+        articles, ["approved_comment_count", "pending_comment_count"], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0008_scheduled_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="approved_comment_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="pending_comment_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_counts, migrations.RunPython.noop),
+    ]
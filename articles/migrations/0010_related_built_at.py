@@ -0,0 +1,33 @@
+# Generated by Django 5.2.9 on 2026-10-19 05:42
+
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+
+
+def fill_built_at(apps, schema_editor):
+    """Date the articles that already have neighbours by their last build."""
+    Article = apps.get_model("articles", "Article")
+    RelatedArticle = apps.get_model("articles", "RelatedArticle")
+    last_build = (
+        RelatedArticle.objects.filter(article=OuterRef("pk"))
+        .values("article")
+        .annotate(built_at=Max("computed_at"))
+        .values("built_at")
+    )
+    Article.objects.update(related_built_at=Subquery(last_build))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0009_comment_counts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="related_built_at",
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(fill_built_at, migrations.RunPython.noop),
+    ]
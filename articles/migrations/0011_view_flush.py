@@ -0,0 +1,33 @@
+# Generated by Django 5.2.9 on 2026-10-19 05:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0010_related_built_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ViewFlush",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("token", models.CharField(max_length=32, unique=True)),
+                ("flushed_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "View flush",
+                "verbose_name_plural": "View flushes",
+            },
+        ),
+    ]
@@ -1,13 +1,18 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.urls import reverse
 from django.utils.text import slugify
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 
+from articles.text_stats import text_stats
+from core.models import CounterFieldsMixin
+
 User = get_user_model()
 
 
-class Category(models.Model):
+class Category(CounterFieldsMixin, models.Model):
     """
     Represents a high-level classification for organizing articles.
     """
@@ -24,10 +29,18 @@ class Category(models.Model):
     # Timestamp when the category is created
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Published articles filed here, maintained by articles.taxonomy_counts
+    published_article_count = models.PositiveIntegerField(default=0, editable=False)
+
+    COUNTER_FIELDS = ("published_article_count",)
+
     class Meta:
         verbose_name = "Category"
         verbose_name_plural = "Categories"
         ordering = ["name"]
+        indexes = [
+            models.Index(fields=["-published_article_count"]),
+        ]
 
     def save(self, *args, **kwargs):
         """
@@ -43,7 +56,7 @@ class Category(models.Model):
         return self.name
 
 
-class Tag(models.Model):
+class Tag(CounterFieldsMixin, models.Model):
     """
     Represents a keyword or label used for finer-grained
     classification of articles.
@@ -58,10 +71,18 @@ class Tag(models.Model):
     # Timestamp when the tag is created
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Published articles filed here, maintained by articles.taxonomy_counts
+    published_article_count = models.PositiveIntegerField(default=0, editable=False)
+
+    COUNTER_FIELDS = ("published_article_count",)
+
     class Meta:
         verbose_name = "Tag"
         verbose_name_plural = "Tags"
         ordering = ["name"]
+        indexes = [
+            models.Index(fields=["-published_article_count"]),
+        ]
 
     def save(self, *args, **kwargs):
         """
@@ -82,16 +103,19 @@ class PublishedManager(models.Manager):
     Custom manager that limits the queryset to only published
     """
 
-    # Custom manager to return only published articles
+    # Custom manager to return only published articles; listings never
+    # show the body, so it is only loaded on request. Future-dated
+    # articles wait as "scheduled" until publish_scheduled_articles
+    # flips them, so no now() predicate is needed.
     def get_queryset(self):
-        return (
-            super()
-            .get_queryset()
-            .filter(status="published", published_at__lte=timezone.now())
-        )
+        return self.with_content().defer("content")
 
+    def with_content(self):
+        """Published articles with their body loaded, for detail pages."""
+        return super().get_queryset().filter(status="published").defer("search_vector")
 
-class Article(models.Model):
+
+class Article(CounterFieldsMixin, models.Model):
     """
     Core content model representing a blog/article entry.
     """
@@ -99,6 +123,7 @@ class Article(models.Model):
     # Possible publication states of an article
     STATUS_CHOICES = (
         ("draft", "Draft"),
+        ("scheduled", "Scheduled"),
         ("published", "Published"),
     )
 
@@ -154,9 +179,31 @@ class Article(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     published_at = models.DateTimeField(null=True, blank=True)
 
-    # Number of times the article has been viewed
+    # Body statistics computed on save, so listings never tokenize content
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time = models.PositiveSmallIntegerField(default=1, editable=False)
+    preview = models.TextField(blank=True, editable=False)
+
+    TEXT_STAT_FIELDS = ("word_count", "reading_time", "preview")
+
+    # Number of times the article has been viewed, flushed in bulk from
+    # Redis by articles.view_counts
     view_count = models.PositiveIntegerField(default=0)
 
+    # Comments shown on the article and comments awaiting moderation,
+    # maintained by articles.comment_counts
+    approved_comment_count = models.PositiveIntegerField(default=0, editable=False)
+    pending_comment_count = models.PositiveIntegerField(default=0, editable=False)
+
+    COUNTER_FIELDS = ("view_count", "approved_comment_count", "pending_comment_count")
+
+    # Weighted full-text document, maintained by articles.search
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    # When build_related_articles last computed the article's neighbours,
+    # including builds that found none similar enough to keep
+    related_built_at = models.DateTimeField(null=True, editable=False)
+
     # Default and custom managers
     objects = models.Manager()
     published = PublishedManager()
@@ -169,6 +216,7 @@ class Article(models.Model):
             models.Index(fields=["-published_at"]),
             models.Index(fields=["status"]),
             models.Index(fields=["slug"]),
+            GinIndex(fields=["search_vector"], name="article_search_gin"),
         ]
 
     def save(self, *args, **kwargs):
@@ -176,14 +224,31 @@ class Article(models.Model):
         Override save method to:
         - Auto-generate slug from title if missing.
         - Automatically set publication date when status becomes published.
+        - Hold future-dated articles as scheduled until their publish date.
         """
         # Generate slug from title if missing
         if not self.slug:
             self.slug = slugify(self.title, allow_unicode=True)
 
-        # Automatically set publish date when publishing
-        if self.status == "published" and not self.published_at:
-            self.published_at = timezone.now()
+        # Automatically set publish date when publishing, and schedule
+        # articles dated in the future instead of publishing them
+        if self.status in ("published", "scheduled"):
+            now = timezone.now()
+            if not self.published_at:
+                self.published_at = now
+            self.status = "scheduled" if self.published_at > now else "published"
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "status" in update_fields:
+            update_fields = kwargs["update_fields"] = {*update_fields, "published_at"}
+
+        # Refresh body statistics whenever the body is written
+        if "content" not in self.get_deferred_fields() and (
+            update_fields is None or "content" in update_fields
+        ):
+            self.word_count, self.reading_time, self.preview = text_stats(self.content)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, *self.TEXT_STAT_FIELDS}
 
         super().save(*args, **kwargs)
 
@@ -200,12 +265,14 @@ class Article(models.Model):
 
     def increment_view_count(self):
         """
-        Atomically increment the view counter using F expression
+        Buffer one view in Redis; the buffered views are written to
+        view_count in bulk by the flush_article_views command.
         """
-        # Atomically increment view counter
-        self.view_count = models.F("view_count") + 1
-        self.save(update_fields=["view_count"])
-        self.refresh_from_db()
+        from articles.view_counts import record_view
+
+        # Reflect the view locally without touching the database row
+        record_view(self.pk)
+        self.view_count += 1
 
     def get_approved_comments(self):
         """
@@ -216,18 +283,15 @@ class Article(models.Model):
 
     def get_comment_count(self):
         """Return count of approved comments."""
-        # Count approved comments
-        return self.comments.filter(is_approved=True).count()
+        # Stored on the article, so listings need no per-row COUNT
+        return self.approved_comment_count
 
     def get_reading_time(self):
         """
-        Estimate reading time based on average reading speed
-        of 200 words per minute.
+        Return the reading time stored on save, based on an average
+        reading speed of 200 words per minute.
         """
-        # Estimate reading time assuming 200 words per minute
-        word_count = len(self.content.split())
-        minutes = word_count // 200
-        return max(1, minutes)
+        return self.reading_time
 
 
 class Comment(models.Model):
@@ -283,3 +347,98 @@ class Comment(models.Model):
         """Return approved child comments."""
         # Return approved child comments
         return self.replies.filter(is_approved=True)
+
+
+class RelatedArticle(models.Model):
+    """
+    Precomputed content-similar neighbour of an article.
+    Rebuilt offline by the build_related_articles management command.
+    """
+
+    # Article the neighbour is shown for
+    article = models.ForeignKey(
+        Article,
+        on_delete=models.CASCADE,
+        related_name="related_links",
+        verbose_name="Article",
+    )
+
+    # Similar article shown as related
+    related = models.ForeignKey(
+        Article,
+        on_delete=models.CASCADE,
+        related_name="neighbour_links",
+        verbose_name="Related article",
+    )
+
+    # Cosine similarity of the TF-IDF vectors and position in the list
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    # When the neighbours of the article were last computed
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Related article"
+        verbose_name_plural = "Related articles"
+        ordering = ["article", "rank"]
+        unique_together = ("article", "rank")
+
+    def __str__(self):
+        """Return readable representation of the pair."""
+        return f"{self.article_id} -> {self.related_id}"
+
+
+class AuthorStats(models.Model):
+    """
+    Rollup of an author's published articles, one row per author.
+    Kept up to date on publish events and view-count flushes, so author
+    pages and top-author widgets never aggregate the article table.
+    """
+
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="article_stats",
+        verbose_name="Author",
+    )
+
+    # Published articles and the views they have collected
+    published_count = models.PositiveIntegerField(default=0)
+    total_views = models.PositiveBigIntegerField(default=0)
+
+    # Publish date of the author's newest published article
+    latest_published_at = models.DateTimeField(null=True, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Author statistics"
+        verbose_name_plural = "Author statistics"
+        indexes = [
+            models.Index(fields=["-published_count"]),
+        ]
+
+    def __str__(self):
+        """Return readable representation of the rollup."""
+        return f"{self.author} ({self.published_count})"
+
+
+class ViewFlush(models.Model):
+    """
+    Token of a buffered batch of article views already added to
+    view_count, so a flush interrupted after committing is never applied
+    twice. Recorded in the same transaction as the counts.
+    """
+
+    token = models.CharField(max_length=32, unique=True)
+    flushed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "View flush"
+        verbose_name_plural = "View flushes"
+
+    def __str__(self):
+        """Return readable representation of the flush."""
+        return self.token
@@ -0,0 +1,26 @@
+from articles.models import Article
+
+
+def get_related_articles(article, limit=3):
+    """
+    Return up to limit published articles similar in content to article,
+    best match first.
+
+    Neighbours come from the precomputed related-articles table with a
+    single indexed query. Articles published since the last build fall
+    back to recent articles sharing a category.
+    """
+    related = list(
+        Article.published.filter(neighbour_links__article=article).order_by(
+            "neighbour_links__rank"
+        )[:limit]
+    )
+    if related:
+        return related
+
+    return list(
+        Article.published.filter(categories__in=article.categories.all())
+        .exclude(pk=article.pk)
+        .distinct()
+        .order_by("-published_at")[:limit]
+    )
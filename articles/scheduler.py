@@ -0,0 +1,40 @@
+from django.db import transaction
+from django.utils import timezone
+
+from articles.models import Article
+
+
+def publish_due_articles(now=None):
+    """
+    Publish every scheduled article whose publish date has passed and
+    return their ids.
+
+    Each article is saved on its own so the usual signals update the
+    taxonomy counters, author statistics and search index, and bump the
+    blog generation once the flip commits. Rows are locked with SKIP
+    LOCKED, so overlapping runs never publish an article twice.
+    """
+    now = now or timezone.now()
+    published = []
+    with transaction.atomic():
+        due = (
+            Article.objects.filter(status="scheduled", published_at__lte=now)
+            .defer("content", "search_vector")
+            .select_for_update(skip_locked=True)
+            .order_by("published_at")
+        )
+        for article in due:
+            article.status = "published"
+            article.save(update_fields=["status"])
+            published.append(article.pk)
+    return published
+
+
+def next_publication_at():
+    """Return the publish date of the next scheduled article, or None."""
+    return (
+        Article.objects.filter(status="scheduled")
+        .order_by("published_at")
+        .values_list("published_at", flat=True)
+        .first()
+    )
@@ -0,0 +1,145 @@
+import re
+
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+)
+from django.db.models import F, Func, TextField, Value
+
+from articles.models import Article
+from articles.text_stats import plain_text
+
+# Postgres ships no Persian stemmer; "simple" lowercases and keeps words
+SEARCH_CONFIG = "simple"
+
+# Markers around matched words in headlines, swapped for <mark> after
+# the rest of the snippet has been escaped
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_STOP = "\x03"
+
+# Arabic code points that Persian keyboards and pasted text mix in
+PERSIAN_CHARACTERS = str.maketrans(
+    {
+        "ي": "ی",
+        "ى": "ی",
+        "ك": "ک",
+        "ة": "ه",
+        "ۀ": "ه",
+        "أ": "ا",
+        "إ": "ا",
+        "ٱ": "ا",
+        "\u200c": " ",  # zero-width non-joiner
+        "\u200f": "",  # right-to-left mark
+        "\u0640": "",  # tatweel
+        **{chr(0x06F0 + digit): str(digit) for digit in range(10)},
+        **{chr(0x0660 + digit): str(digit) for digit in range(10)},
+    }
+)
+DIACRITICS = re.compile("[\u064b-\u065f\u0670]")
+
+
+def normalize_persian(text):
+    """
+    Fold the spelling variants of Persian text to one form so the same
+    word matches however it was typed.
+    """
+    return DIACRITICS.sub("", (text or "").translate(PERSIAN_CHARACTERS))
+
+
+# normalize_persian() as translate() arguments; characters of the first
+# string past the length of the second are deleted
+_REPLACED = {chr(code): target for code, target in PERSIAN_CHARACTERS.items() if target}
+_DELETED = [chr(code) for code, target in PERSIAN_CHARACTERS.items() if not target]
+_DELETED += [chr(code) for code in range(0x064B, 0x0660)] + ["\u0670"]
+SQL_TRANSLATE_FROM = "".join(_REPLACED) + "".join(_DELETED)
+SQL_TRANSLATE_TO = "".join(_REPLACED.values())
+
+
+def normalize_persian_sql(expression):
+    """Apply normalize_persian() to a text column inside the database."""
+    return Func(
+        expression,
+        Value(SQL_TRANSLATE_FROM),
+        Value(SQL_TRANSLATE_TO),
+        function="translate",
+        output_field=TextField(),
+    )
+
+
+def search_vector_expression(title, excerpt, content, extra):
+    """
+    Build the weighted search document of an article: title (A) ranks
+    above excerpt (B), body (C), then categories, tags and author (D).
+    """
+    weighted = (
+        (title, "A"),
+        (excerpt, "B"),
+        (plain_text(content), "C"),
+        (extra, "D"),
+    )
+    vector = None
+    for text, weight in weighted:
+        part = SearchVector(
+            Value(normalize_persian(text)), weight=weight, config=SEARCH_CONFIG
+        )
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def update_search_vectors(article_ids):
+    """Rebuild the stored search document of the given articles."""
+    articles = (
+        Article.objects.filter(pk__in=list(article_ids))
+        .select_related("author__user_profile")
+        .prefetch_related("categories", "tags")
+    )
+    for article in articles:
+        Article.objects.filter(pk=article.pk).update(
+            search_vector=search_vector_expression(
+                article.title,
+                article.excerpt,
+                article.content,
+                taxonomy_text(article),
+            )
+        )
+
+
+def taxonomy_text(article):
+    """Return category, tag and author names of an article as one string."""
+    names = [category.name for category in article.categories.all()]
+    names += [tag.name for tag in article.tags.all()]
+    profile = getattr(article.author, "user_profile", None)
+    if profile is not None:
+        names += [profile.first_name, profile.last_name]
+    return " ".join(name for name in names if name)
+
+
+def search_articles(queryset, query):
+    """
+    Filter articles matching a web-style query (quoted phrases, "or",
+    -excluded words) against the GIN-indexed search document, best
+    matches first, each with a highlighted excerpt as `headline`.
+    """
+    search_query = SearchQuery(
+        normalize_persian(query), search_type="websearch", config=SEARCH_CONFIG
+    )
+    return (
+        queryset.filter(search_vector=search_query)
+        .annotate(
+            rank=SearchRank(F("search_vector"), search_query),
+            # Highlight the normalized excerpt so matches of every
+            # spelling variant are marked, as they are in the vector
+            headline=SearchHeadline(
+                normalize_persian_sql(F("excerpt")),
+                search_query,
+                config=SEARCH_CONFIG,
+                start_sel=HIGHLIGHT_START,
+                stop_sel=HIGHLIGHT_STOP,
+                max_words=35,
+                min_words=15,
+            ),
+        )
+        .order_by("-rank", "-published_at")
+    )
@@ -0,0 +1,75 @@
+from django.contrib.auth import get_user_model
+from django.db.models import F, prefetch_related_objects
+
+from articles.cache import (
+    BLOG_NAMESPACE,
+    BLOG_SIDEBAR_CACHE_KEY,
+    BLOG_SIDEBAR_CACHE_TIMEOUT,
+)
+from articles.models import Article, Category, Tag
+from core.cache import claim_rebuild, get_versioned, set_versioned
+from core.trending import get_trending
+
+User = get_user_model()
+
+
+def get_blog_sidebar():
+    """
+    Return the blog sidebar snapshot: the featured, secondary, top, trending
+    and latest articles plus categories, tags and authors with counts.
+
+    The snapshot is the same for every visitor, so it is read with one cache
+    round-trip. Publishing changes bump the blog generation; a stale snapshot
+    keeps being served while one request rebuilds it, and the TTL refreshes
+    the view-count and trending rankings.
+    """
+    snapshot, generation, is_current = get_versioned(
+        BLOG_NAMESPACE, BLOG_SIDEBAR_CACHE_KEY
+    )
+    if snapshot is None or (not is_current and claim_rebuild(BLOG_SIDEBAR_CACHE_KEY)):
+        snapshot = build_blog_sidebar()
+        set_versioned(
+            BLOG_SIDEBAR_CACHE_KEY, snapshot, generation, BLOG_SIDEBAR_CACHE_TIMEOUT
+        )
+    return snapshot
+
+
+def build_blog_sidebar():
+    """
+    Query every sidebar list; the articles share one categories prefetch
+    and authors are read from their AuthorStats rollup.
+    Top stories rank the last week and trending the last day by decayed
+    views, filled from all-time views and recency until enough are seen.
+    """
+    articles = Article.published.select_related("author__user_profile")
+    most_viewed = list(articles.order_by("-view_count")[:5])
+    top_stories = get_trending(
+        "articles", articles, 5, window="7d", fallback=articles.order_by("-view_count")
+    )
+    trending = get_trending(
+        "articles", articles, 5, window="24h", fallback=articles.order_by("-created_at")
+    )
+    latest = list(articles.order_by("-published_at")[:5])
+    prefetch_related_objects(
+        most_viewed + top_stories + trending + latest, "categories"
+    )
+
+    return {
+        "featured_article": most_viewed[0] if most_viewed else None,
+        "secondary_articles": most_viewed[1:3],
+        "top_stories": top_stories,
+        "trending_articles": trending,
+        "latest_articles": latest,
+        "all_categories": list(Category.objects.filter(published_article_count__gt=0)),
+        "all_tags": list(
+            Tag.objects.filter(published_article_count__gt=0).order_by(
+                "-published_article_count"
+            )[:20]
+        ),
+        "active_authors": list(
+            User.objects.filter(article_stats__published_count__gt=0)
+            .annotate(article_count=F("article_stats__published_count"))
+            .select_related("user_profile")
+            .order_by("-article_count")[:10]
+        ),
+    }
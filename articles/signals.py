@@ -0,0 +1,240 @@
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from accounts.models import Profile
+from articles.author_stats import refresh_author_stats
+from articles.cache import bump_blog_generation, bump_comments_generation
+from articles.comment_counts import adjust_comment_counts
+from articles.models import Article, Category, Comment, Tag
+from articles.search import update_search_vectors
+from articles.taxonomy_counts import (
+    TAXONOMY_RELATIONS,
+    adjust_article_taxonomy,
+    adjust_published_count,
+    count_published,
+)
+
+# Fields that feed the search document of an article or its author
+SEARCH_FIELDS = {"title", "excerpt", "content"}
+AUTHOR_NAME_FIELDS = {"first_name", "last_name"}
+
+# Fields that decide whether and when an article counts for its author
+PUBLICATION_FIELDS = {"author", "status", "published_at"}
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(m2m_changed, sender=Article.categories.through)
+@receiver(m2m_changed, sender=Article.tags.through)
+def invalidate_blog_cache(sender, **kwargs):
+    """
+    Bump the blog generation once the write is committed so the cached
+    sidebar snapshot is rebuilt.
+    """
+    transaction.on_commit(bump_blog_generation)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_thread(sender, instance, **kwargs):
+    """
+    Bump the comment generation of the article once the write is
+    committed so its cached thread is rebuilt.
+    """
+    article_id = instance.article_id
+    transaction.on_commit(lambda: bump_comments_generation(article_id))
+
+
+def count_comment(article_id, is_approved, delta):
+    """Move one comment in or out of its article's counters."""
+    if is_approved:
+        adjust_comment_counts(article_id, approved=delta)
+    else:
+        adjust_comment_counts(article_id, pending=delta)
+
+
+@receiver(pre_save, sender=Comment)
+def remember_moderation(sender, instance, **kwargs):
+    """Note the article and approval of the comment before this save."""
+    instance._previous_moderation = None
+    if instance.pk is not None:
+        instance._previous_moderation = (
+            Comment.objects.filter(pk=instance.pk)
+            .values_list("article_id", "is_approved")
+            .first()
+        )
+
+
+@receiver(post_save, sender=Comment)
+def update_comment_counts(sender, instance, **kwargs):
+    """Count a new comment, or move an approved or moved one."""
+    current = (instance.article_id, instance.is_approved)
+    previous = getattr(instance, "_previous_moderation", None)
+    if previous == current:
+        return
+    if previous is not None:
+        count_comment(*previous, -1)
+    count_comment(*current, 1)
+
+
+@receiver(pre_delete, sender=Comment)
+def discount_deleted_comment(sender, instance, **kwargs):
+    """
+    Take a deleted comment, or a reply deleted with it, out of the
+    counters. The stored state is read, since the instance may predate
+    a bulk approval.
+    """
+    stored = (
+        Comment.objects.filter(pk=instance.pk)
+        .values_list("article_id", "is_approved")
+        .first()
+    )
+    if stored is not None:
+        count_comment(*stored, -1)
+
+
+def reindex_on_commit(article_ids):
+    """Rebuild search documents once the surrounding write commits."""
+    article_ids = list(article_ids)
+    if article_ids:
+        transaction.on_commit(lambda: update_search_vectors(article_ids))
+
+
+@receiver(post_save, sender=Article)
+def reindex_article(sender, instance, update_fields=None, **kwargs):
+    """Refresh the search document when searchable text changes."""
+    if update_fields is None or SEARCH_FIELDS & set(update_fields):
+        reindex_on_commit([instance.pk])
+
+
+@receiver(m2m_changed, sender=Article.categories.through)
+@receiver(m2m_changed, sender=Article.tags.through)
+def reindex_article_taxonomy(sender, instance, action, reverse, pk_set, **kwargs):
+    """Refresh search documents when categories or tags are (un)assigned."""
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            reindex_on_commit([instance.pk])
+    elif action in ("post_add", "post_remove"):
+        reindex_on_commit(pk_set)
+    elif action == "pre_clear":
+        # Read the articles before the category or tag lets go of them
+        reindex_on_commit(instance.articles.values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Tag)
+def reindex_renamed_taxonomy(sender, instance, created, **kwargs):
+    """Refresh the articles of a category or tag that may have been renamed."""
+    if not created:
+        reindex_on_commit(instance.articles.values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=Profile)
+def reindex_author(sender, instance, created, update_fields=None, **kwargs):
+    """Refresh the articles of an author whose name may have changed."""
+    if created:
+        return
+    if update_fields is not None and not AUTHOR_NAME_FIELDS & set(update_fields):
+        return
+    reindex_on_commit(
+        Article.objects.filter(author_id=instance.user_id).values_list("pk", flat=True)
+    )
+
+
+@receiver(pre_save, sender=Article)
+def remember_publication(sender, instance, update_fields=None, **kwargs):
+    """Note the publication state and author of the article before this save."""
+    if update_fields is not None and not PUBLICATION_FIELDS & set(update_fields):
+        instance._was_published = instance.status == "published"
+        instance._previous_publication = (
+            instance.author_id,
+            instance.status,
+            instance.published_at,
+        )
+        return
+    previous = None
+    if instance.pk is not None:
+        previous = (
+            Article.objects.filter(pk=instance.pk)
+            .values_list("author_id", "status", "published_at")
+            .first()
+        )
+    instance._was_published = previous is not None and previous[1] == "published"
+    instance._previous_publication = previous
+
+
+@receiver(post_save, sender=Article)
+def update_taxonomy_counts(sender, instance, created, **kwargs):
+    """Move the article in or out of its categories' and tags' counters."""
+    is_published = instance.status == "published"
+    if not created and is_published != getattr(instance, "_was_published", False):
+        adjust_article_taxonomy(instance, 1 if is_published else -1)
+
+
+@receiver(post_save, sender=Article)
+def update_author_stats(sender, instance, created, **kwargs):
+    """
+    Refresh the rollup of the article's author, and of its previous
+    author, once a change to its publication is committed.
+    """
+    current = (instance.author_id, instance.status, instance.published_at)
+    previous = getattr(instance, "_previous_publication", None)
+    if current == previous or (previous is None and instance.status != "published"):
+        return
+    author_ids = {instance.author_id, previous[0] if previous else None}
+    transaction.on_commit(lambda: refresh_author_stats(author_ids))
+
+
+@receiver(post_delete, sender=Article)
+def update_author_stats_on_delete(sender, instance, **kwargs):
+    """Refresh the rollup of the author of a deleted published article."""
+    if instance.status == "published":
+        author_id = instance.author_id
+        transaction.on_commit(lambda: refresh_author_stats([author_id]))
+
+
+@receiver(pre_delete, sender=Article)
+def discount_deleted_article(sender, instance, **kwargs):
+    """Take a published article out of the counters before its links go."""
+    if instance.status == "published":
+        adjust_article_taxonomy(instance, -1)
+
+
+@receiver(m2m_changed, sender=Article.categories.through)
+@receiver(m2m_changed, sender=Article.tags.through)
+def update_taxonomy_counts_on_assign(
+    sender, instance, action, reverse, model, pk_set, **kwargs
+):
+    """Count published articles in or out as categories and tags change."""
+    if not reverse:
+        # instance is an article, pk_set holds category or tag ids
+        if instance.status != "published":
+            return
+        if action == "pre_clear":
+            relation = getattr(instance, TAXONOMY_RELATIONS[model])
+            instance._cleared_taxonomy_ids = list(relation.values_list("pk", flat=True))
+        elif action == "post_clear":
+            adjust_published_count(model, instance._cleared_taxonomy_ids, -1)
+        elif action in ("post_add", "post_remove"):
+            adjust_published_count(model, pk_set, 1 if action == "post_add" else -1)
+        return
+
+    # instance is a category or tag, pk_set holds article ids
+    taxonomy = type(instance)
+    if action == "post_add":
+        adjust_published_count(taxonomy, [instance.pk], count_published(pk_set))
+    elif action == "post_remove":
+        adjust_published_count(taxonomy, [instance.pk], -count_published(pk_set))
+    elif action == "post_clear":
+        taxonomy.objects.filter(pk=instance.pk).update(published_article_count=0)
@@ -10,9 +10,14 @@ class ArticleSitemap(Sitemap):
     changefreq = "weekly"
     priority = 0.9  # High priority for articles
 
+    # Read by the generate_sitemaps command, which builds locations
+    # from slugs without loading model rows
+    url_name = "articles:article_detail"
+    lastmod_field = "updated_at"
+
     def items(self):
         # Using your custom 'published' manager to only index live articles
-        return Article.published.all()
+        return Article.published.only("slug", "updated_at")
 
     def lastmod(self, obj):
         # Returns the last update time
@@ -0,0 +1,62 @@
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+
+from articles.models import Article, Category, Tag
+
+TAXONOMY_RELATIONS = {Category: "categories", Tag: "tags"}
+
+
+def adjust_published_count(model, object_ids, delta):
+    """
+    Add delta published articles to categories or tags with one F()
+    update, so concurrent writers do not overwrite each other. The
+    counter never drops below zero.
+    """
+    object_ids = list(object_ids)
+    if not object_ids or not delta:
+        return
+    model.objects.filter(pk__in=object_ids).update(
+        published_article_count=Greatest(F("published_article_count") + delta, 0)
+    )
+
+
+def adjust_article_taxonomy(article, delta):
+    """Add delta to the counters of every category and tag of an article."""
+    for model, relation in TAXONOMY_RELATIONS.items():
+        adjust_published_count(
+            model,
+            getattr(article, relation).values_list("pk", flat=True),
+            delta,
+        )
+
+
+def count_published(article_ids):
+    """Return how many of the given articles are published."""
+    return Article.objects.filter(pk__in=article_ids, status="published").count()
+
+
+def recompute_taxonomy_counts():
+    """
+    Rebuild the counters of every category and tag from the relation
+    tables, one aggregate query per model. Returns the number of rows
+    whose counter changed.
+    """
+    changed = 0
+    for model, relation in TAXONOMY_RELATIONS.items():
+        through = getattr(Article, relation).through
+        column = f"{model._meta.model_name}_id"
+        counts = dict(
+            through.objects.filter(article__status="published")
+            .values_list(column)
+            .annotate(total=Count("article_id"))
+            .order_by()
+        )
+        stale = []
+        for obj in model.objects.only("pk", "published_article_count"):
+            count = counts.get(obj.pk, 0)
+            if obj.published_article_count != count:
+                obj.published_article_count = count
+                stale.append(obj)
+        model.objects.bulk_update(stale, ["published_article_count"], batch_size=1000)
+        changed += len(stale)
+    return changed
@@ -1,9 +1,14 @@
 from django import template
 from django.utils.safestring import mark_safe
-from django.db.models import Count, Q
+from django.db.models import F
+
+from core.cache import get_random_items
+from core.trending import get_trending
 
 # import markdown
+from ..cache import BLOG_NAMESPACE
 from ..models import Article, Category, Tag
+from ..text_stats import text_stats
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -24,59 +29,41 @@ def total_articles():
 @register.simple_tag
 def total_categories():
     """Return the number of active categories with published articles."""
-    return (
-        Category.objects.annotate(
-            article_count=Count("articles", filter=Q(articles__status="published"))
-        )
-        .filter(article_count__gt=0)
-        .count()
-    )
+    return Category.objects.filter(published_article_count__gt=0).count()
 
 
 @register.simple_tag
 def total_tags():
     """Return the number of active tags with published articles."""
-    return (
-        Tag.objects.annotate(
-            article_count=Count("articles", filter=Q(articles__status="published"))
-        )
-        .filter(article_count__gt=0)
-        .count()
-    )
+    return Tag.objects.filter(published_article_count__gt=0).count()
 
 
 @register.simple_tag
 def get_categories_with_count():
-    """Return categories annotated with their published article count."""
-    return (
-        Category.objects.annotate(
-            article_count=Count("articles", filter=Q(articles__status="published"))
-        )
-        .filter(article_count__gt=0)
-        .order_by("-article_count")
+    """Return categories with published articles, most used first."""
+    return Category.objects.filter(published_article_count__gt=0).order_by(
+        "-published_article_count"
     )
 
 
 @register.simple_tag
 def get_tags_with_count(limit=20):
-    """Return tags annotated with their published article count."""
-    return (
-        Tag.objects.annotate(
-            article_count=Count("articles", filter=Q(articles__status="published"))
-        )
-        .filter(article_count__gt=0)
-        .order_by("-article_count")[:limit]
-    )
+    """Return tags with published articles, most used first."""
+    return Tag.objects.filter(published_article_count__gt=0).order_by(
+        "-published_article_count"
+    )[:limit]
 
 
 @register.simple_tag
 def get_top_authors(limit=10):
     """Return top authors ordered by number of published articles."""
     return (
-        User.objects.filter(articles__status="published")
-        .annotate(article_count=Count("articles"))
-        .order_by("-article_count")
-        .distinct()[:limit]
+        User.objects.filter(article_stats__published_count__gt=0)
+        .annotate(
+            article_count=F("article_stats__published_count"),
+            total_views=F("article_stats__total_views"),
+        )
+        .order_by("-article_count")[:limit]
     )
 
 
@@ -93,15 +80,23 @@ def get_latest_articles(limit=5):
 
 
 @register.simple_tag
-def get_trending_articles(limit=5):
-    """Return trending articles based on creation date."""
-    return Article.published.order_by("-created_at")[:limit]
+def get_trending_articles(limit=5, window="24h"):
+    """Return articles ranked by time-decayed views, newest filling in."""
+    return get_trending(
+        "articles",
+        Article.published.all(),
+        limit,
+        window=window,
+        fallback=Article.published.order_by("-created_at"),
+    )
 
 
 @register.simple_tag
 def get_random_articles(limit=3):
-    """Return random published articles."""
-    return Article.published.order_by("?")[:limit]
+    """Return random published articles, sampled from a cached id pool."""
+    return get_random_items(
+        "articles:published", BLOG_NAMESPACE, Article.published.all(), limit
+    )
 
 
 # ==========================================
@@ -128,12 +123,8 @@ def show_popular_articles(count=5):
 @register.inclusion_tag("articles/partials/categories_widget.html")
 def show_categories_widget():
     """Render widget displaying active categories."""
-    categories = (
-        Category.objects.annotate(
-            article_count=Count("articles", filter=Q(articles__status="published"))
-        )
-        .filter(article_count__gt=0)
-        .order_by("-article_count")
+    categories = Category.objects.filter(published_article_count__gt=0).order_by(
+        "-published_article_count"
     )
     return {"categories": categories}
 
@@ -141,13 +132,9 @@ def show_categories_widget():
 @register.inclusion_tag("articles/partials/tags_cloud.html")
 def show_tags_cloud(limit=30):
     """Render tag cloud widget."""
-    tags = (
-        Tag.objects.annotate(
-            article_count=Count("articles", filter=Q(articles__status="published"))
-        )
-        .filter(article_count__gt=0)
-        .order_by("-article_count")[:limit]
-    )
+    tags = Tag.objects.filter(published_article_count__gt=0).order_by(
+        "-published_article_count"
+    )[:limit]
     return {"tags": tags}
 
 
@@ -175,17 +162,19 @@ def show_breadcrumb(context):
 
 @register.filter
 def reading_time(text):
-    """Calculate reading time assuming 200 words per minute."""
-    if text:
-        words = len(text.split())
-        minutes = words // 200
-        return max(1, minutes)
-    return 1
+    """
+    Calculate reading time assuming 200 words per minute. Articles store
+    this as article.reading_time; use that instead of passing the body.
+    """
+    return text_stats(text)[1]
 
 
 @register.filter
 def truncate_words_html(text, num_words):
-    """Truncate HTML text to a specific number of words while stripping tags."""
+    """
+    Truncate HTML text to a specific number of words while stripping tags.
+    Articles store a plain-text article.preview for listings.
+    """
     from django.utils.html import strip_tags
 
     plain_text = strip_tags(text)
@@ -207,6 +196,19 @@ def format_number(value):
         return value
 
 
+@register.filter
+def search_highlight(headline):
+    """Escape a search headline and wrap its matched words in <mark>."""
+    from django.utils.html import escape
+
+    from ..search import HIGHLIGHT_START, HIGHLIGHT_STOP
+
+    html = escape(headline or "")
+    return mark_safe(
+        html.replace(HIGHLIGHT_START, "<mark>").replace(HIGHLIGHT_STOP, "</mark>")
+    )
+
+
 # @register.filter
 # def persian_date(value):
 #     """Convert Gregorian date to Jalali date (requires jdatetime)."""
@@ -0,0 +1,35 @@
+from html import unescape
+
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+# Average reading speed used for the reading time estimate
+WORDS_PER_MINUTE = 200
+
+# Length of the plain-text preview stored on each article
+PREVIEW_WORDS = 40
+
+
+def plain_text(content):
+    """Strip HTML from an article body, keeping words of adjacent blocks apart."""
+    text = unescape(strip_tags((content or "").replace("<", " <")))
+    return " ".join(text.split())
+
+
+def text_stats(content):
+    """
+    Return (word_count, reading_time, preview) for an article body.
+
+    Pure function of the text, so the backfill command can run it in
+    worker processes.
+    """
+    plain = plain_text(content)
+    word_count = len(plain.split())
+    reading_time = max(1, word_count // WORDS_PER_MINUTE)
+    preview = Truncator(plain).words(PREVIEW_WORDS, truncate="...")
+    return word_count, reading_time, preview
+
+
+def text_stats_batch(rows):
+    """Compute text_stats() for [(pk, content), ...] in a worker process."""
+    return [(pk, *text_stats(content)) for pk, content in rows]
@@ -0,0 +1,140 @@
+import uuid
+from datetime import timedelta
+
+import redis
+from django.db import transaction
+from django.db.models import Case, F, PositiveIntegerField, Value, When
+from django.utils import timezone
+from django_redis import get_redis_connection
+
+from articles.author_stats import add_author_views
+from articles.models import Article, ViewFlush
+from core.trending import record_event
+
+FLUSH_BATCH_SIZE = 1000
+
+# Hash of article id -> views not yet written to the database; its
+# fields are exactly the articles a flush has to touch
+PENDING_VIEWS_KEY = "articles:views:pending"
+
+# The pending hash is renamed here while a flush writes it out
+FLUSHING_VIEWS_KEY = "articles:views:flushing"
+
+# Token of the renamed hash, recorded as a ViewFlush once it is applied
+FLUSHING_TOKEN_KEY = "articles:views:flushing:token"
+
+# ViewFlush rows only need to outlive a crashed flush's next run
+VIEW_FLUSH_RETENTION = timedelta(days=1)
+
+
+def record_view(article_id):
+    """
+    Count one view of an article in Redis with an atomic HINCRBY, and
+    feed it to the trending engine.
+
+    Nothing touches the article row, so a viral article no longer queues
+    every reader behind a row lock; flush_views() moves the buffered
+    counts into view_count in bulk.
+    """
+    record_event("articles", article_id)
+    return get_redis_connection("default").hincrby(PENDING_VIEWS_KEY, article_id, 1)
+
+
+def get_pending_views(article_ids):
+    """
+    Return {article_id: views buffered but not yet flushed}. Views being
+    flushed are included until their ViewFlush commits; the database is
+    only asked while a flush is in progress or was interrupted.
+    """
+    article_ids = list(article_ids)
+    if not article_ids:
+        return {}
+    pipe = get_redis_connection("default").pipeline(transaction=False)
+    pipe.hmget(PENDING_VIEWS_KEY, article_ids)
+    pipe.hmget(FLUSHING_VIEWS_KEY, article_ids)
+    pipe.get(FLUSHING_TOKEN_KEY)
+    pending, flushing, token = pipe.execute()
+    if any(flushing) and _is_applied(token):
+        # Already in view_count; the hash is only waiting to be deleted
+        flushing = [None] * len(article_ids)
+
+    views = {}
+    for article_id, waiting, in_flight in zip(article_ids, pending, flushing):
+        total = int(waiting or 0) + int(in_flight or 0)
+        if total:
+            views[article_id] = total
+    return views
+
+
+def _is_applied(token):
+    return bool(token) and ViewFlush.objects.filter(token=token.decode()).exists()
+
+
+def with_pending_views(articles):
+    """Add the buffered views to the view_count of loaded articles."""
+    articles = list(articles)
+    pending = get_pending_views([article.pk for article in articles])
+    for article in articles:
+        article.view_count += pending.get(article.pk, 0)
+    return articles
+
+
+def flush_views(batch_size=FLUSH_BATCH_SIZE):
+    """
+    Write buffered views into Article.view_count and return how many were
+    flushed. Each batch is one UPDATE with a CASE over the article ids.
+
+    Only articles viewed since the last flush are read: the pending hash
+    is renamed aside in one step, so views recorded meanwhile start a
+    fresh hash for the next run. The renamed hash gets a token that is
+    recorded as a ViewFlush in the transaction that adds its views to
+    the articles and their authors' rollup rows. The hash is deleted only
+    after that commits, and a run that finds its token already recorded
+    just deletes it, so an interrupted flush is never applied twice.
+    """
+    connection = get_redis_connection("default")
+    try:
+        # Does nothing while a previous flush's leftovers remain
+        connection.renamenx(PENDING_VIEWS_KEY, FLUSHING_VIEWS_KEY)
+    except redis.ResponseError:
+        pass  # nothing was viewed
+    if not connection.exists(FLUSHING_VIEWS_KEY):
+        return 0
+
+    # Kept across runs until the hash is deleted with it
+    connection.set(FLUSHING_TOKEN_KEY, uuid.uuid4().hex, nx=True)
+    token = connection.get(FLUSHING_TOKEN_KEY).decode()
+    pending = {
+        int(article_id): int(views)
+        for article_id, views in connection.hgetall(FLUSHING_VIEWS_KEY).items()
+    }
+
+    flushed = 0
+    if not ViewFlush.objects.filter(token=token).exists():
+        article_ids = sorted(pending)
+        with transaction.atomic():
+            for start in range(0, len(article_ids), batch_size):
+                batch = {
+                    article_id: pending[article_id]
+                    for article_id in article_ids[start : start + batch_size]
+                }
+                Article.objects.filter(pk__in=batch).update(
+                    view_count=F("view_count")
+                    + Case(
+                        *[
+                            When(pk=article_id, then=Value(views))
+                            for article_id, views in batch.items()
+                        ],
+                        default=Value(0),
+                        output_field=PositiveIntegerField(),
+                    )
+                )
+                add_author_views(batch)
+            ViewFlush.objects.create(token=token)
+            ViewFlush.objects.filter(
+                flushed_at__lt=timezone.now() - VIEW_FLUSH_RETENTION
+            ).delete()
+        flushed = sum(pending.values())
+
+    connection.delete(FLUSHING_VIEWS_KEY, FLUSHING_TOKEN_KEY)
+    return flushed
@@ -1,16 +1,25 @@
 from django.views.generic import DetailView, ListView
 from django.shortcuts import get_object_or_404, redirect
 from django.contrib import messages
-from django.db.models import Q, Count
 
-from .models import Article, Comment, Category, Tag
+from core.cache import get_generation
+from core.conditional import ConditionalGetMixin
+from core.pagination import CachedCountPaginator
+
+from .cache import BLOG_NAMESPACE, comments_namespace
+from .comments import get_comment_thread
+from .models import Article, AuthorStats, Comment, Category, Tag
+from .related import get_related_articles
+from .search import search_articles
+from .sidebar import get_blog_sidebar
+from .view_counts import record_view, with_pending_views
 from .forms import CommentForm
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
 
-class ArticleDetailView(DetailView):
+class ArticleDetailView(ConditionalGetMixin, DetailView):
     """
     Displays the detail page of a single published article.
     Handles view counting, approved comments, and comment submission.
@@ -27,8 +36,10 @@ class ArticleDetailView(DetailView):
         Return only published articles with related data
         optimized using select_related and prefetch_related.
         """
-        return Article.published.select_related("author").prefetch_related(
-            "categories", "tags", "comments"
+        return (
+            Article.published.with_content()
+            .select_related("author")
+            .prefetch_related("categories", "tags")
         )
 
     def get_object(self, queryset=None):
@@ -37,39 +48,66 @@ class ArticleDetailView(DetailView):
         once per session to avoid duplicate views.
         """
         article = super().get_object(queryset)
+        with_pending_views([article])
 
-        session_key = f"viewed_article_{article.id}"
-        if not self.request.session.get(session_key, False):
+        if self.is_first_view(article.id):
             article.increment_view_count()
-            self.request.session[session_key] = True
 
         return article
 
+    def is_first_view(self, article_id):
+        """Return whether this session has not seen the article yet."""
+        session_key = f"viewed_article_{article_id}"
+        if self.request.session.get(session_key, False):
+            return False
+        self.request.session[session_key] = True
+        return True
+
+    def get_validators(self):
+        """
+        Validate against the article's updated_at and the generations of
+        its comment thread and of the blog (related and sidebar content),
+        with one indexed query and two cache reads.
+        """
+        row = (
+            Article.published.filter(slug=self.kwargs[self.slug_url_kwarg])
+            .values_list("pk", "updated_at")
+            .first()
+        )
+        if row is None:
+            return None
+        self.article_id, updated_at = row
+        return [
+            self.article_id,
+            updated_at.isoformat(),
+            get_generation(comments_namespace(self.article_id)),
+            get_generation(BLOG_NAMESPACE),
+        ]
+
+    def not_modified(self, response):
+        """Count the view of a visitor served from their own cache."""
+        if self.is_first_view(self.article_id):
+            record_view(self.article_id)
+        return response
+
     def get_context_data(self, **kwargs):
         """
-        Add comments, comment form, reading time,
+        Add the comment thread, comment form, reading time,
         and related articles to the template context.
         """
         context = super().get_context_data(**kwargs)
-        article = self.get_object()
+        article = self.object
 
-        # Approved top-level comments
-        context["comments"] = article.get_approved_comments().filter(
-            parent__isnull=True
-        )
+        # Approved comments, threaded and rendered once per change
+        context["comment_thread"] = get_comment_thread(article.id)
 
         # Comment form
         context.setdefault("comment_form", CommentForm())
 
-        context["comment_count"] = article.get_comment_count()
         context["reading_time"] = article.get_reading_time()
 
-        # Related articles based on shared categories
-        context["related_articles"] = (
-            Article.published.filter(categories__in=article.categories.all())
-            .exclude(id=article.id)
-            .distinct()[:3]
-        )
+        # Related articles precomputed from content similarity
+        context["related_articles"] = get_related_articles(article)
 
         return context
 
@@ -117,23 +155,20 @@ class ArticleListView(ListView):
     template_name = "articles/article_list.html"
     context_object_name = "articles"
     paginate_by = 12
+    paginator_class = CachedCountPaginator
 
     def get_queryset(self):
         """
         Build the article queryset based on query parameters
         such as search, category, tag, author, and sorting.
         """
-        queryset = Article.published.select_related("author").prefetch_related(
-            "categories", "tags"
-        )
+        queryset = Article.published.select_related(
+            "author__user_profile"
+        ).prefetch_related("categories", "tags")
 
-        search_query = self.request.GET.get("q")
+        search_query = self.request.GET.get("q", "").strip()
         if search_query:
-            queryset = queryset.filter(
-                Q(title__icontains=search_query)
-                | Q(excerpt__icontains=search_query)
-                | Q(content__icontains=search_query)
-            )
+            queryset = search_articles(queryset, search_query)
 
         if category_slug := self.request.GET.get("category"):
             queryset = queryset.filter(categories__slug=category_slug)
@@ -144,7 +179,9 @@ class ArticleListView(ListView):
         if author_id := self.request.GET.get("author"):
             queryset = queryset.filter(author__id=author_id)
 
-        sort_by = self.request.GET.get("sort", "-published_at")
+        # Search results keep their relevance order unless asked otherwise
+        default_sort = "" if search_query else "-published_at"
+        sort_by = self.request.GET.get("sort", default_sort)
         if sort_by in ["-published_at", "published_at", "-view_count", "title"]:
             queryset = queryset.order_by(sort_by)
 
@@ -157,26 +194,8 @@ class ArticleListView(ListView):
         """
         context = super().get_context_data(**kwargs)
 
-        context["featured_article"] = Article.published.order_by("-view_count").first()
-        context["secondary_articles"] = Article.published.order_by("-view_count")[1:3]
-
-        context["top_stories"] = Article.published.order_by("-view_count")[:5]
-        context["trending_articles"] = Article.published.order_by("-created_at")[:5]
-        context["latest_articles"] = Article.published.order_by("-published_at")[:5]
-
-        context["all_categories"] = Category.objects.annotate(
-            article_count=Count("articles", filter=Q(articles__status="published"))
-        ).filter(article_count__gt=0)
-
-        context["all_tags"] = Tag.objects.annotate(
-            article_count=Count("articles", filter=Q(articles__status="published"))
-        ).filter(article_count__gt=0)[:20]
-
-        context["active_authors"] = (
-            User.objects.filter(articles__status="published")
-            .annotate(article_count=Count("articles"))
-            .distinct()[:10]
-        )
+        # Identical for every visitor: one cache read
+        context.update(get_blog_sidebar())
 
         context["current_filters"] = {
             "search": self.request.GET.get("q", ""),
@@ -198,6 +217,7 @@ class CategoryArticleListView(ListView):
     template_name = "articles/category_list.html"
     context_object_name = "articles"
     paginate_by = 12
+    paginator_class = CachedCountPaginator
 
     def get_queryset(self):
         self.category = get_object_or_404(Category, slug=self.kwargs["slug"])
@@ -213,14 +233,12 @@ class CategoryArticleListView(ListView):
         """
         context = super().get_context_data(**kwargs)
         context["category"] = self.category
-        context["category_article_count"] = self.get_queryset().count()
+        context["category_article_count"] = context["paginator"].count
 
         context["related_categories"] = (
             Category.objects.exclude(id=self.category.id)
-            .annotate(
-                article_count=Count("articles", filter=Q(articles__status="published"))
-            )
-            .filter(article_count__gt=0)[:5]
+            .filter(published_article_count__gt=0)
+            .order_by("-published_article_count")[:5]
         )
 
         return context
@@ -235,6 +253,7 @@ class TagArticleListView(ListView):
     template_name = "articles/tag_list.html"
     context_object_name = "articles"
     paginate_by = 12
+    paginator_class = CachedCountPaginator
 
     def get_queryset(self):
         self.tag = get_object_or_404(Tag, slug=self.kwargs["slug"])
@@ -250,14 +269,12 @@ class TagArticleListView(ListView):
         """
         context = super().get_context_data(**kwargs)
         context["tag"] = self.tag
-        context["tag_article_count"] = self.get_queryset().count()
+        context["tag_article_count"] = context["paginator"].count
 
         context["related_tags"] = (
             Tag.objects.exclude(id=self.tag.id)
-            .annotate(
-                article_count=Count("articles", filter=Q(articles__status="published"))
-            )
-            .filter(article_count__gt=0)[:10]
+            .filter(published_article_count__gt=0)
+            .order_by("-published_article_count")[:10]
         )
 
         return context
@@ -272,6 +289,7 @@ class AuthorArticleListView(ListView):
     template_name = "articles/author_list.html"
     context_object_name = "articles"
     paginate_by = 12
+    paginator_class = CachedCountPaginator
 
     def get_queryset(self):
         self.author = get_object_or_404(User, id=self.kwargs["author_id"])
@@ -287,12 +305,11 @@ class AuthorArticleListView(ListView):
         """
         context = super().get_context_data(**kwargs)
         context["article_author"] = self.author
-        context["author_article_count"] = self.get_queryset().count()
-        context["author_total_views"] = (
-            self.get_queryset().aggregate(total_views=Count("view_count"))[
-                "total_views"
-            ]
-            or 0
+        stats = AuthorStats.objects.filter(author=self.author).first()
+        context["author_article_count"] = stats.published_count if stats else 0
+        context["author_total_views"] = stats.total_views if stats else 0
+        context["author_latest_published_at"] = (
+            stats.latest_published_at if stats else None
         )
         return context
 
@@ -307,32 +324,24 @@ class ArticleSearchView(ListView):
     template_name = "articles/search_results.html"
     context_object_name = "articles"
     paginate_by = 12
+    paginator_class = CachedCountPaginator
 
     def get_queryset(self):
-        query = self.request.GET.get("q", "")
+        query = self.request.GET.get("q", "").strip()
         if not query:
             return Article.published.none()
 
-        return (
-            Article.published.filter(
-                Q(title__icontains=query)
-                | Q(excerpt__icontains=query)
-                | Q(content__icontains=query)
-                | Q(categories__name__icontains=query)
-                | Q(tags__name__icontains=query)
-                | Q(author__first_name__icontains=query)
-                | Q(author__last_name__icontains=query)
-            )
-            .select_related("author")
-            .prefetch_related("categories", "tags")
-            .distinct()
-        )
+        queryset = Article.published.select_related(
+            "author__user_profile"
+        ).prefetch_related("categories", "tags")
+        return search_articles(queryset, query)
 
     def get_context_data(self, **kwargs):
         """
         Add search query and result count to context.
         """
         context = super().get_context_data(**kwargs)
-        context["search_query"] = self.request.GET.get("q", "")
-        context["search_count"] = self.get_queryset().count()
+        context["search_query"] = self.request.GET.get("q", "").strip()
+        # The paginator already counted the matches
+        context["search_count"] = context["paginator"].count
         return context
@@ -1,9 +1,25 @@
+import hashlib
+
 from django.contrib.contenttypes.models import ContentType
 from courses.models import Course
 from shop.models import Product
 from cart.models import CartModel, CartItemModel
 
 
+def get_cart_version(session):
+    """
+    Return a short digest of the items in a session's cart, or "" when it
+    is empty. Reading it never creates a cart in the session.
+    """
+    items = sorted(
+        (item["product_type"], str(item["product_id"]))
+        for item in session.get("cart", {}).get("items", [])
+    )
+    if not items:
+        return ""
+    return hashlib.md5(repr(items).encode()).hexdigest()[:12]
+
+
 class CartSession:
     """
     Session-based cart management for multiple product types.
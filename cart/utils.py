@@ -1,6 +1,7 @@
 from django.contrib.contenttypes.models import ContentType
 from courses.models import Course
 from shop.models import Product
+from shop.stock import get_available_stock
 
 
 def get_product_model_by_type(product_type):
@@ -86,9 +87,9 @@ def validate_product_stock(product_obj, product_type, quantity=1):
         return (True, None)
 
     if product_type == "product":
-        if hasattr(product_obj, "stock"):
-            if product_obj.stock < quantity:
-                return (False, f"موجودی کافی نیست. موجودی فعلی: {product_obj.stock}")
+        available = get_available_stock(product_obj.id)
+        if available < quantity:
+            return (False, f"موجودی کافی نیست. موجودی فعلی: {available}")
         return (True, None)
 
     return (False, "نوع محصول نامعتبر است")
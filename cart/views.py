@@ -10,6 +10,7 @@ import json
 from cart.cart import CartSession
 from courses.models import Course
 from shop.models import Product
+from shop.stock import get_available_stock
 
 
 def is_ajax(request):
@@ -107,7 +108,7 @@ def cart_add_product(request, product_id):
         cart = CartSession(request.session)
 
         # بررسی موجودی
-        if hasattr(product, "stock") and product.stock < 1:
+        if get_available_stock(product.id) < 1:
             error_msg = f'محصول "{product.title}" موجود نیست.'
             if is_ajax(request):
                 return JsonResponse(
@@ -290,7 +291,7 @@ def cart_add_ajax(request):
                 product_name = product_obj.title
 
                 # Check stock
-                if hasattr(product_obj, "stock") and product_obj.stock < 1:
+                if get_available_stock(product_obj.id) < 1:
                     return JsonResponse(
                         {
                             "success": False,
@@ -0,0 +1,167 @@
+import random
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.middleware.csrf import get_token
+from django.utils.safestring import mark_safe
+
+
+def _generation_key(namespace):
+    return f"generation:{namespace}"
+
+
+def get_generation(namespace):
+    """
+    Return the current generation counter for a cache namespace.
+
+    Cache keys that embed the generation are invalidated all at once by
+    bumping the counter, so no key scans or explicit deletes are needed.
+    """
+    key = _generation_key(namespace)
+    generation = cache.get(key)
+    if generation is None:
+        # Seed from the clock so an evicted counter never restarts at a
+        # value that older, still-cached entries were keyed with.
+        cache.add(key, time.time_ns() // 1000, timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(namespace):
+    """Advance the generation counter, invalidating every derived key."""
+    key = _generation_key(namespace)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        get_generation(namespace)
+        return cache.incr(key)
+
+
+def get_versioned(namespace, key):
+    """
+    Fetch a value stored with set_versioned() together with the namespace
+    generation in a single cache round-trip.
+
+    Returns (value, generation, is_current). A value built under an older
+    generation is still returned, flagged as not current, so callers can
+    keep serving it while a single request rebuilds it.
+    """
+    generation_key = _generation_key(namespace)
+    found = cache.get_many([generation_key, key])
+    generation = found.get(generation_key)
+    if generation is None:
+        generation = get_generation(namespace)
+
+    entry = found.get(key)
+    if entry is None:
+        return None, generation, False
+    built_generation, value = entry
+    return value, generation, built_generation == generation
+
+
+def set_versioned(key, value, generation, timeout=None):
+    """Store a value along with the generation it was built under."""
+    cache.set(key, (generation, value), timeout)
+
+
+def claim_rebuild(key, timeout=30):
+    """
+    Let exactly one caller rebuild a stale entry; everyone else keeps
+    serving the stale value until the lock expires.
+    """
+    return cache.add(f"{key}:rebuild", True, timeout)
+
+
+WIDGET_CACHE_TIMEOUT = getattr(settings, "WIDGET_CACHE_TIMEOUT", 5 * 60)
+
+
+def get_cached_widget_items(name, namespace, queryset, select_related=()):
+    """
+    Return the objects of a small shared widget queryset.
+
+    Only the ordered primary keys are cached, keyed by the namespace
+    generation, so a write that bumps the generation refreshes the widget
+    at once while the short TTL bounds staleness from anything else. The
+    objects are hydrated with one in_bulk() call, so field values shown
+    are always current.
+    """
+    key = f"widget:{name}:{get_generation(namespace)}"
+    ids = cache.get(key)
+    if ids is None:
+        ids = list(queryset.values_list("pk", flat=True))
+        cache.set(key, ids, WIDGET_CACHE_TIMEOUT)
+    if not ids:
+        return []
+
+    manager = queryset.model._default_manager
+    objects = manager.select_related(*select_related).in_bulk(ids)
+    return [objects[pk] for pk in ids if pk in objects]
+
+
+# Ids per cache entry of a random pool; a sample reads only the chunks
+# holding the picked positions
+RANDOM_POOL_CHUNK_SIZE = 1000
+
+
+def get_random_items(name, namespace, queryset, count, select_related=()):
+    """
+    Return up to count objects picked at random from a queryset without
+    ORDER BY RANDOM(), which sorts the whole table on every call.
+
+    The queryset's primary keys are cached as a pool split into chunks,
+    keyed by the namespace generation so publishing or unpublishing
+    rebuilds it. A call samples positions in Python, reads the chunks
+    holding them with one get_many() and hydrates with one in_bulk(), so
+    the cost does not grow with the table.
+    """
+    prefix = f"random-pool:{name}:{get_generation(namespace)}"
+    size = cache.get(f"{prefix}:size")
+
+    if size is not None:
+        positions = random.sample(range(size), min(count, size))
+        chunk_keys = {
+            f"{prefix}:{position // RANDOM_POOL_CHUNK_SIZE}" for position in positions
+        }
+        chunks = cache.get_many(chunk_keys)
+        if len(chunks) == len(chunk_keys):
+            ids = [
+                chunks[f"{prefix}:{position // RANDOM_POOL_CHUNK_SIZE}"][
+                    position % RANDOM_POOL_CHUNK_SIZE
+                ]
+                for position in positions
+            ]
+        else:
+            size = None  # part of the pool was evicted
+
+    if size is None:
+        pool = list(queryset.order_by().values_list("pk", flat=True))
+        cache.set_many(
+            {
+                f"{prefix}:{start // RANDOM_POOL_CHUNK_SIZE}": pool[
+                    start : start + RANDOM_POOL_CHUNK_SIZE
+                ]
+                for start in range(0, len(pool), RANDOM_POOL_CHUNK_SIZE)
+            },
+            WIDGET_CACHE_TIMEOUT,
+        )
+        # Written last so readers never see a size without its chunks
+        cache.set(f"{prefix}:size", len(pool), WIDGET_CACHE_TIMEOUT)
+        ids = random.sample(pool, min(count, len(pool)))
+
+    if not ids:
+        return []
+    manager = queryset.model._default_manager
+    objects = manager.select_related(*select_related).in_bulk(ids)
+    return [objects[pk] for pk in ids if pk in objects]
+
+
+CSRF_PLACEHOLDER = "__csrf_token_placeholder__"
+
+
+def fill_csrf_placeholder(html, request):
+    """
+    Swap the CSRF placeholder in a shared cached fragment for the
+    requesting user's token.
+    """
+    return mark_safe(html.replace(CSRF_PLACEHOLDER, get_token(request)))
@@ -0,0 +1,105 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from cart.cart import get_cart_version
+from core.cache import get_generation
+from courses.cache import COURSES_NAMESPACE
+from shop.cache import CATALOG_NAMESPACE
+
+# Session key and cookie where flash messages wait to be shown
+MESSAGES_SESSION_KEY = "_messages"
+MESSAGES_COOKIE_NAME = "messages"
+
+
+def has_pending_messages(request):
+    """Return whether the next page rendered for this request shows messages."""
+    return MESSAGES_COOKIE_NAME in request.COOKIES or (
+        hasattr(request, "session") and MESSAGES_SESSION_KEY in request.session
+    )
+
+
+def get_personalization(request):
+    """
+    Return the parts of a page that depend on the visitor rather than
+    the content: who is signed in and what is in their cart. An empty
+    list means an anonymous visitor with an empty cart.
+    """
+    parts = []
+    if request.user.is_authenticated:
+        parts.append(f"user-{request.user.pk}")
+    cart_version = get_cart_version(request.session)
+    if cart_version:
+        # Cart totals follow product and course prices
+        parts += [
+            cart_version,
+            get_generation(CATALOG_NAMESPACE),
+            get_generation(COURSES_NAMESPACE),
+        ]
+    return parts
+
+
+class ConditionalGetMixin:
+    """
+    Answer repeat GETs carrying If-None-Match or If-Modified-Since with
+    304 Not Modified before the view loads its object or builds context.
+
+    Views implement get_validators() returning the ETag parts from cheap
+    reads such as cache generations or one indexed query, or None to skip
+    the check (e.g. for a missing object, so the normal path raises 404).
+    The visitor's personalization is folded into the ETag.
+
+    Last-Modified is only sent by views whose get_last_modified() covers
+    every input of the ETag, and never to personalized pages, since it
+    cannot tell two visitors apart. Comments, sidebars and related
+    articles change pages without touching any timestamp, so a client
+    sending only If-Modified-Since would otherwise keep a stale page.
+    """
+
+    def get_validators(self):
+        """Return the ETag parts of the page, or None to skip the check."""
+        return None
+
+    def get_last_modified(self):
+        """
+        Return when anything the page shows last changed, or None. Called
+        after get_validators(), so it can reuse what that loaded.
+        """
+        return None
+
+    def not_modified(self, response):
+        """Hook for bookkeeping a full render would have done."""
+        return response
+
+    def dispatch(self, request, *args, **kwargs):
+        validators = None
+        if request.method in ("GET", "HEAD") and not has_pending_messages(request):
+            validators = self.get_validators()
+        if validators is None:
+            return super().dispatch(request, *args, **kwargs)
+
+        personalization = get_personalization(request)
+        digest = hashlib.md5(
+            ":".join(map(str, [*validators, *personalization])).encode()
+        ).hexdigest()
+        etag = quote_etag(digest)
+        last_modified = self.get_last_modified()
+        timestamp = None
+        if last_modified is not None and not personalization:
+            timestamp = int(last_modified.timestamp())
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is not None:
+            response = self.not_modified(response)
+        else:
+            response = super().dispatch(request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            response.headers.setdefault("ETag", etag)
+            if timestamp is not None:
+                response.headers.setdefault("Last-Modified", http_date(timestamp))
+            # Browsers must revalidate; shared caches must not mix visitors
+            response.headers.setdefault("Cache-Control", "private, no-cache")
+            patch_vary_headers(response, ["Cookie"])
+        return response
@@ -0,0 +1,28 @@
+from django.db import models
+
+
+class CounterFieldsMixin(models.Model):
+    """
+    Model whose COUNTER_FIELDS are only ever changed with F() updates.
+
+    save() leaves the counters out of the UPDATE it sends for an existing
+    row, so a possibly stale in-memory copy never overwrites concurrent
+    updates. Everything else about save() is unchanged: update_fields and
+    signals see what the caller passed, and an instance whose row was
+    deleted elsewhere is inserted again, counters included.
+    """
+
+    COUNTER_FIELDS = ()
+
+    class Meta:
+        abstract = True
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        values = [
+            (field, model, value)
+            for field, model, value in values
+            if field.name not in self.COUNTER_FIELDS
+        ]
+        return super()._do_update(
+            base_qs, using, pk_val, values, update_fields, forced_update
+        )
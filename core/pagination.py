@@ -0,0 +1,90 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, FullResultSet
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models.query import QuerySet
+from django.utils.functional import cached_property
+
+# Seconds a counted result is reused for the same query
+PAGINATOR_COUNT_CACHE_TIMEOUT = getattr(settings, "PAGINATOR_COUNT_CACHE_TIMEOUT", 60)
+
+# Unfiltered tables estimated above this many rows are not counted
+PAGINATOR_ESTIMATE_THRESHOLD = getattr(
+    settings, "PAGINATOR_ESTIMATE_THRESHOLD", 100_000
+)
+
+
+def count_cache_key(queryset):
+    """
+    Build the cache key of a queryset's count from its compiled SQL and
+    parameters, ignoring ordering, so equivalent queries share an entry.
+    Raises EmptyResultSet for a queryset that cannot match any row, such
+    as filter(pk__in=[]).
+    """
+    sql, params = queryset.order_by().query.get_compiler(using=queryset.db).as_sql()
+    digest = hashlib.md5(repr((sql, params)).encode()).hexdigest()
+    return f"paginator:count:{queryset.model._meta.label_lower}:{digest}"
+
+
+def estimated_count(queryset):
+    """
+    Return the Postgres planner's row estimate (pg_class.reltuples) for
+    a queryset over a whole table, or None when the queryset filters or
+    collapses rows, the table was never analyzed, or the database is
+    not Postgres.
+    """
+    query = queryset.query
+    if query.where or query.distinct or query.is_sliced or query.combinator:
+        return None
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [connection.ops.quote_name(queryset.model._meta.db_table)],
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Drop-in paginator that avoids a COUNT(*) per request.
+
+    Whole-table listings of tables estimated above
+    PAGINATOR_ESTIMATE_THRESHOLD rows use the planner estimate, read
+    from the catalog in constant time. Counts and estimates are cached
+    per normalized query for PAGINATOR_COUNT_CACHE_TIMEOUT seconds, so
+    page totals may lag writes by that long.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet):
+            return super().count
+        if queryset.query.is_empty():
+            return 0
+
+        try:
+            key = count_cache_key(queryset)
+        except EmptyResultSet:
+            return 0
+        except FullResultSet:
+            return queryset.count()
+
+        count = cache.get(key)
+        if count is None:
+            estimate = estimated_count(queryset)
+            if estimate is not None and estimate >= PAGINATOR_ESTIMATE_THRESHOLD:
+                count = estimate
+            else:
+                count = queryset.count()
+            cache.set(key, count, PAGINATOR_COUNT_CACHE_TIMEOUT)
+        return count
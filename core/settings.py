@@ -156,6 +156,16 @@ STATICFILES_DIRS = [BASE_DIR / "static"]
 MEDIA_URL = "media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Pre-generated sitemap files, served by nginx at the site root. Kept out
+# of MEDIA_ROOT so the generator's manifest is not public
+SITEMAP_ROOT = config("SITEMAP_ROOT", default=str(BASE_DIR / "sitemaps"))
+
+# Product feeds uploaded from the dashboard wait here for the importer
+PRODUCT_IMPORT_ROOT = config("PRODUCT_IMPORT_ROOT", default=str(BASE_DIR / "imports"))
+
+# Worker processes rendering responsive image derivatives after uploads
+IMAGE_DERIVATIVE_WORKERS = config("IMAGE_DERIVATIVE_WORKERS", default=2, cast=int)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -263,6 +273,30 @@ CACHES = {
     }
 }
 
+# Rendered catalog fragments are versioned, so this only bounds memory use
+CATALOG_CACHE_TIMEOUT = config("CATALOG_CACHE_TIMEOUT", default=60 * 60, cast=int)
+
+# Shared widgets cache only id lists, so a short TTL is cheap
+WIDGET_CACHE_TIMEOUT = config("WIDGET_CACHE_TIMEOUT", default=5 * 60, cast=int)
+
+# Blog sidebar rankings follow view counts, so the snapshot is rebuilt
+# at least this often even when no article is published
+BLOG_SIDEBAR_CACHE_TIMEOUT = config(
+    "BLOG_SIDEBAR_CACHE_TIMEOUT", default=10 * 60, cast=int
+)
+
+# Paginated listings reuse a count this long; whole tables estimated
+# above the threshold use the Postgres planner estimate instead
+PAGINATOR_COUNT_CACHE_TIMEOUT = config(
+    "PAGINATOR_COUNT_CACHE_TIMEOUT", default=60, cast=int
+)
+PAGINATOR_ESTIMATE_THRESHOLD = config(
+    "PAGINATOR_ESTIMATE_THRESHOLD", default=100_000, cast=int
+)
+
+# Minutes a placed but unpaid order holds its product stock
+STOCK_RESERVATION_TIMEOUT = config("STOCK_RESERVATION_TIMEOUT", default=30, cast=int)
+
 # ====================
 # SECURITY (Production)
 # ====================
@@ -0,0 +1,143 @@
+import heapq
+import math
+import time
+
+from django.conf import settings
+from django_redis import get_redis_connection
+
+# Seconds of views counted together in one bucket hash
+TRENDING_BUCKET_SECONDS = 60 * 60
+
+# Window name -> (seconds looked back, half-life of a view's weight)
+TRENDING_WINDOWS = {
+    "24h": (24 * 60 * 60, 6 * 60 * 60),
+    "7d": (7 * 24 * 60 * 60, 36 * 60 * 60),
+}
+
+TRENDING_KINDS = ("articles", "courses", "products")
+
+# Ids kept per ranking; widgets only ever read the head
+TRENDING_RANKING_SIZE = getattr(settings, "TRENDING_RANKING_SIZE", 200)
+
+# Rankings outlive a few missed runs, then widgets fall back
+TRENDING_RANKING_TIMEOUT = getattr(settings, "TRENDING_RANKING_TIMEOUT", 6 * 60 * 60)
+
+_LONGEST_WINDOW = max(length for length, _ in TRENDING_WINDOWS.values())
+
+
+def _bucket_key(kind, bucket):
+    return f"trending:views:{kind}:{bucket}"
+
+
+def _ranking_key(kind, window):
+    return f"trending:top:{kind}:{window}"
+
+
+def record_event(kind, object_id, now=None):
+    """
+    Count one view of an object in the hash of the current hour with an
+    atomic HINCRBY. Buckets expire once no window reaches back to them.
+    """
+    bucket = int((now or time.time()) // TRENDING_BUCKET_SECONDS)
+    key = _bucket_key(kind, bucket)
+    pipe = get_redis_connection("default").pipeline(transaction=False)
+    pipe.hincrby(key, object_id, 1)
+    pipe.expire(key, _LONGEST_WINDOW + TRENDING_BUCKET_SECONDS)
+    pipe.execute()
+
+
+def record_view_once(request, kind, object_id):
+    """Count a view for trending once per session, as article views are."""
+    session_key = f"trending_{kind}_{object_id}"
+    if request.session.get(session_key, False):
+        return
+    request.session[session_key] = True
+    record_event(kind, object_id)
+
+
+def decayed_scores(buckets, now, window):
+    """
+    Sum the view counts of {bucket: {id: views}} falling inside a window,
+    each weighted by exp(-ln 2 * age / half_life) so a view loses half
+    its weight every half-life.
+    """
+    length, half_life = TRENDING_WINDOWS[window]
+    decay = math.log(2) / half_life
+    scores = {}
+    for bucket, counts in buckets.items():
+        # Age from the middle of the bucket, clamped for the current one
+        age = max(now - (bucket + 0.5) * TRENDING_BUCKET_SECONDS, 0)
+        if age >= length:
+            continue
+        weight = math.exp(-decay * age)
+        for object_id, views in counts.items():
+            scores[object_id] = scores.get(object_id, 0) + int(views) * weight
+    return scores
+
+
+def update_rankings(now=None):
+    """
+    Recompute the decayed score of every viewed object and replace the
+    sorted set of each kind and window with its top TRENDING_RANKING_SIZE.
+    The bucket hashes of a kind are read with one pipelined round-trip
+    and each ranking is swapped in a MULTI block, so readers never see a
+    half-written set. Returns {(kind, window): ids ranked}.
+    """
+    now = now or time.time()
+    connection = get_redis_connection("default")
+    current = int(now // TRENDING_BUCKET_SECONDS)
+    buckets = range(current - _LONGEST_WINDOW // TRENDING_BUCKET_SECONDS, current + 1)
+
+    ranked = {}
+    for kind in TRENDING_KINDS:
+        pipe = connection.pipeline(transaction=False)
+        for bucket in buckets:
+            pipe.hgetall(_bucket_key(kind, bucket))
+        counts = {
+            bucket: {int(object_id): views for object_id, views in found.items()}
+            for bucket, found in zip(buckets, pipe.execute())
+            if found
+        }
+
+        pipe = connection.pipeline(transaction=True)
+        for window in TRENDING_WINDOWS:
+            scores = decayed_scores(counts, now, window)
+            top = heapq.nlargest(
+                TRENDING_RANKING_SIZE, scores.items(), key=lambda item: item[1]
+            )
+            key = _ranking_key(kind, window)
+            pipe.delete(key)
+            if top:
+                pipe.zadd(key, dict(top))
+                pipe.expire(key, TRENDING_RANKING_TIMEOUT)
+            ranked[(kind, window)] = len(top)
+        pipe.execute()
+    return ranked
+
+
+def get_trending_ids(kind, window="24h", limit=5):
+    """Return the ids of the top objects of a ranking, best first."""
+    ids = get_redis_connection("default").zrevrange(
+        _ranking_key(kind, window), 0, limit - 1
+    )
+    return [int(object_id) for object_id in ids]
+
+
+def get_trending(kind, queryset, limit=5, window="24h", fallback=None):
+    """
+    Return up to limit objects of a queryset in trending order, hydrated
+    with one in_bulk(). Ranked ids the queryset excludes (unpublished,
+    inactive) are skipped; a few extra are read to make up for them.
+
+    When the ranking is short, e.g. before the first run, the rest is
+    filled from the ordered fallback queryset.
+    """
+    ids = get_trending_ids(kind, window, limit * 2)
+    objects = queryset.in_bulk(ids) if ids else {}
+    items = [objects[pk] for pk in ids if pk in objects][:limit]
+
+    if fallback is not None and len(items) < limit:
+        items += fallback.exclude(pk__in=[item.pk for item in items])[
+            : limit - len(items)
+        ]
+    return items
@@ -16,24 +16,12 @@ Including another URLconf
 """
 
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
 from django.conf import settings
 from django.conf.urls.static import static
-from website.views import Custom404View, ads_txt
-from django.contrib.sitemaps.views import sitemap
-from articles.sitemaps import ArticleSitemap
-from courses.sitemaps import CourseSitemap
-from shop.sitemaps import ProductSitemap
-from website.sitemaps import StaticViewSitemap
+from website.views import Custom404View, ads_txt, sitemap_file
 from decouple import config
 
-sitemaps = {
-    "static": StaticViewSitemap,
-    "articles": ArticleSitemap,
-    "courses": CourseSitemap,
-    "products": ProductSitemap,
-}
-
 ADMIN_URL = config("ADMIN_URL")
 
 urlpatterns = [
@@ -51,10 +39,10 @@ urlpatterns = [
     path("robots.txt", include("robots.urls")),
     path(
         "sitemap.xml",
-        sitemap,
-        {"sitemaps": sitemaps},
+        sitemap_file,
         name="django.contrib.sitemaps.views.sitemap",
     ),
+    re_path(r"^(?P<filename>sitemap-[a-z]+-[0-9]+\.xml\.gz)$", sitemap_file),
     path("ads.txt", ads_txt),
 ]
 
@@ -21,13 +21,15 @@ class CourseAdmin(admin.ModelAdmin):
         "price",
         "duration",
         "is_active",
-        "get_students_count",
+        "student_count",
+        "rating_avg",
+        "rating_count",
         "created_date",
     ]
     list_filter = ["is_active", "created_date", "instructor"]
     search_fields = ["title", "description", "instructor__email"]
     prepopulated_fields = {"slug": ("title",)}
-    readonly_fields = ["created_date", "updated_date"]
+    readonly_fields = ["created_date", "updated_date", *Course.COUNTER_FIELDS]
     inlines = [VideoInline]
 
     fieldsets = (
@@ -36,17 +38,13 @@ class CourseAdmin(admin.ModelAdmin):
             {"fields": ("title", "slug", "description", "instructor", "thumbnail")},
         ),
         ("Course Details", {"fields": ("duration", "price", "is_active")}),
+        ("Statistics", {"fields": Course.COUNTER_FIELDS, "classes": ("collapse",)}),
         (
             "Timestamps",
             {"fields": ("created_date", "updated_date"), "classes": ("collapse",)},
         ),
     )
 
-    def get_students_count(self, obj):
-        return obj.get_students_count()
-
-    get_students_count.short_description = "Students"
-
 
 @admin.register(Video)
 class VideoAdmin(admin.ModelAdmin):
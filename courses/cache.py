@@ -0,0 +1,13 @@
+from core.cache import get_generation, bump_generation
+
+COURSES_NAMESPACE = "courses"
+
+
+def get_courses_generation():
+    """Return the generation counter shared by all course cache keys."""
+    return get_generation(COURSES_NAMESPACE)
+
+
+def bump_courses_generation():
+    """Invalidate every cached course widget in one step."""
+    return bump_generation(COURSES_NAMESPACE)
@@ -0,0 +1,110 @@
+from django.db.models import Count, F, FloatField, Q, Value
+from django.db.models.functions import Cast, Coalesce, Greatest, NullIf
+
+from courses.models import Course, CourseProgress, CourseRating
+
+
+def adjust_rating_stats(course_id, changes):
+    """
+    Apply {stars: delta} to a course's star histogram with one F()
+    update, deriving rating_count and rating_avg from the new histogram
+    in the same statement so concurrent raters do not overwrite each
+    other. Buckets never drop below zero.
+    """
+    changes = {stars: delta for stars, delta in changes.items() if delta}
+    if course_id is None or not changes:
+        return
+
+    histogram = {
+        stars: (
+            Greatest(F(field) + changes[stars], 0) if stars in changes else F(field)
+        )
+        for stars, field in Course.RATING_HISTOGRAM_FIELDS.items()
+    }
+    count = sum(histogram.values(), Value(0))
+    total = sum(
+        (stars * expression for stars, expression in histogram.items()), Value(0)
+    )
+    Course.objects.filter(pk=course_id).update(
+        **{
+            Course.RATING_HISTOGRAM_FIELDS[stars]: histogram[stars] for stars in changes
+        },
+        rating_count=count,
+        rating_avg=Coalesce(
+            Cast(total, FloatField()) / NullIf(count, 0),
+            Value(0.0),
+            output_field=FloatField(),
+        ),
+    )
+
+
+def adjust_student_count(course_id, delta):
+    """Add to a course's student counter with one F() update."""
+    if course_id is not None and delta:
+        Course.objects.filter(pk=course_id).update(
+            student_count=Greatest(F("student_count") + delta, 0)
+        )
+
+
+def recompute_course_stats(course_ids=None, commit=True):
+    """
+    Rebuild the rating and enrollment statistics of the given courses,
+    or of every course, from two aggregate queries. Returns the ids of
+    the courses whose stored statistics were wrong; with commit=False
+    they are only reported.
+    """
+    courses = Course.objects.only("pk", *Course.COUNTER_FIELDS)
+    ratings = CourseRating.objects.all()
+    enrollments = CourseProgress.objects.all()
+    if course_ids is not None:
+        course_ids = list(course_ids)
+        courses = courses.filter(pk__in=course_ids)
+        ratings = ratings.filter(course_id__in=course_ids)
+        enrollments = enrollments.filter(course_id__in=course_ids)
+
+    histograms = {
+        row.pop("course_id"): row
+        for row in ratings.values("course_id")
+        .annotate(
+            **{
+                field: Count("id", filter=Q(rating=stars))
+                for stars, field in Course.RATING_HISTOGRAM_FIELDS.items()
+            }
+        )
+        .order_by()
+    }
+    students = dict(
+        enrollments.values_list("course_id").annotate(total=Count("id")).order_by()
+    )
+
+    stale = []
+    for course in courses.iterator(chunk_size=2000):
+        histogram = histograms.get(course.pk, {})
+        stats = {
+            field: histogram.get(field, 0)
+            for field in Course.RATING_HISTOGRAM_FIELDS.values()
+        }
+        stats["rating_count"] = sum(stats.values())
+        stats["rating_avg"] = (
+            sum(
+                stars * stats[field]
+                for stars, field in Course.RATING_HISTOGRAM_FIELDS.items()
+            )
+            / stats["rating_count"]
+            if stats["rating_count"]
+            else 0
+        )
+        stats["student_count"] = students.get(course.pk, 0)
+
+        if any(
+            # Averages compare with a tolerance; the database rounds floats
+            abs(getattr(course, field) - value) > 1e-9
+            for field, value in stats.items()
+        ):
+            for field, value in stats.items():
+                setattr(course, field, value)
+            stale.append(course)
+
+    if commit:
+        Course.objects.bulk_update(stale, Course.COUNTER_FIELDS, batch_size=1000)
+    return [course.pk for course in stale]
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from courses.course_stats import recompute_course_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Verify the stored rating histogram, average and student count of "
+        "courses against the rating and enrollment tables, repairing drift"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report drifted courses and exit with an error if any",
+        )
+
+    def handle(self, *args, **options):
+        stale = recompute_course_stats(commit=not options["check"])
+        if not stale:
+            self.stdout.write(self.style.SUCCESS("Course statistics are accurate."))
+            return
+
+        ids = ", ".join(map(str, stale))
+        if options["check"]:
+            raise CommandError(
+                f"Course statistics drifted for {len(stale)} courses: {ids}"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"Updated statistics of {len(stale)} courses: {ids}")
+        )
@@ -0,0 +1,105 @@
+# Generated by Django 5.2.9 on 2026-10-19 05:16
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def fill_stats(apps, schema_editor):
+    """Count the ratings per star and the students of every course."""
+    Course = apps.get_model("courses", "Course")
+    CourseRating = apps.get_model("courses", "CourseRating")
+    CourseProgress = apps.get_model("courses", "CourseProgress")
+    fields = {stars: f"rating_{stars}_count" for stars in range(1, 6)}
+
+    histograms = {
+        row.pop("course_id"): row
+        for row in CourseRating.objects.values("course_id")
+        .annotate(
+            **{
+                field: Count("id", filter=Q(rating=stars))
+                for stars, field in fields.items()
+            }
+        )
+        .order_by()
+    }
+    students = dict(
+        CourseProgress.objects.values_list("course_id")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+
+    courses = list(Course.objects.filter(pk__in={*histograms, *students}).only("pk"))
+    for course in courses:
+        histogram = histograms.get(course.pk, {})
+        for field in fields.values():
+            setattr(course, field, histogram.get(field, 0))
+        course.rating_count = sum(histogram.values())
+        course.rating_avg = (
+            sum(stars * histogram.get(field, 0) for stars, field in fields.items())
+            / course.rating_count
+            if course.rating_count
+            else 0
+        )
+        course.student_count = students.get(course.pk, 0)
+    Course.objects.bulk_update(
+        courses,
+        [*fields.values(), "rating_count", "rating_avg", "student_count"],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0002_alter_course_thumbnail"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="course",
+            name="rating_1_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="rating_2_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="rating_3_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="rating_4_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="rating_5_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="rating_avg",
+            field=models.FloatField(
+                default=0, editable=False, verbose_name="average rating"
+            ),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="rating_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="rating count"
+            ),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="student_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="student count"
+            ),
+        ),
+        migrations.RunPython(fill_stats, migrations.RunPython.noop),
+    ]
@@ -3,9 +3,10 @@ from django.urls import reverse
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils.translation import gettext_lazy as _
 from accounts.models import User
+from core.models import CounterFieldsMixin
 
 
-class Course(models.Model):
+class Course(CounterFieldsMixin, models.Model):
     """Model representing an educational course."""
 
     title = models.CharField(_("course title"), max_length=255)
@@ -38,6 +39,28 @@ class Course(models.Model):
         verbose_name=_("students"),
     )
 
+    # Rating and enrollment statistics, maintained by courses.course_stats
+    rating_count = models.PositiveIntegerField(
+        _("rating count"), default=0, editable=False
+    )
+    rating_avg = models.FloatField(_("average rating"), default=0, editable=False)
+    rating_1_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_2_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_3_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_4_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_5_count = models.PositiveIntegerField(default=0, editable=False)
+    student_count = models.PositiveIntegerField(
+        _("student count"), default=0, editable=False
+    )
+
+    RATING_HISTOGRAM_FIELDS = {stars: f"rating_{stars}_count" for stars in range(1, 6)}
+    COUNTER_FIELDS = (
+        "rating_count",
+        "rating_avg",
+        *RATING_HISTOGRAM_FIELDS.values(),
+        "student_count",
+    )
+
     created_date = models.DateTimeField(auto_now_add=True)
     updated_date = models.DateTimeField(auto_now=True)
 
@@ -50,11 +73,23 @@ class Course(models.Model):
         return self.title
 
     def get_average_rating(self):
-        """Calculate the average rating for this course."""
-        ratings = self.ratings.all()
-        if ratings.exists():
-            return round(sum(r.rating for r in ratings) / ratings.count(), 1)
-        return 0
+        """Return the stored average rating, rounded to one decimal."""
+        return round(self.rating_avg, 1)
+
+    def get_rating_histogram(self):
+        """Return (stars, count, percent) for 5 down to 1 stars."""
+        return [
+            (
+                stars,
+                getattr(self, field),
+                (
+                    round(100 * getattr(self, field) / self.rating_count)
+                    if self.rating_count
+                    else 0
+                ),
+            )
+            for stars, field in reversed(self.RATING_HISTOGRAM_FIELDS.items())
+        ]
 
     def get_total_videos(self):
         """Return the total number of videos in this course."""
@@ -62,7 +97,7 @@ class Course(models.Model):
 
     def get_students_count(self):
         """Return the number of enrolled students."""
-        return self.students.count()
+        return self.student_count
 
     def get_absolute_url(self):
         """Return canonical URL for course detail page."""
@@ -0,0 +1,81 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save
+from django.dispatch import receiver
+
+from courses.cache import bump_courses_generation
+from courses.course_stats import adjust_rating_stats, adjust_student_count
+from courses.models import Course, CourseProgress, CourseRating, Video
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=Video)
+@receiver(post_delete, sender=Video)
+@receiver(post_save, sender=CourseRating)
+@receiver(post_delete, sender=CourseRating)
+def invalidate_courses_cache(sender, **kwargs):
+    """
+    Bump the courses generation once the write is committed so cached
+    course widgets and course page validators are refreshed.
+    """
+    transaction.on_commit(bump_courses_generation)
+
+
+@receiver(pre_save, sender=CourseRating)
+def remember_rating(sender, instance, **kwargs):
+    """Note the course and stars of the rating before this save."""
+    instance._previous_rating = None
+    if instance.pk is not None:
+        instance._previous_rating = (
+            CourseRating.objects.filter(pk=instance.pk)
+            .values_list("course_id", "rating")
+            .first()
+        )
+
+
+@receiver(post_save, sender=CourseRating)
+def update_rating_stats(sender, instance, **kwargs):
+    """Count a new rating, or move an edited one between stars."""
+    current = (instance.course_id, instance.rating)
+    previous = getattr(instance, "_previous_rating", None)
+    if previous == current:
+        return
+    if previous is not None and previous[0] == instance.course_id:
+        adjust_rating_stats(instance.course_id, {previous[1]: -1, instance.rating: 1})
+        return
+    if previous is not None:
+        adjust_rating_stats(previous[0], {previous[1]: -1})
+    adjust_rating_stats(instance.course_id, {instance.rating: 1})
+
+
+@receiver(pre_delete, sender=CourseRating)
+def discount_deleted_rating(sender, instance, **kwargs):
+    """
+    Take a deleted rating out of its course's histogram. The stored
+    state is read, since the instance may predate an edit.
+    """
+    stored = (
+        CourseRating.objects.filter(pk=instance.pk)
+        .values_list("course_id", "rating")
+        .first()
+    )
+    if stored is not None:
+        adjust_rating_stats(stored[0], {stored[1]: -1})
+
+
+@receiver(post_save, sender=CourseProgress)
+def count_enrollment(sender, instance, created, **kwargs):
+    """
+    Count a new student. Progress updates leave the counter alone, so
+    watching videos costs no extra write.
+    """
+    if created:
+        adjust_student_count(instance.course_id, 1)
+        transaction.on_commit(bump_courses_generation)
+
+
+@receiver(pre_delete, sender=CourseProgress)
+def discount_enrollment(sender, instance, **kwargs):
+    """Take an unenrolled student out of the counter."""
+    adjust_student_count(instance.course_id, -1)
+    transaction.on_commit(bump_courses_generation)
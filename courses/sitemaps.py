@@ -10,9 +10,13 @@ class CourseSitemap(Sitemap):
     changefreq = "weekly"
     priority = 0.8
 
+    # Detail route and lastmod column for generate_sitemaps
+    url_name = "courses:course_detail"
+    lastmod_field = "updated_date"
+
     def items(self):
         # Only index courses that are marked as active
-        return Course.objects.filter(is_active=True)
+        return Course.objects.filter(is_active=True).only("slug", "updated_date")
 
     def lastmod(self, obj):
         # Use the updated_date field from your model
@@ -1,4 +1,7 @@
 from django import template
+from core.cache import get_cached_widget_items, get_random_items
+from core.trending import get_trending
+from ..cache import COURSES_NAMESPACE
 from ..models import Course
 
 register = template.Library()
@@ -7,5 +10,37 @@ register = template.Library()
 @register.inclusion_tag("courses/latest_courses.html")
 def show_latest_courses(count=8):
     """Fetches active courses, ordered by the most recent."""
-    courses = Course.objects.filter(is_active=True).order_by("-created_date")[:count]
+    courses = get_cached_widget_items(
+        f"courses:latest_courses:{count}",
+        COURSES_NAMESPACE,
+        Course.objects.filter(is_active=True).order_by("-created_date")[:count],
+        select_related=("instructor__user_profile",),
+    )
     return {"courses": courses}
+
+
+@register.simple_tag
+def get_random_courses(limit=4):
+    """Returns active courses sampled from a cached id pool."""
+    return get_random_items(
+        "courses:active_courses",
+        COURSES_NAMESPACE,
+        Course.objects.filter(is_active=True),
+        limit,
+        select_related=("instructor__user_profile",),
+    )
+
+
+@register.simple_tag
+def get_trending_courses(limit=4, window="7d"):
+    """Returns active courses ranked by time-decayed views."""
+    courses = Course.objects.filter(is_active=True).select_related(
+        "instructor__user_profile"
+    )
+    return get_trending(
+        "courses",
+        courses,
+        limit,
+        window=window,
+        fallback=courses.order_by("-created_date"),
+    )
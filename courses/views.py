@@ -4,10 +4,15 @@ from django.shortcuts import get_object_or_404, redirect
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
 from django.utils.translation import gettext_lazy as _
-from django.db.models import Avg, Count
+from django.db.models import OuterRef, Subquery
 
+from core.conditional import ConditionalGetMixin
+from core.pagination import CachedCountPaginator
+from core.trending import record_view_once
+from courses.cache import get_courses_generation
 from courses.models import Course, Video, CourseProgress, CourseRating
 from courses.forms import CourseRatingForm
+from orders.recommendations import get_recommended_items
 
 
 class CourseListView(ListView):
@@ -17,11 +22,12 @@ class CourseListView(ListView):
     template_name = "courses/course_list.html"
     context_object_name = "courses"
     paginate_by = 12
+    paginator_class = CachedCountPaginator
 
     def get_queryset(self):
-        queryset = Course.objects.filter(is_active=True).annotate(
-            avg_rating=Avg("ratings__rating"),
-            total_students=Count("students", distinct=True),
+        # Ratings and students are read from the stored statistics
+        queryset = Course.objects.filter(is_active=True).select_related(
+            "instructor__user_profile"
         )
         search_query = self.request.GET.get("search", "")
         if search_query:
@@ -54,7 +60,7 @@ class CourseListView(ListView):
         return context
 
 
-class CourseDetailView(LoginRequiredMixin, DetailView):
+class CourseDetailView(LoginRequiredMixin, ConditionalGetMixin, DetailView):
     """
     Display detailed information about a specific course.
     """
@@ -65,6 +71,43 @@ class CourseDetailView(LoginRequiredMixin, DetailView):
     slug_field = "slug"
     slug_url_kwarg = "slug"
 
+    def get_validators(self):
+        """
+        Validate against the course's updated_date, the courses generation
+        (videos and ratings) and when the user's progress last changed,
+        all read with one query.
+        """
+        progress = CourseProgress.objects.filter(
+            course=OuterRef("pk"), user=self.request.user
+        ).values("last_accessed")[:1]
+        row = (
+            Course.objects.filter(slug=self.kwargs[self.slug_url_kwarg])
+            .annotate(progress_at=Subquery(progress))
+            .values_list("pk", "updated_date", "progress_at")
+            .first()
+        )
+        if row is None:
+            return None
+        course_id, updated_date, progress_at = row
+        self.course_id = course_id
+        return [
+            course_id,
+            updated_date.isoformat(),
+            progress_at.isoformat() if progress_at else "",
+            get_courses_generation(),
+        ]
+
+    def not_modified(self, response):
+        """Count the view of a visitor served from their own cache."""
+        record_view_once(self.request, "courses", self.course_id)
+        return response
+
+    def get_object(self, queryset=None):
+        """Retrieve the course and count the view for trending."""
+        course = super().get_object(queryset)
+        record_view_once(self.request, "courses", course.pk)
+        return course
+
     def get_context_data(self, **kwargs):
         """
         Extend default context with:
@@ -103,6 +146,7 @@ class CourseDetailView(LoginRequiredMixin, DetailView):
                 "rating_form": rating_form,
                 "user_rating": user_rating,
                 "avg_rating": course.get_average_rating(),
+                "also_bought": get_recommended_items(course, limit=4),
             }
         )
         return context
@@ -353,7 +353,12 @@ class CommentListView(DashboardMixin, ListView):
         """
         Return optimized queryset with search and approval filters.
         """
-        queryset = super().get_queryset().select_related("article")
+        queryset = (
+            super()
+            .get_queryset()
+            .select_related("article")
+            .defer("article__content", "article__search_vector")
+        )
         search_query = self.request.GET.get("search", "")
         approved_filter = self.request.GET.get("approved", "")
 
@@ -1,6 +1,6 @@
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
 from django.urls import reverse_lazy
-from django.db.models import Q, Count
+from django.db.models import Q
 from courses.models import Course, Video, CourseProgress, CourseRating
 from dashboard.mixins import (
     DashboardMixin,
@@ -19,13 +19,9 @@ class CourseListView(DashboardMixin, ListView):
     ordering = ["-created_date"]
 
     def get_queryset(self):
-        """Return optimized queryset with instructor and student count, filtered by search/status."""
-        queryset = (
-            super()
-            .get_queryset()
-            .select_related("instructor")
-            .annotate(total_students=Count("students"))
-        )
+        """Return optimized queryset with instructor, filtered by search/status."""
+        # Student counts are read from the stored Course.student_count
+        queryset = super().get_queryset().select_related("instructor")
         search_query = self.request.GET.get("search", "")
         status_filter = self.request.GET.get("status", "")
 
@@ -2,6 +2,7 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.contrib.auth import update_session_auth_hash
+from django.core.exceptions import ValidationError
 from django.http import JsonResponse
 from django.views.decorators.http import require_POST
 from django.db.models import Q, Count, Avg
@@ -9,6 +10,7 @@ from django.db.models import Q, Count, Avg
 from cart.cart import CartSession
 from orders.models import Order
 from courses.models import Course, CourseProgress, CourseRating
+from files.images import validate_image_upload
 from dashboard.customers.forms import (
     ProfileUpdateForm,
     EmailUpdateForm,
@@ -315,6 +317,11 @@ def upload_profile_image_ajax(request):
             {"success": False, "message": "حجم تصویر نباید بیشتر از 2 مگابایت باشد"}
         )
 
+    try:
+        validate_image_upload(image)
+    except ValidationError as e:
+        return JsonResponse({"success": False, "message": e.messages[0]})
+
     # Save image
     profile.image = image
     profile.save()
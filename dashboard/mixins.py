@@ -3,6 +3,8 @@ from django.contrib import messages
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
 
+from core.pagination import CachedCountPaginator
+
 
 class StaffRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
     """
@@ -60,4 +62,5 @@ class DashboardMixin(StaffRequiredMixin):
     Mixin پایه برای تمام ویوهای داشبورد
     """
 
-    pass
+    # Paginated dashboard lists reuse cached or estimated row counts
+    paginator_class = CachedCountPaginator
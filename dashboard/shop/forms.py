@@ -0,0 +1,25 @@
+from django import forms
+from django.core.exceptions import ValidationError
+
+from shop.importers import FeedError, detect_feed_format
+
+
+class ProductImportForm(forms.Form):
+    """Form for uploading a CSV or JSONL product feed."""
+
+    feed = forms.FileField(
+        label="فایل محصولات",
+        help_text=(
+            "فایل CSV یا JSONL با ستون‌های title، slug، category (اسلاگ دسته‌بندی)، "
+            "price، discounted_price، stock و features"
+        ),
+    )
+
+    def clean_feed(self):
+        """Make sure the uploaded file is in a supported feed format."""
+        feed = self.cleaned_data["feed"]
+        try:
+            self.feed_format = detect_feed_format(feed.name)
+        except FeedError:
+            raise ValidationError("فقط فایل‌های CSV و JSONL پشتیبانی می‌شوند")
+        return feed
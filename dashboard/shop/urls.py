@@ -20,6 +20,7 @@ urlpatterns = [
     ),
     path("products/", views.ProductListView.as_view(), name="product-list"),
     path("products/create/", views.ProductCreateView.as_view(), name="product-create"),
+    path("products/import/", views.ProductImportView.as_view(), name="product-import"),
     path(
         "products/<int:pk>/update/",
         views.ProductUpdateView.as_view(),
@@ -1,7 +1,11 @@
-from django.views.generic import ListView, CreateView, UpdateView, DeleteView
+from django.contrib import messages
+from django.views.generic import ListView, CreateView, UpdateView, DeleteView, FormView
 from django.urls import reverse_lazy
-from django.db.models import Q, Count, Sum
+from django.db.models import Q, Sum
+from shop.importers import queue_feed
 from shop.models import Category, Product, ProductFeature
+from shop.stock import adjust_stock
+from .forms import ProductImportForm
 from dashboard.mixins import (
     DashboardMixin,
     SuccessMessageMixin,
@@ -22,9 +26,10 @@ class CategoryListView(DashboardMixin, ListView):
 
     def get_queryset(self):
         """
-        Returns filtered and annotated queryset:
+        Returns filtered queryset; product counts come from the
+        counters stored on each category.
         """
-        queryset = super().get_queryset().annotate(products_count=Count("products"))
+        queryset = super().get_queryset().select_related("parent")
         search_query = self.request.GET.get("search", "")
         status_filter = self.request.GET.get("status", "")
 
@@ -166,6 +171,7 @@ class ProductListView(DashboardMixin, ListView):
         context["categories"] = Category.objects.filter(is_active=True)
         context["title"] = "مدیریت محصولات"
         context["create_url"] = reverse_lazy("dashboard:shop:product-create")
+        context["import_url"] = reverse_lazy("dashboard:shop:product-import")
         return context
 
 
@@ -229,6 +235,18 @@ class ProductUpdateView(DashboardMixin, SuccessMessageMixin, UpdateView):
     success_url = reverse_lazy("dashboard:shop:product-list")
     success_message = "محصول با موفقیت ویرایش شد."
 
+    def form_valid(self, form):
+        """
+        Saves the product and applies a stock edit through shop.stock as
+        a change from the loaded stock, since save() never writes stock.
+        """
+        response = super().form_valid(form)
+        if "stock" in form.changed_data:
+            adjust_stock(
+                self.object.pk, form.cleaned_data["stock"] - form.initial["stock"]
+            )
+        return response
+
     def get_context_data(self, **kwargs):
         """
         Adds page title and submit button text.
@@ -258,6 +276,42 @@ class ProductDeleteView(DashboardMixin, DeleteSuccessMessageMixin, DeleteView):
         return context
 
 
+class ProductImportView(DashboardMixin, FormView):
+    """
+    Queues an uploaded CSV/JSONL feed for the import_products command.
+    """
+
+    form_class = ProductImportForm
+    template_name = "dashboard/shop/product_import.html"
+    success_url = reverse_lazy("dashboard:shop:product-list")
+
+    def form_valid(self, form):
+        """
+        Stores the uploaded feed for the background importer instead of
+        importing up to 100k rows inside the request.
+        """
+        try:
+            queue_feed(form.cleaned_data["feed"], form.feed_format)
+        except OSError as e:
+            form.add_error("feed", f"خطا در ذخیره فایل: {e}")
+            return self.form_invalid(form)
+
+        messages.success(
+            self.request,
+            "فایل محصولات در صف ورود قرار گرفت و به‌زودی پردازش می‌شود.",
+        )
+        return super().form_valid(form)
+
+    def get_context_data(self, **kwargs):
+        """
+        Adds page title and submit button text.
+        """
+        context = super().get_context_data(**kwargs)
+        context["title"] = "ورود گروهی محصولات"
+        context["submit_text"] = "شروع ورود"
+        return context
+
+
 class ProductFeatureListView(DashboardMixin, ListView):
     """
     Displays a paginated list of product features.
@@ -0,0 +1,226 @@
+import hashlib
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from PIL import Image, ImageOps, features
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+
+from core.cache import bump_generation
+from shop.cache import CATALOG_NAMESPACE
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVES_DIR = "derivatives"
+
+DERIVATIVE_WIDTHS = getattr(settings, "IMAGE_DERIVATIVE_WIDTHS", (320, 640, 960, 1280))
+
+# Preferred formats first; formats this Pillow build cannot encode are skipped
+DERIVATIVE_FORMATS = tuple(
+    fmt
+    for fmt in getattr(settings, "IMAGE_DERIVATIVE_FORMATS", ("avif", "webp"))
+    if features.check(fmt)
+)
+
+DERIVATIVE_WORKERS = getattr(settings, "IMAGE_DERIVATIVE_WORKERS", 2)
+
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp"}
+
+SAVE_OPTIONS = {
+    "avif": {"quality": 60},
+    "webp": {"quality": 80, "method": 4},
+}
+
+# Uploaded image fields that get responsive derivatives, by model label
+IMAGE_FIELDS = {
+    "shop.Product": "image",
+    "courses.Course": "thumbnail",
+    "articles.Article": "featured_image",
+    "accounts.Profile": "image",
+    "website.PartnerCompany": "image",
+}
+
+# Cache namespaces whose rendered fragments embed an image's srcset, by
+# model label; they are bumped once the image's derivatives are written
+IMAGE_NAMESPACES = {"shop.Product": CATALOG_NAMESPACE}
+
+ALLOWED_UPLOAD_FORMATS = {"JPEG", "PNG", "WEBP", "GIF", "AVIF"}
+
+MAX_UPLOAD_PIXELS = 40_000_000
+
+
+def derivative_name(name, width, fmt):
+    """Return the storage name of one derivative of an uploaded image."""
+    stem, _ = os.path.splitext(name)
+    return f"{DERIVATIVES_DIR}/{stem}-{width}w.{fmt}"
+
+
+def derivative_marker(name):
+    """Return the storage name of the file marking an image as rendered."""
+    stem, _ = os.path.splitext(name)
+    return f"{DERIVATIVES_DIR}/{stem}.rendered"
+
+
+def derivative_targets(name):
+    """Return (width, format, path) for every derivative of an image."""
+    return [
+        (width, fmt, default_storage.path(derivative_name(name, width, fmt)))
+        for fmt in DERIVATIVE_FORMATS
+        for width in DERIVATIVE_WIDTHS
+    ]
+
+
+def render_derivatives(source_path, targets, marker_path=None):
+    """
+    Resize one image into every target width and format.
+
+    Runs inside a worker process, so it only touches Pillow and the
+    filesystem. Widths at or above the source width are skipped rather
+    than upscaled, so the marker file, touched once every target is
+    done, is what records the image as rendered. Returns the number of
+    files written.
+    """
+    written = 0
+    with Image.open(source_path) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+
+        for width, fmt, target_path in targets:
+            if width >= image.width:
+                continue
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.Resampling.LANCZOS)
+
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            # Per-process temp name: two workers may render the same image
+            temp_path = f"{target_path}.{os.getpid()}.tmp"
+            resized.save(temp_path, format=fmt.upper(), **SAVE_OPTIONS.get(fmt, {}))
+            os.replace(temp_path, target_path)
+            written += 1
+
+    if marker_path:
+        os.makedirs(os.path.dirname(marker_path), exist_ok=True)
+        with open(marker_path, "w"):
+            pass
+    return written
+
+
+def needs_derivatives(name):
+    """Check whether an image was never rendered or changed since it was."""
+    if not DERIVATIVE_FORMATS or not default_storage.exists(name):
+        return False
+    marker_path = default_storage.path(derivative_marker(name))
+    return not os.path.exists(marker_path) or (
+        os.path.getmtime(marker_path) < os.path.getmtime(default_storage.path(name))
+    )
+
+
+def submit_derivatives(executor, name):
+    """Submit the rendering of one image's derivatives to a process pool."""
+    return executor.submit(
+        render_derivatives,
+        default_storage.path(name),
+        derivative_targets(name),
+        default_storage.path(derivative_marker(name)),
+    )
+
+
+def derivatives_rendered(name, namespace=None):
+    """
+    Make freshly written derivatives visible: drop the image's cached
+    srcsets and bump the namespace of fragments that embed them.
+    """
+    forget_srcsets(name)
+    if namespace:
+        bump_generation(namespace)
+
+
+_executor = None
+
+
+def get_executor():
+    """Return the process pool used to render derivatives off the request path."""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=DERIVATIVE_WORKERS)
+    return _executor
+
+
+def _on_rendered(name, namespace, future):
+    """Runs in the parent process once a worker has finished an image."""
+    if future.exception() is not None:
+        logger.error("Image derivative generation failed: %s", future.exception())
+        return
+    derivatives_rendered(name, namespace)
+
+
+def schedule_derivatives(name, namespace=None):
+    """
+    Queue derivative generation for an image if it is out of date. Once
+    the files are written, cached srcsets are dropped and the namespace,
+    if given, is bumped.
+    """
+    if not name or not needs_derivatives(name):
+        return None
+    future = submit_derivatives(get_executor(), name)
+    future.add_done_callback(partial(_on_rendered, name, namespace))
+    return future
+
+
+def _srcset_key(name):
+    return f"images:srcset:{hashlib.md5(name.encode()).hexdigest()}"
+
+
+def get_srcsets(name):
+    """
+    Return {format: srcset} built from the derivatives that exist for an
+    image. The result is cached until derivatives_rendered() drops it,
+    so rendering an image costs one cache read instead of a stat per
+    width and format.
+    """
+    key = _srcset_key(name)
+    srcsets = cache.get(key)
+    if srcsets is None:
+        srcsets = {}
+        for fmt in DERIVATIVE_FORMATS:
+            entries = []
+            for width in DERIVATIVE_WIDTHS:
+                candidate = derivative_name(name, width, fmt)
+                if os.path.exists(default_storage.path(candidate)):
+                    entries.append(f"{default_storage.url(candidate)} {width}w")
+            srcsets[fmt] = ", ".join(entries)
+        cache.set(key, srcsets, None)
+    return srcsets
+
+
+def forget_srcsets(name):
+    """Drop the cached srcsets of an image."""
+    cache.delete(_srcset_key(name))
+
+
+def validate_image_upload(uploaded_file):
+    """
+    Make sure an uploaded file really is a reasonably sized image in a
+    supported format, not just a file with an image extension.
+    """
+    try:
+        with Image.open(uploaded_file) as image:
+            image_format = image.format
+            width, height = image.size
+            image.verify()
+    except (OSError, SyntaxError, Image.DecompressionBombError):
+        raise ValidationError("فایل انتخاب شده یک تصویر معتبر نیست")
+    finally:
+        uploaded_file.seek(0)
+
+    if image_format not in ALLOWED_UPLOAD_FORMATS:
+        raise ValidationError("فرمت تصویر پشتیبانی نمی‌شود")
+
+    if width * height > MAX_UPLOAD_PIXELS:
+        raise ValidationError("ابعاد تصویر بیش از حد بزرگ است")
@@ -0,0 +1,92 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from core.cache import bump_generation
+from files.images import (
+    DERIVATIVE_WORKERS,
+    IMAGE_FIELDS,
+    IMAGE_NAMESPACES,
+    derivatives_rendered,
+    needs_derivatives,
+    submit_derivatives,
+)
+
+
+class Command(BaseCommand):
+    help = "Generate responsive WebP/AVIF derivatives for existing uploaded images"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=DERIVATIVE_WORKERS,
+            help="Number of worker processes",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate derivatives even when they are up to date",
+        )
+
+    def handle(self, *args, **options):
+        names = self.collect_image_names()
+        if not options["force"]:
+            names = [name for name in names if needs_derivatives(name)]
+        else:
+            names = [name for name in names if default_storage.exists(name)]
+
+        total = len(names)
+        if not total:
+            self.stdout.write(self.style.SUCCESS("All derivatives are up to date."))
+            return
+
+        self.stdout.write(
+            f"Processing {total} images with {options['workers']} workers..."
+        )
+
+        written = failed = 0
+        with ProcessPoolExecutor(max_workers=options["workers"]) as executor:
+            futures = {submit_derivatives(executor, name): name for name in names}
+            for done, future in enumerate(as_completed(futures), 1):
+                try:
+                    written += future.result()
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f"{futures[future]}: {e}")
+                else:
+                    derivatives_rendered(futures[future])
+
+                if done % 100 == 0 or done == total:
+                    self.stdout.write(f"  {done}/{total} images processed")
+
+        # Cached fragments rendered before the files existed lack srcsets
+        for namespace in set(IMAGE_NAMESPACES.values()):
+            bump_generation(namespace)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {written} derivatives for {total - failed} images "
+                f"({failed} failed)."
+            )
+        )
+
+    # --------------------------------------------------
+    # Helpers
+    # --------------------------------------------------
+
+    def collect_image_names(self):
+        """Return the distinct image names referenced by registered models."""
+        names = set()
+        for model_label, field_name in IMAGE_FIELDS.items():
+            model = apps.get_model(model_label)
+            names.update(
+                model.objects.exclude(**{f"{field_name}__isnull": True})
+                .exclude(**{field_name: ""})
+                .values_list(field_name, flat=True)
+                .distinct()
+                .iterator()
+            )
+        return sorted(names)
@@ -0,0 +1,27 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+
+from files.images import IMAGE_FIELDS, IMAGE_NAMESPACES, schedule_derivatives
+
+
+def schedule_image_derivatives(sender, instance, update_fields=None, **kwargs):
+    """
+    Generate responsive derivatives for a saved image once the write is
+    committed. Saves that do not touch the image field are ignored.
+    """
+    field_name = IMAGE_FIELDS[sender._meta.label]
+    if update_fields is not None and field_name not in update_fields:
+        return
+
+    name = getattr(instance, field_name).name
+    namespace = IMAGE_NAMESPACES.get(sender._meta.label)
+    if name:
+        transaction.on_commit(lambda: schedule_derivatives(name, namespace))
+
+
+for model_label in IMAGE_FIELDS:
+    post_save.connect(
+        schedule_image_derivatives,
+        sender=model_label,
+        dispatch_uid=f"image_derivatives_{model_label}",
+    )
@@ -0,0 +1,32 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from ..images import DERIVATIVE_FORMATS, MIME_TYPES, get_srcsets
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_image(image, alt="", sizes="100vw", css_class="img-fluid"):
+    """
+    Render an uploaded image as a <picture> with AVIF/WebP srcset sources,
+    falling back to the original file for browsers and images without
+    derivatives.
+    """
+    if not image:
+        return ""
+
+    sources = []
+    srcsets = get_srcsets(image.name)
+    for fmt in DERIVATIVE_FORMATS:
+        srcset = srcsets.get(fmt)
+        if srcset:
+            sources.append((MIME_TYPES[fmt], srcset, sizes))
+
+    return format_html(
+        '<picture>{}<img src="{}" alt="{}" class="{}" loading="lazy" /></picture>',
+        format_html_join("", '<source type="{}" srcset="{}" sizes="{}" />', sources),
+        image.url,
+        alt,
+        css_class,
+    )
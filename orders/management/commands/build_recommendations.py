@@ -0,0 +1,168 @@
+from array import array
+
+import numpy as np
+from scipy import sparse
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from courses.cache import bump_courses_generation
+from orders.models import ItemRecommendation, OrderItem
+from shop.cache import bump_catalog_generation
+
+
+class Command(BaseCommand):
+    help = (
+        'Build "customers also bought" recommendations for courses and '
+        "products from paid order items"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top-k",
+            type=int,
+            default=8,
+            help="Number of neighbours stored per item",
+        )
+        parser.add_argument(
+            "--min-support",
+            type=int,
+            default=1,
+            help="Minimum number of shared orders for a pair to be kept",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=10000,
+            help="Rows fetched per database round-trip and written per batch",
+        )
+
+    def handle(self, *args, **options):
+        top_k = options["top_k"]
+        chunk_size = options["chunk_size"]
+
+        self.stdout.write("Loading paid order items...")
+        items, orders_by_items = self.load_order_matrix(chunk_size)
+        if not items:
+            self.stdout.write(self.style.WARNING("No paid order items found."))
+            return
+        self.stdout.write(
+            f"{orders_by_items.shape[0]} orders, {len(items)} distinct items"
+        )
+
+        self.stdout.write("Computing item co-occurrence...")
+        similarity = self.build_similarity(orders_by_items, options["min_support"])
+
+        self.stdout.write("Storing top neighbours...")
+        written = self.store_neighbours(items, similarity, top_k, chunk_size)
+        # Product payloads and course page validators embed the
+        # recommendations
+        bump_catalog_generation()
+        bump_courses_generation()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Stored {written} recommendations for {len(items)} items."
+            )
+        )
+
+    # --------------------------------------------------
+    # Helpers
+    # --------------------------------------------------
+
+    def load_order_matrix(self, chunk_size):
+        """
+        Stream paid order lines into a sparse binary orders x items matrix.
+        Row and column indices are kept in compact arrays rather than
+        Python lists so millions of lines fit comfortably in memory.
+        """
+        item_index = {}
+        order_index = {}
+        rows = array("q")
+        cols = array("q")
+
+        lines = (
+            OrderItem.objects.filter(order__is_paid=True)
+            .values_list("order_id", "content_type_id", "object_id")
+            .iterator(chunk_size=chunk_size)
+        )
+        for count, (order_id, content_type_id, object_id) in enumerate(lines, 1):
+            rows.append(order_index.setdefault(order_id, len(order_index)))
+            cols.append(
+                item_index.setdefault((content_type_id, object_id), len(item_index))
+            )
+            if count % (chunk_size * 10) == 0:
+                self.stdout.write(f"  {count} order lines read")
+
+        rows = np.frombuffer(rows, dtype=np.int64)
+        cols = np.frombuffer(cols, dtype=np.int64)
+        matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+            shape=(len(order_index), len(item_index)),
+        )
+        # An item counted twice in one order is still one co-purchase
+        matrix.sum_duplicates()
+        matrix.data[:] = 1
+
+        return list(item_index), matrix
+
+    def build_similarity(self, orders_by_items, min_support):
+        """
+        Return the items x items co-occurrence matrix normalised to cosine
+        similarity, so best sellers do not dominate every list.
+        """
+        cooccurrence = (orders_by_items.T @ orders_by_items).tocsr()
+        purchases = cooccurrence.diagonal()
+
+        cooccurrence.setdiag(0)
+        if min_support > 1:
+            cooccurrence.data[cooccurrence.data < min_support] = 0
+        cooccurrence.eliminate_zeros()
+
+        inverse_norm = sparse.diags(1 / np.sqrt(np.maximum(purchases, 1)))
+        return (inverse_norm @ cooccurrence @ inverse_norm).tocsr()
+
+    def store_neighbours(self, items, similarity, top_k, chunk_size):
+        """
+        Replace the lookup table with the top-k neighbours of every item.
+        """
+        written = 0
+        with transaction.atomic():
+            ItemRecommendation.objects.all().delete()
+
+            batch = []
+            for row, (content_type_id, object_id) in enumerate(items):
+                start, end = similarity.indptr[row], similarity.indptr[row + 1]
+                if start == end:
+                    continue
+
+                scores = similarity.data[start:end]
+                neighbours = similarity.indices[start:end]
+                if len(scores) > top_k:
+                    best = np.argpartition(-scores, top_k)[:top_k]
+                else:
+                    best = np.arange(len(scores))
+                best = best[np.argsort(-scores[best], kind="stable")]
+
+                for rank, position in enumerate(best, 1):
+                    neighbour_type_id, neighbour_id = items[neighbours[position]]
+                    batch.append(
+                        ItemRecommendation(
+                            content_type_id=content_type_id,
+                            object_id=object_id,
+                            recommended_content_type_id=neighbour_type_id,
+                            recommended_object_id=neighbour_id,
+                            score=float(scores[position]),
+                            rank=rank,
+                        )
+                    )
+
+                if len(batch) >= chunk_size:
+                    ItemRecommendation.objects.bulk_create(batch)
+                    written += len(batch)
+                    batch = []
+
+            if batch:
+                ItemRecommendation.objects.bulk_create(batch)
+                written += len(batch)
+
+        return written
@@ -0,0 +1,77 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from orders.models import Order, OrderStatusChoices, ReservationStatusChoices
+
+
+class Command(BaseCommand):
+    help = (
+        "Give back product stock held by unpaid orders whose reservation "
+        "has expired, and cancel those still waiting for payment"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--watch",
+            action="store_true",
+            help="Keep running and check every --interval seconds",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=60,
+            help=(
+                "Seconds between checks while watching, bounding how long "
+                "stock stays held past its expiry"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        self.release(report_empty=True)
+        if not options["watch"]:
+            return
+
+        self.stdout.write("Watching for expired reservations...")
+        while True:
+            time.sleep(options["interval"])
+            self.release()
+
+    # --------------------------------------------------
+    # Helpers
+    # --------------------------------------------------
+
+    def release(self, report_empty=False):
+        """Release the stock of every order whose reservation expired."""
+        orders = Order.objects.filter(
+            is_paid=False,
+            stock_reservations__status=ReservationStatusChoices.ACTIVE,
+            stock_reservations__expires_at__lte=timezone.now(),
+        ).distinct()
+
+        released = cancelled = 0
+        for order in orders.iterator():
+            if self.cancel_if_pending(order):
+                cancelled += 1
+            order.release_stock()
+            released += 1
+
+        if released or report_empty:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Released stock of {released} orders ({cancelled} cancelled)."
+                )
+            )
+
+    def cancel_if_pending(self, order):
+        """
+        Cancel an order that never reached the payment gateway. Orders
+        already at the gateway keep their status so a late payment is
+        still accepted.
+        """
+        return bool(
+            Order.objects.filter(pk=order.pk, status=OrderStatusChoices.PENDING).update(
+                status=OrderStatusChoices.CANCELLED, updated_date=timezone.now()
+            )
+        )
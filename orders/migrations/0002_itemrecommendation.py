@@ -0,0 +1,60 @@
+# Generated by Django 5.2.9 on 2026-10-19 04:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("orders", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ItemRecommendation",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("object_id", models.PositiveIntegerField(verbose_name="شناسه محصول")),
+                (
+                    "recommended_object_id",
+                    models.PositiveIntegerField(verbose_name="شناسه محصول پیشنهادی"),
+                ),
+                ("score", models.FloatField(verbose_name="امتیاز")),
+                ("rank", models.PositiveSmallIntegerField(verbose_name="رتبه")),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="contenttypes.contenttype",
+                        verbose_name="نوع محصول",
+                    ),
+                ),
+                (
+                    "recommended_content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="contenttypes.contenttype",
+                        verbose_name="نوع محصول پیشنهادی",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "پیشنهاد خرید",
+                "verbose_name_plural": "پیشنهادهای خرید",
+                "ordering": ["content_type", "object_id", "rank"],
+                "unique_together": {("content_type", "object_id", "rank")},
+            },
+        ),
+    ]
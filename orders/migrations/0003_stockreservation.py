@@ -0,0 +1,77 @@
+# Generated by Django 5.2.9 on 2026-10-19 04:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0002_itemrecommendation"),
+        ("shop", "0002_alter_product_image"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StockReservation",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("quantity", models.PositiveIntegerField(verbose_name="تعداد")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("active", "رزرو شده"),
+                            ("committed", "فروخته شده"),
+                            ("released", "آزاد شده"),
+                        ],
+                        default="active",
+                        max_length=20,
+                        verbose_name="وضعیت",
+                    ),
+                ),
+                ("expires_at", models.DateTimeField(verbose_name="تاریخ انقضا")),
+                (
+                    "created_date",
+                    models.DateTimeField(auto_now_add=True, verbose_name="تاریخ ایجاد"),
+                ),
+                (
+                    "order",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stock_reservations",
+                        to="orders.order",
+                        verbose_name="سفارش",
+                    ),
+                ),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stock_reservations",
+                        to="shop.product",
+                        verbose_name="محصول",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "رزرو موجودی",
+                "verbose_name_plural": "رزروهای موجودی",
+                "indexes": [
+                    models.Index(
+                        fields=["status", "expires_at"],
+                        name="orders_stoc_status_e8aa04_idx",
+                    )
+                ],
+                "unique_together": {("order", "product")},
+            },
+        ),
+    ]
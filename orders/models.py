@@ -1,4 +1,6 @@
-from django.db import models
+import logging
+
+from django.db import models, transaction
 from django.conf import settings
 from django.core.validators import MinValueValidator
 from django.utils.translation import gettext_lazy as _
@@ -6,6 +8,8 @@ from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 import uuid
 
+logger = logging.getLogger(__name__)
+
 
 class OrderStatusChoices(models.TextChoices):
     """Order status choices."""
@@ -156,17 +160,42 @@ class Order(models.Model):
         return False
 
     def mark_as_paid(self, ref_id):
-        """Mark order as paid and update payment information."""
+        """
+        Mark order as paid and update payment information. Returns the
+        ids of products that could not be covered by stock.
+        """
         from django.utils import timezone
 
         self.is_paid = True
         self.status = OrderStatusChoices.PAID
         self.zarinpal_ref_id = ref_id
         self.payment_date = timezone.now()
+
+        # Turn the stock held at checkout into a sale
+        short = self.commit_stock()
+        if short:
+            # Paid without stock behind it; flag it for manual handling
+            logger.error(
+                "Order %s was paid after its hold expired and products %s ran out",
+                self.order_number,
+                short,
+            )
+            self.notes = "\n".join(
+                filter(
+                    None,
+                    [
+                        self.notes,
+                        "نیاز به بررسی: موجودی محصولات "
+                        + "، ".join(map(str, short))
+                        + " پس از انقضای رزرو تمام شد.",
+                    ],
+                )
+            )
         self.save()
 
         # Process paid items (enroll in courses, grant access to products)
         self.process_paid_items()
+        return short
 
     def process_paid_items(self):
         """
@@ -198,6 +227,79 @@ class Order(models.Model):
         """Grant user access to a product (for future use)."""
         pass
 
+    def reserve_stock(self):
+        """
+        Take stock for every product in the order and record the holds.
+
+        Must run inside the transaction that creates the order, so a
+        product that runs out rolls the whole order back. Products are
+        taken in id order so concurrent checkouts lock rows consistently.
+        """
+        from datetime import timedelta
+        from django.utils import timezone
+        from shop.models import Product
+        from shop.stock import InsufficientStock, decrement_stock
+
+        expires_at = timezone.now() + timedelta(
+            minutes=getattr(settings, "STOCK_RESERVATION_TIMEOUT", 30)
+        )
+        lines = (
+            self.items.filter(content_type=ContentType.objects.get_for_model(Product))
+            .order_by("object_id")
+            .values_list("object_id", "quantity")
+        )
+
+        reservations = []
+        for product_id, quantity in lines:
+            if not decrement_stock(product_id, quantity):
+                raise InsufficientStock(product_id, quantity)
+            reservations.append(
+                StockReservation(
+                    order=self,
+                    product_id=product_id,
+                    quantity=quantity,
+                    expires_at=expires_at,
+                )
+            )
+        StockReservation.objects.bulk_create(reservations)
+        self._refresh_stock_mirror([r.product_id for r in reservations])
+
+    def release_stock(self):
+        """Give back the stock still held by this order."""
+        released = []
+        with transaction.atomic():
+            for reservation in self.stock_reservations.filter(
+                status=ReservationStatusChoices.ACTIVE
+            ).order_by("product_id"):
+                if reservation.release():
+                    released.append(reservation.product_id)
+        self._refresh_stock_mirror(released)
+
+    def commit_stock(self):
+        """
+        Mark the stock held by this order as sold. Returns the ids of the
+        products whose hold expired and ran out before payment; their
+        reservations stay released.
+        """
+        committed, short = [], []
+        with transaction.atomic():
+            for reservation in self.stock_reservations.exclude(
+                status=ReservationStatusChoices.COMMITTED
+            ).order_by("product_id"):
+                if reservation.commit():
+                    committed.append(reservation.product_id)
+                else:
+                    short.append(reservation.product_id)
+        self._refresh_stock_mirror(committed)
+        return short
+
+    @staticmethod
+    def _refresh_stock_mirror(product_ids):
+        from shop.stock import refresh_stock_mirror
+
+        if product_ids:
+            transaction.on_commit(lambda: refresh_stock_mirror(product_ids))
+
     def can_be_paid(self):
         """Check if order can be paid."""
         return self.status == OrderStatusChoices.PENDING and not self.is_paid
@@ -273,6 +375,100 @@ class OrderItem(models.Model):
         return None
 
 
+class ReservationStatusChoices(models.TextChoices):
+    """Stock reservation status choices."""
+
+    ACTIVE = "active", _("رزرو شده")
+    COMMITTED = "committed", _("فروخته شده")
+    RELEASED = "released", _("آزاد شده")
+
+
+class StockReservation(models.Model):
+    """
+    Product stock held by an order between checkout and payment.
+    The stock itself is taken from Product.stock when the order is
+    placed, so this row is what allows it to be given back.
+    """
+
+    order = models.ForeignKey(
+        Order,
+        on_delete=models.CASCADE,
+        related_name="stock_reservations",
+        verbose_name=_("سفارش"),
+    )
+    product = models.ForeignKey(
+        "shop.Product",
+        on_delete=models.CASCADE,
+        related_name="stock_reservations",
+        verbose_name=_("محصول"),
+    )
+    quantity = models.PositiveIntegerField(_("تعداد"))
+    status = models.CharField(
+        _("وضعیت"),
+        max_length=20,
+        choices=ReservationStatusChoices.choices,
+        default=ReservationStatusChoices.ACTIVE,
+    )
+    expires_at = models.DateTimeField(_("تاریخ انقضا"))
+
+    created_date = models.DateTimeField(
+        auto_now_add=True, verbose_name=_("تاریخ ایجاد")
+    )
+
+    class Meta:
+        verbose_name = _("رزرو موجودی")
+        verbose_name_plural = _("رزروهای موجودی")
+        unique_together = ("order", "product")
+        indexes = [
+            models.Index(fields=["status", "expires_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.quantity} x product {self.product_id} - {self.status}"
+
+    def _transition(self, from_status, to_status):
+        """Move to a new status only if no one else moved it first."""
+        changed = StockReservation.objects.filter(
+            pk=self.pk, status=from_status
+        ).update(status=to_status)
+        if changed:
+            self.status = to_status
+        return bool(changed)
+
+    def release(self):
+        """Return the held stock to the product. Returns whether it did."""
+        from shop.stock import increment_stock
+
+        if not self._transition(
+            ReservationStatusChoices.ACTIVE, ReservationStatusChoices.RELEASED
+        ):
+            return False
+        increment_stock(self.product_id, self.quantity)
+        return True
+
+    def commit(self):
+        """
+        Keep the held stock as sold. A hold that already expired is taken
+        again if the product still has it; otherwise it stays released.
+        Returns whether stock covers it.
+        """
+        from shop.stock import decrement_stock, increment_stock
+
+        if self._transition(
+            ReservationStatusChoices.ACTIVE, ReservationStatusChoices.COMMITTED
+        ):
+            return True
+        if not decrement_stock(self.product_id, self.quantity):
+            return False
+        if self._transition(
+            ReservationStatusChoices.RELEASED, ReservationStatusChoices.COMMITTED
+        ):
+            return True
+        # Committed by someone else meanwhile; return what was taken again
+        increment_stock(self.product_id, self.quantity)
+        return True
+
+
 class Coupon(models.Model):
     """Model for discount coupons."""
 
@@ -349,3 +545,49 @@ class Coupon(models.Model):
         """Increment usage counter."""
         self.current_usage += 1
         self.save()
+
+
+class ItemRecommendation(models.Model):
+    """
+    Precomputed "customers also bought" neighbour of a course or product.
+    Rebuilt offline by the build_recommendations management command.
+    """
+
+    # Item the recommendation is shown for
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name=_("نوع محصول"),
+    )
+    object_id = models.PositiveIntegerField(verbose_name=_("شناسه محصول"))
+    content_object = GenericForeignKey("content_type", "object_id")
+
+    # Item bought together with it
+    recommended_content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name=_("نوع محصول پیشنهادی"),
+    )
+    recommended_object_id = models.PositiveIntegerField(
+        verbose_name=_("شناسه محصول پیشنهادی")
+    )
+    recommended_object = GenericForeignKey(
+        "recommended_content_type", "recommended_object_id"
+    )
+
+    score = models.FloatField(_("امتیاز"))
+    rank = models.PositiveSmallIntegerField(_("رتبه"))
+
+    class Meta:
+        verbose_name = _("پیشنهاد خرید")
+        verbose_name_plural = _("پیشنهادهای خرید")
+        ordering = ["content_type", "object_id", "rank"]
+        unique_together = ("content_type", "object_id", "rank")
+
+    def __str__(self):
+        return (
+            f"{self.content_type.model}:{self.object_id} -> "
+            f"{self.recommended_content_type.model}:{self.recommended_object_id}"
+        )
@@ -0,0 +1,47 @@
+from django.contrib.contenttypes.models import ContentType
+
+from .models import ItemRecommendation
+
+
+def get_recommended_items(obj, limit=4, model=None):
+    """
+    Return up to ``limit`` active items that customers bought together
+    with ``obj``, best match first.
+
+    Neighbours are read from the precomputed lookup table with a single
+    indexed query, then hydrated with one ``in_bulk`` call per item type.
+    Pass ``model`` to only recommend items of that type.
+    """
+    neighbours = ItemRecommendation.objects.filter(
+        content_type=ContentType.objects.get_for_model(obj), object_id=obj.pk
+    )
+    if model is not None:
+        neighbours = neighbours.filter(
+            recommended_content_type=ContentType.objects.get_for_model(model)
+        )
+
+    # Over-fetch a little so inactive items can be skipped
+    neighbours = list(
+        neighbours.order_by("rank").values_list(
+            "recommended_content_type_id", "recommended_object_id"
+        )[: limit * 2]
+    )
+    if not neighbours:
+        return []
+
+    ids_by_type = {}
+    for content_type_id, object_id in neighbours:
+        ids_by_type.setdefault(content_type_id, []).append(object_id)
+
+    objects = {}
+    for content_type_id, object_ids in ids_by_type.items():
+        item_model = ContentType.objects.get_for_id(content_type_id).model_class()
+        if item_model is None:
+            continue
+        for pk, item in (
+            item_model.objects.filter(is_active=True).in_bulk(object_ids).items()
+        ):
+            objects[(content_type_id, pk)] = item
+
+    items = [objects[key] for key in neighbours if key in objects]
+    return items[:limit]
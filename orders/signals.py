@@ -0,0 +1,17 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from orders.models import Order, OrderStatusChoices
+
+# Statuses from which an order can no longer be paid
+CLOSED_UNPAID_STATUSES = (OrderStatusChoices.FAILED, OrderStatusChoices.CANCELLED)
+
+
+@receiver(post_save, sender=Order)
+def release_stock_on_close(sender, instance, created, **kwargs):
+    """
+    Give back the stock held by an order once its payment fails or it
+    is cancelled, wherever the status change came from.
+    """
+    if not created and instance.status in CLOSED_UNPAID_STATUSES:
+        instance.release_stock()
@@ -6,10 +6,12 @@ from django.views.decorators.http import require_POST
 from django.conf import settings
 from django.urls import reverse
 from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
 from decimal import Decimal
 import requests
 
 from cart.cart import CartSession
+from shop.stock import InsufficientStock
 from .models import Order, OrderItem, Coupon, OrderStatusChoices
 from .forms import OrderCreateForm, CouponApplyForm
 
@@ -69,48 +71,52 @@ def checkout_view(request):
 
         if form.is_valid():
             try:
-                # Create order
-                order = form.save(commit=False)
-                order.user = request.user
-                order.total_price = subtotal
-                order.discount_amount = discount_amount
-                order.tax_amount = tax_amount
-                order.final_price = total
-                order.save()
-
-                # Create order items with Generic Foreign Keys
-                for item in cart_items:
-                    product_obj = item["product_obj"]
-                    product_type = item["product_type"]
-
-                    # Get appropriate ContentType
-                    if product_type == "course":
-                        from courses.models import Course
-
-                        content_type = ContentType.objects.get_for_model(Course)
-                    elif product_type == "product":
-                        from shop.models import Product
-
-                        content_type = ContentType.objects.get_for_model(Product)
-                    else:
-                        continue  # Skip unknown types
-
-                    OrderItem.objects.create(
-                        order=order,
-                        content_type=content_type,
-                        object_id=product_obj.id,
-                        price=item["total_price"],  # Already calculated in cart
-                        quantity=item["quantity"],
-                    )
-
-                # Apply coupon if exists
-                if coupon_id:
-                    try:
-                        coupon = Coupon.objects.get(id=coupon_id)
-                        coupon.use_coupon()
-                        del request.session["coupon_id"]
-                    except Coupon.DoesNotExist:
-                        pass
+                with transaction.atomic():
+                    # Create order
+                    order = form.save(commit=False)
+                    order.user = request.user
+                    order.total_price = subtotal
+                    order.discount_amount = discount_amount
+                    order.tax_amount = tax_amount
+                    order.final_price = total
+                    order.save()
+
+                    # Create order items with Generic Foreign Keys
+                    for item in cart_items:
+                        product_obj = item["product_obj"]
+                        product_type = item["product_type"]
+
+                        # Get appropriate ContentType
+                        if product_type == "course":
+                            from courses.models import Course
+
+                            content_type = ContentType.objects.get_for_model(Course)
+                        elif product_type == "product":
+                            from shop.models import Product
+
+                            content_type = ContentType.objects.get_for_model(Product)
+                        else:
+                            continue  # Skip unknown types
+
+                        OrderItem.objects.create(
+                            order=order,
+                            content_type=content_type,
+                            object_id=product_obj.id,
+                            price=item["total_price"],  # Already calculated in cart
+                            quantity=item["quantity"],
+                        )
+
+                    # Hold product stock; rolls the order back if anything ran out
+                    order.reserve_stock()
+
+                    # Apply coupon if exists
+                    if coupon_id:
+                        try:
+                            coupon = Coupon.objects.get(id=coupon_id)
+                            coupon.use_coupon()
+                            del request.session["coupon_id"]
+                        except Coupon.DoesNotExist:
+                            pass
 
                 # Redirect to payment
                 messages.success(
@@ -118,6 +124,19 @@ def checkout_view(request):
                 )
                 return redirect("orders:payment", order_id=order.id)
 
+            except InsufficientStock as e:
+                product_title = next(
+                    (
+                        item["product_obj"].title
+                        for item in cart_items
+                        if item["product_type"] == "product"
+                        and item["product_obj"].id == e.product_id
+                    ),
+                    "",
+                )
+                messages.error(request, f'موجودی محصول "{product_title}" کافی نیست')
+                return redirect("cart:cart_detail")
+
             except Exception as e:
                 messages.error(request, f"خطا در ثبت سفارش: {str(e)}")
                 return redirect("cart:cart_detail")
@@ -244,7 +263,7 @@ def payment_callback_view(request):
             if response_data.get("data") and response_data["data"].get("code") == 100:
                 # Payment verified successfully
                 ref_id = response_data["data"]["ref_id"]
-                order.mark_as_paid(ref_id)
+                out_of_stock = order.mark_as_paid(ref_id)
 
                 # Clear cart
                 cart = CartSession(request.session)
@@ -253,6 +272,12 @@ def payment_callback_view(request):
                 messages.success(
                     request, f"پرداخت شما با موفقیت انجام شد. کد پیگیری: {ref_id}"
                 )
+                if out_of_stock:
+                    messages.warning(
+                        request,
+                        "موجودی برخی از محصولات سفارش شما پیش از پرداخت به پایان رسید. "
+                        "پشتیبانی برای ارسال یا بازگشت وجه با شما تماس می‌گیرد",
+                    )
                 return redirect("orders:order_success", order_id=order.id)
             else:
                 # Verification failed
@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import Category, Product, ProductFeature
+from .stock import adjust_stock
 
 
 class ProductFeatureInline(admin.TabularInline):
@@ -88,9 +89,12 @@ class ProductAdmin(admin.ModelAdmin):
 
     def save_model(self, request, obj, form, change):
         """
-        Custom save to handle free products
+        Custom save to handle free products; stock edits are applied as
+        a change to the current stock, which save() never writes.
         """
         super().save_model(request, obj, form, change)
+        if change and "stock" in form.changed_data:
+            adjust_stock(obj.pk, form.cleaned_data["stock"] - form.initial["stock"])
 
 
 @admin.register(ProductFeature)
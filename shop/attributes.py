@@ -0,0 +1,136 @@
+from collections import defaultdict
+
+from django.db import connection
+from django.db.models import Q
+
+from shop.models import Product, ProductFeature
+
+ATTRIBUTE_PARAM = "attr"
+
+# Facet panel size: attribute names shown, and values listed per name
+FACET_NAME_LIMIT = 8
+FACET_VALUE_LIMIT = 10
+
+
+def build_attribute_maps(product_ids):
+    """Return {product_id: {feature_name: feature_value}} from feature rows."""
+    attributes = {product_id: {} for product_id in product_ids}
+    features = (
+        ProductFeature.objects.filter(product_id__in=product_ids)
+        .order_by("product_id", "order", "id")
+        .values_list("product_id", "feature_name", "feature_value")
+    )
+    for product_id, name, value in features:
+        attributes[product_id][name.strip()] = value.strip()
+    return attributes
+
+
+def sync_product_attributes(product_ids):
+    """
+    Copy the feature rows of products into their indexed attribute map.
+    Uses bulk_update so Product signals do not fire once per product.
+    """
+    product_ids = list(product_ids)
+    if not product_ids:
+        return
+    products = [
+        Product(pk=product_id, attributes=attributes)
+        for product_id, attributes in build_attribute_maps(product_ids).items()
+    ]
+    Product.objects.bulk_update(products, ["attributes"], batch_size=1000)
+
+
+def parse_attribute_params(values):
+    """Turn ["name:value", ...] request values into {name: [value, ...]}."""
+    selected = defaultdict(list)
+    for raw in values:
+        name, separator, value = raw.partition(":")
+        name, value = name.strip(), value.strip()
+        if separator and name and value and value not in selected[name]:
+            selected[name].append(value)
+    return dict(selected)
+
+
+def attribute_filter(selected):
+    """
+    Build a filter over the attribute map: values of one attribute are
+    alternatives, different attributes must all match. Each term is a
+    JSONB containment (@>) test, which the GIN index answers directly.
+    """
+    condition = Q()
+    for name, values in selected.items():
+        alternatives = Q()
+        for value in values:
+            alternatives |= Q(attributes__contains={name: value})
+        condition &= alternatives
+    return condition
+
+
+def count_attribute_values(queryset, name=None):
+    """
+    Count products per attribute value within a queryset, optionally for
+    one attribute name only, with a single GROUP BY over
+    jsonb_each_text() instead of joining features.
+
+    Returns [(name, value, count), ...].
+    """
+    product_ids = queryset.order_by().values("pk")
+    subquery, params = product_ids.query.sql_with_params()
+    table = Product._meta.db_table
+    key_condition = ""
+    if name is not None:
+        key_condition = "AND attribute.key = %s"
+        params = (*params, name)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT attribute.key, attribute.value, COUNT(*) AS products
+            FROM {table}, jsonb_each_text({table}.attributes) AS attribute
+            WHERE {table}.id IN ({subquery}) {key_condition}
+            GROUP BY attribute.key, attribute.value
+            """,
+            params,
+        )
+        return cursor.fetchall()
+
+
+def get_attribute_facets(queryset, selected=None):
+    """
+    Count products per attribute value for a queryset that has every
+    filter applied except the attribute selections.
+
+    Facets are disjunctive: values of a selected attribute are counted
+    with only the other attributes' selections applied, so its other
+    values stay listed as alternatives to add. Unselected attributes are
+    counted with every selection applied. That is one query, plus one
+    per selected attribute. Selected values are always listed.
+
+    Returns [(name, [(value, count), ...]), ...], most common names first.
+    """
+    selected = selected or {}
+    rows = [
+        row
+        for row in count_attribute_values(queryset.filter(attribute_filter(selected)))
+        if row[0] not in selected
+    ]
+    for name in selected:
+        others = {other: values for other, values in selected.items() if other != name}
+        rows += count_attribute_values(queryset.filter(attribute_filter(others)), name)
+    rows.sort(key=lambda row: (-row[2], row[0], row[1]))
+
+    facets = defaultdict(list)
+    totals = defaultdict(int)
+    for name, value, count in rows:
+        totals[name] += count
+        if len(facets[name]) < FACET_VALUE_LIMIT or value in selected.get(name, ()):
+            facets[name].append((value, count))
+    for name, values in selected.items():
+        listed = {value for value, _ in facets[name]}
+        facets[name] += [(value, 0) for value in values if value not in listed]
+
+    # Selected attributes are always shown, then the most common others
+    names = sorted(facets, key=lambda name: (-totals[name], name))
+    others = [name for name in names if name not in selected]
+    shown = {*selected, *others[: max(FACET_NAME_LIMIT - len(selected), 0)]}
+    return [(name, facets[name]) for name in names if name in shown]
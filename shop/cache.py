@@ -0,0 +1,75 @@
+import hashlib
+
+from django.conf import settings
+from django.http import QueryDict
+
+from core.cache import get_generation, bump_generation
+
+CATALOG_NAMESPACE = "catalog"
+
+CATALOG_CACHE_TIMEOUT = getattr(settings, "CATALOG_CACHE_TIMEOUT", 60 * 60)
+
+# Query parameters understood by the product listing, with the value that
+# is equivalent to leaving the parameter out.
+LISTING_PARAMS = {
+    "search": "",
+    "category": "",
+    "type": "",
+    "min_price": "",
+    "max_price": "",
+    "is_free": "",
+    "sort": "-created_at",
+    "page": "1",
+}
+
+
+def get_catalog_generation():
+    """Return the generation counter shared by all catalog cache keys."""
+    return get_generation(CATALOG_NAMESPACE)
+
+
+def bump_catalog_generation():
+    """Invalidate every cached catalog fragment in one step."""
+    return bump_generation(CATALOG_NAMESPACE)
+
+
+def normalize_listing_params(query_params):
+    """
+    Reduce request GET parameters to the ones that affect the listing,
+    dropping blanks and defaults so equivalent URLs share a cache entry.
+    """
+    normalized = QueryDict(mutable=True)
+    for name, default in LISTING_PARAMS.items():
+        value = query_params.get(name, "").strip()
+        if value and value != default:
+            normalized[name] = value
+    # Attribute filters repeat and their order does not matter
+    attributes = {value.strip() for value in query_params.getlist("attr")}
+    for value in sorted(attributes):
+        if ":" in value:
+            normalized.appendlist("attr", value)
+    return normalized
+
+
+def product_listing_cache_key(normalized_params, generation):
+    """Build the cache key for a rendered product listing page."""
+    digest = hashlib.md5(normalized_params.urlencode().encode()).hexdigest()
+    return f"shop:listing:{generation}:{digest}"
+
+
+def product_detail_cache_key(slug):
+    """Build the cache key for a product detail payload."""
+    digest = hashlib.md5(slug.encode()).hexdigest()
+    return f"shop:product_detail:{digest}"
+
+
+def product_facets_cache_key(normalized_params, generation):
+    """
+    Build the cache key for the attribute facets of a product listing.
+    Facets do not depend on sorting or the page being shown.
+    """
+    params = normalized_params.copy()
+    for name in ("sort", "page"):
+        params.pop(name, None)
+    digest = hashlib.md5(params.urlencode().encode()).hexdigest()
+    return f"shop:facets:{generation}:{digest}"
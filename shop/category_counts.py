@@ -0,0 +1,85 @@
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+
+from shop.models import Category, Product
+
+
+def get_ancestor_ids(category_id):
+    """Return the ids of a category and every category above it."""
+    ancestor_ids = []
+    while category_id is not None and category_id not in ancestor_ids:
+        ancestor_ids.append(category_id)
+        category_id = (
+            Category.objects.filter(pk=category_id)
+            .values_list("parent_id", flat=True)
+            .first()
+        )
+    return ancestor_ids
+
+
+def adjust_product_count(category_id, delta):
+    """
+    Add delta active products to a category and to the subtree totals of
+    it and its ancestors, with F() updates so concurrent writers do not
+    overwrite each other. Counters never drop below zero.
+    """
+    if category_id is None or not delta:
+        return
+    Category.objects.filter(pk=category_id).update(
+        active_product_count=Greatest(F("active_product_count") + delta, 0)
+    )
+    adjust_subtree_count(category_id, delta)
+
+
+def adjust_subtree_count(category_id, delta):
+    """Add delta to the subtree totals of a category and its ancestors."""
+    if category_id is None or not delta:
+        return
+    Category.objects.filter(pk__in=get_ancestor_ids(category_id)).update(
+        subtree_product_count=Greatest(F("subtree_product_count") + delta, 0)
+    )
+
+
+def recompute_category_counts():
+    """
+    Rebuild every counter from the product table: one aggregate query,
+    then subtree totals summed bottom-up in memory. Returns the number of
+    categories whose counters changed.
+    """
+    direct = dict(
+        Product.objects.filter(is_active=True, category__isnull=False)
+        .values_list("category")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    categories = {category.pk: category for category in Category.objects.all()}
+    children = {}
+    for category in categories.values():
+        children.setdefault(category.parent_id, []).append(category.pk)
+
+    subtree = {}
+
+    def total(category_id, path=()):
+        if category_id not in subtree:
+            subtree[category_id] = direct.get(category_id, 0) + sum(
+                total(child_id, path + (category_id,))
+                for child_id in children.get(category_id, [])
+                if child_id not in path
+            )
+        return subtree[category_id]
+
+    changed = []
+    for category in categories.values():
+        active, nested = direct.get(category.pk, 0), total(category.pk)
+        if (category.active_product_count, category.subtree_product_count) != (
+            active,
+            nested,
+        ):
+            category.active_product_count = active
+            category.subtree_product_count = nested
+            changed.append(category)
+
+    Category.objects.bulk_update(
+        changed, ["active_product_count", "subtree_product_count"], batch_size=1000
+    )
+    return len(changed)
@@ -0,0 +1,369 @@
+import csv
+import json
+import os
+import uuid
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from shop.attributes import sync_product_attributes
+from shop.cache import bump_catalog_generation
+from shop.category_counts import recompute_category_counts
+from shop.models import Category, Product, ProductFeature
+from shop.stock import refresh_stock_mirror, set_stock_levels
+
+FEED_FORMATS = ("csv", "jsonl")
+
+# Product columns overwritten on conflict. Stock is set separately so
+# units held by active reservations are not handed out again.
+PRODUCT_UPDATE_FIELDS = [
+    "title",
+    "category",
+    "product_type",
+    "description",
+    "short_description",
+    "price",
+    "discounted_price",
+    "is_free",
+    "is_active",
+    "is_featured",
+    "updated_at",
+]
+
+PRODUCT_TYPES = {value for value, _ in Product.PRODUCT_TYPE_CHOICES}
+
+TRUE_VALUES = {"1", "true", "yes", "y", "on", "بله"}
+
+
+class FeedError(ValueError):
+    """Raised for a feed row that cannot be imported."""
+
+
+def _import_dir(name):
+    return Path(settings.PRODUCT_IMPORT_ROOT) / name
+
+
+def detect_feed_format(filename):
+    """Guess the feed format from a file name."""
+    extension = filename.rsplit(".", 1)[-1].lower()
+    if extension in ("jsonl", "ndjson"):
+        return "jsonl"
+    if extension == "csv":
+        return "csv"
+    raise FeedError(f"Unsupported feed file: {filename}")
+
+
+def iter_feed_rows(stream, feed_format):
+    """
+    Yield one row per product from a text stream without loading the
+    whole feed. CSV features are written as "name:value|name:value".
+    JSONL lines are yielded as text and parsed by the importer, so a
+    malformed line is reported with the other rejected rows.
+    """
+    if feed_format == "csv":
+        for row in csv.DictReader(stream):
+            features = row.pop("features", "") or ""
+            row["features"] = [
+                feature.split(":", 1)
+                for feature in features.split("|")
+                if ":" in feature
+            ]
+            yield row
+    elif feed_format == "jsonl":
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield line
+    else:
+        raise FeedError(f"Unsupported feed format: {feed_format}")
+
+
+def queue_feed(uploaded_file, feed_format):
+    """
+    Store an uploaded feed for the import_products command to pick up,
+    so a large feed is never imported inside a request. The file is
+    written under a temporary name and renamed, so the importer never
+    reads half an upload. Returns the queued path.
+    """
+    pending = _import_dir("pending")
+    pending.mkdir(parents=True, exist_ok=True)
+    name = f"{timezone.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}.{feed_format}"
+    path = pending / name
+    partial = pending / f".{name}.part"
+    with open(partial, "wb") as destination:
+        for chunk in uploaded_file.chunks():
+            destination.write(chunk)
+    os.replace(partial, path)
+    return path
+
+
+def queued_feeds():
+    """Return the queued feed files, oldest first."""
+    pending = _import_dir("pending")
+    if not pending.is_dir():
+        return []
+    return sorted(
+        path
+        for path in pending.iterdir()
+        if path.suffix[1:] in FEED_FORMATS and not path.name.startswith(".")
+    )
+
+
+def archive_feed(path, failed=False):
+    """Move a processed feed out of the queue."""
+    archive = _import_dir("failed" if failed else "done")
+    archive.mkdir(parents=True, exist_ok=True)
+    target = archive / path.name
+    os.replace(path, target)
+    return target
+
+
+def _parse_bool(value, default=False):
+    if value is None or value == "":
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in TRUE_VALUES
+
+
+def _parse_price(value, field):
+    if value is None or value == "":
+        return None
+    try:
+        price = Decimal(str(value).replace(",", ""))
+    except InvalidOperation:
+        raise FeedError(f"Invalid {field}: {value}")
+    if not price.is_finite():
+        raise FeedError(f"Invalid {field}: {value}")
+    if price < 0:
+        raise FeedError(f"Negative {field}: {value}")
+    return price
+
+
+def _parse_stock(value):
+    if value is None or value == "":
+        return 0
+    try:
+        stock = int(value)
+    except (OverflowError, ValueError):
+        raise FeedError(f"Invalid stock: {value}")
+    if stock < 0:
+        raise FeedError(f"Negative stock: {stock}")
+    return stock
+
+
+def _parse_features(value):
+    if isinstance(value, dict):
+        value = value.items()
+    features = []
+    for feature in value or []:
+        if isinstance(feature, dict):
+            name, feature_value = feature.get("name"), feature.get("value")
+        else:
+            name, feature_value = feature
+        name = str(name or "").strip()[:200]
+        if name:
+            features.append((name, str(feature_value or "").strip()[:500]))
+    return features
+
+
+class CatalogImporter:
+    """
+    Upsert products and their features from an iterable of feed rows.
+    Rows with a slug update the product with that slug; rows without one
+    always create a new product.
+
+    Rows are processed in chunks: each chunk is cleaned in memory,
+    written with one bulk upsert for products and one for features, and
+    committed on its own so a 100k-row feed never holds one huge
+    transaction. Model signals are skipped, so the catalog cache and
+    stock mirror are refreshed explicitly.
+    """
+
+    def __init__(self, chunk_size=1000, progress=None):
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.categories = dict(Category.objects.values_list("slug", "id"))
+        self.seen_slugs = set()
+        self.imported = 0
+        self.features = 0
+        self.errors = []
+        self.unknown_categories = set()
+
+    def run(self, rows):
+        """Import every row and return self for inspecting the counters."""
+        rows = iter(rows)
+        line = 0
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                break
+            self.import_chunk(chunk, first_line=line + 1)
+            line += len(chunk)
+            if self.progress:
+                self.progress(line, self.imported)
+
+        if self.imported:
+            # Bulk upserts skip the signals that keep these up to date
+            recompute_category_counts()
+            bump_catalog_generation()
+        return self
+
+    def import_chunk(self, rows, first_line=1):
+        """Clean, slug and write one chunk of feed rows."""
+        keyed, generated = [], []
+        for line, row in enumerate(rows, first_line):
+            try:
+                product, features = self.clean_row(row)
+            except (FeedError, TypeError, ValueError) as e:
+                self.errors.append((line, str(e)))
+                continue
+            # Only a slug given by the feed identifies an existing product
+            (keyed if product.slug else generated).append((product, features))
+
+        self.seen_slugs.update(product.slug for product, _ in keyed)
+        self.assign_slugs([product for product, _ in generated])
+        # One upsert statement cannot touch the same row twice; the last
+        # occurrence of a slug in the chunk wins.
+        keyed = list(
+            {product.slug: (product, features) for product, features in keyed}.values()
+        )
+        if not keyed and not generated:
+            return
+
+        with transaction.atomic():
+            products = Product.objects.bulk_create(
+                [product for product, _ in keyed],
+                update_conflicts=True,
+                unique_fields=["slug"],
+                update_fields=PRODUCT_UPDATE_FIELDS,
+            )
+            set_stock_levels({product.pk: product.stock for product in products})
+            # Generated slugs are new products; a clash fails the chunk
+            # instead of overwriting an unrelated product.
+            products += Product.objects.bulk_create(
+                [product for product, _ in generated]
+            )
+            self.upsert_features(
+                products, [features for _, features in keyed + generated]
+            )
+            sync_product_attributes([product.pk for product in products])
+
+        product_ids = [product.pk for product in products]
+        transaction.on_commit(lambda: refresh_stock_mirror(product_ids))
+        self.imported += len(products)
+
+    def clean_row(self, row):
+        """Turn one feed row into an unsaved Product and its features."""
+        if isinstance(row, str):
+            try:
+                row = json.loads(row)
+            except json.JSONDecodeError as e:
+                raise FeedError(f"Invalid JSON: {e}")
+        if not isinstance(row, dict):
+            raise FeedError("Row is not an object")
+
+        title = str(row.get("title") or "").strip()
+        if not title:
+            raise FeedError("Missing title")
+
+        price = _parse_price(row.get("price"), "price")
+        is_free = _parse_bool(row.get("is_free"))
+        if price is None and not is_free:
+            raise FeedError("Missing price")
+
+        product_type = row.get("product_type") or "educational_package"
+        if product_type not in PRODUCT_TYPES:
+            raise FeedError(f"Unknown product type: {product_type}")
+
+        category_slug = str(row.get("category") or "").strip()
+        category_id = self.categories.get(category_slug)
+        if category_slug and category_id is None:
+            self.unknown_categories.add(category_slug)
+
+        product = Product(
+            title=title[:300],
+            slug=str(row.get("slug") or "").strip()[:300],
+            category_id=category_id,
+            product_type=product_type,
+            description=row.get("description") or "",
+            short_description=str(row.get("short_description") or "")[:500],
+            price=price or Decimal("0"),
+            discounted_price=_parse_price(
+                row.get("discounted_price"), "discounted_price"
+            ),
+            is_free=is_free,
+            stock=_parse_stock(row.get("stock")),
+            is_active=_parse_bool(row.get("is_active"), default=True),
+            is_featured=_parse_bool(row.get("is_featured")),
+        )
+        # bulk_create skips Product.save(), so mirror its free-product rule
+        if product.is_free:
+            product.price = Decimal("0")
+            product.discounted_price = Decimal("0")
+
+        return product, _parse_features(row.get("features"))
+
+    def assign_slugs(self, products):
+        """
+        Give slugless products a Unicode slug from their title, suffixed
+        while another row of the feed or an existing product uses it.
+        Existing slugs are looked up with one query per round of suffixes.
+        """
+        bases = [
+            slugify(product.title, allow_unicode=True)[:280] or "product"
+            for product in products
+        ]
+        suffixes = [1] * len(products)
+        pending = list(range(len(products)))
+
+        while pending:
+            candidates = {}
+            for index in pending:
+                slug = bases[index]
+                if suffixes[index] > 1:
+                    slug = f"{slug}-{suffixes[index]}"
+                while slug in self.seen_slugs or slug in candidates:
+                    suffixes[index] += 1
+                    slug = f"{bases[index]}-{suffixes[index]}"
+                candidates[slug] = index
+
+            taken = set(
+                Product.objects.filter(slug__in=candidates).values_list(
+                    "slug", flat=True
+                )
+            )
+            pending = []
+            for slug, index in candidates.items():
+                if slug in taken:
+                    suffixes[index] += 1
+                    pending.append(index)
+                else:
+                    products[index].slug = slug
+                    self.seen_slugs.add(slug)
+
+    def upsert_features(self, products, features_per_product):
+        """Upsert features keyed by product and feature name."""
+        features = [
+            ProductFeature(
+                product_id=product.pk,
+                feature_name=name,
+                feature_value=value,
+                order=order,
+            )
+            for product, features in zip(products, features_per_product)
+            for order, (name, value) in enumerate(dict(features).items())
+        ]
+        if features:
+            ProductFeature.objects.bulk_create(
+                features,
+                update_conflicts=True,
+                unique_fields=["product", "feature_name"],
+                update_fields=["feature_value", "order"],
+            )
+            self.features += len(features)
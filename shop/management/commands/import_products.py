@@ -0,0 +1,115 @@
+import csv
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from shop.importers import (
+    FEED_FORMATS,
+    CatalogImporter,
+    FeedError,
+    archive_feed,
+    detect_feed_format,
+    iter_feed_rows,
+    queued_feeds,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Import or update shop products from a CSV or JSONL feed, or from "
+        "the feeds queued by the dashboard upload"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            nargs="?",
+            help="Path to the product feed file (imports queued feeds if omitted)",
+        )
+        parser.add_argument(
+            "--format",
+            choices=FEED_FORMATS,
+            help="Feed format (detected from the file extension by default)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Rows written per bulk upsert",
+        )
+        parser.add_argument(
+            "--watch",
+            action="store_true",
+            help="Keep running and import queued feeds every --interval seconds",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=30,
+            help="Seconds between queue checks while watching",
+        )
+
+    def handle(self, *args, **options):
+        if options["path"]:
+            self.import_feed(Path(options["path"]), options)
+            return
+
+        self.import_queued(options)
+        if not options["watch"]:
+            return
+
+        self.stdout.write("Watching for queued product feeds...")
+        while True:
+            time.sleep(options["interval"])
+            self.import_queued(options)
+
+    # --------------------------------------------------
+    # Helpers
+    # --------------------------------------------------
+
+    def import_queued(self, options):
+        for path in queued_feeds():
+            self.stdout.write(f"Importing queued feed {path.name}")
+            try:
+                self.import_feed(path, options)
+            except CommandError as e:
+                self.stderr.write(str(e))
+                archive_feed(path, failed=True)
+            else:
+                archive_feed(path)
+
+    def import_feed(self, path, options):
+        try:
+            feed_format = options["format"] or detect_feed_format(path.name)
+        except FeedError as e:
+            raise CommandError(e)
+
+        importer = CatalogImporter(
+            chunk_size=options["chunk_size"], progress=self.report_progress
+        )
+        try:
+            with open(path, encoding="utf-8-sig", newline="") as stream:
+                importer.run(iter_feed_rows(stream, feed_format))
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            raise CommandError(f"Cannot read feed: {e}")
+
+        for line, error in importer.errors[:50]:
+            self.stderr.write(f"  row {line}: {error}")
+        if importer.unknown_categories:
+            self.stdout.write(
+                self.style.WARNING(
+                    "Unknown categories (left empty): "
+                    + ", ".join(sorted(importer.unknown_categories))
+                )
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {importer.imported} products and {importer.features} "
+                f"features ({len(importer.errors)} rows skipped)."
+            )
+        )
+
+    def report_progress(self, rows_read, imported):
+        self.stdout.write(f"  {rows_read} rows read, {imported} products imported")
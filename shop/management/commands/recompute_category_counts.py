@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from shop.category_counts import recompute_category_counts
+
+
+class Command(BaseCommand):
+    help = "Recompute category product counters from the product table"
+
+    def handle(self, *args, **options):
+        changed = recompute_category_counts()
+        self.stdout.write(
+            self.style.SUCCESS(f"Updated product counters of {changed} categories.")
+        )
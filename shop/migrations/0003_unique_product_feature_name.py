@@ -0,0 +1,32 @@
+# Generated by Django 5.2.9 on 2026-10-19 04:44
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def remove_duplicate_features(apps, schema_editor):
+    """Keep the first feature of each name per product."""
+    ProductFeature = apps.get_model("shop", "ProductFeature")
+    keep_ids = (
+        ProductFeature.objects.values("product", "feature_name")
+        .annotate(keep_id=Min("id"))
+        .values("keep_id")
+    )
+    ProductFeature.objects.exclude(id__in=keep_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("shop", "0002_alter_product_image"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_features, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="productfeature",
+            constraint=models.UniqueConstraint(
+                fields=("product", "feature_name"), name="unique_product_feature_name"
+            ),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.9 on 2026-10-19 04:47
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+def fill_attributes(apps, schema_editor):
+    """Build the attribute map of existing products from their features."""
+    Product = apps.get_model("shop", "Product")
+    ProductFeature = apps.get_model("shop", "ProductFeature")
+
+    attributes = {}
+    features = ProductFeature.objects.order_by("product_id", "order", "id")
+    for product_id, name, value in features.values_list(
+        "product_id", "feature_name", "feature_value"
+    ).iterator():
+        attributes.setdefault(product_id, {})[name.strip()] = value.strip()
+
+    Product.objects.bulk_update(
+        [Product(pk=pk, attributes=value) for pk, value in attributes.items()],
+        ["attributes"],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("shop", "0003_unique_product_feature_name"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="attributes",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.RunPython(fill_attributes, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="product",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["attributes"],
+                name="product_attributes_gin",
+                opclasses=["jsonb_path_ops"],
+            ),
+        ),
+    ]
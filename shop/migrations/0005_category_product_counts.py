@@ -0,0 +1,55 @@
+# Generated by Django 5.2.9 on 2026-10-19 04:49
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_counts(apps, schema_editor):
+    """Count active products per category and per category subtree."""
+    Category = apps.get_model("shop", "Category")
+    Product = apps.get_model("shop", "Product")
+
+    direct = dict(
+        Product.objects.filter(is_active=True, category__isnull=False)
+        .values_list("category")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    categories = list(Category.objects.all())
+    parents = {category.pk: category.parent_id for category in categories}
+
+    subtree = {}
+    for category_id, count in direct.items():
+        seen = set()
+        while category_id is not None and category_id not in seen:
+            seen.add(category_id)
+            subtree[category_id] = subtree.get(category_id, 0) + count
+            category_id = parents.get(category_id)
+
+    for category in categories:
+        category.active_product_count = direct.get(category.pk, 0)
+        category.subtree_product_count = subtree.get(category.pk, 0)
+    Category.objects.bulk_update(
+        categories, ["active_product_count", "subtree_product_count"], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("shop", "0004_product_attributes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="active_product_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="subtree_product_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_counts, migrations.RunPython.noop),
+    ]
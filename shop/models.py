@@ -1,11 +1,14 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.urls import reverse
 from django.utils.text import slugify
 from django.core.validators import MinValueValidator
 from decimal import Decimal
 
+from core.models import CounterFieldsMixin
 
-class Category(models.Model):
+
+class Category(CounterFieldsMixin, models.Model):
     """
     Product Category Model with support for nested categories
     """
@@ -21,9 +24,17 @@ class Category(models.Model):
     )
     description = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
+
+    # Active products directly in this category / including subcategories,
+    # maintained incrementally by shop.signals
+    active_product_count = models.PositiveIntegerField(default=0, editable=False)
+    subtree_product_count = models.PositiveIntegerField(default=0, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    COUNTER_FIELDS = ("active_product_count", "subtree_product_count")
+
     class Meta:
         verbose_name = "Category"
         verbose_name_plural = "Categories"
@@ -48,7 +59,7 @@ class Category(models.Model):
         return children
 
 
-class Product(models.Model):
+class Product(CounterFieldsMixin, models.Model):
     """
     Main Product Model for the Shop
     """
@@ -93,7 +104,8 @@ class Product(models.Model):
     )
     is_free = models.BooleanField(default=False, help_text="Mark product as free")
 
-    # Inventory
+    # Inventory, only changed through the shop.stock helpers so concurrent
+    # reservations are never overwritten by a full save
     stock = models.PositiveIntegerField(default=0)
 
     # Media
@@ -108,10 +120,15 @@ class Product(models.Model):
     is_active = models.BooleanField(default=True)
     is_featured = models.BooleanField(default=False)
 
+    # Feature name -> value map kept in sync with ProductFeature rows
+    attributes = models.JSONField(default=dict, blank=True, editable=False)
+
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    COUNTER_FIELDS = ("stock",)
+
     class Meta:
         verbose_name = "Product"
         verbose_name_plural = "Products"
@@ -120,6 +137,11 @@ class Product(models.Model):
             models.Index(fields=["slug"]),
             models.Index(fields=["is_active", "-created_at"]),
             models.Index(fields=["product_type"]),
+            GinIndex(
+                fields=["attributes"],
+                opclasses=["jsonb_path_ops"],
+                name="product_attributes_gin",
+            ),
         ]
 
     def __str__(self):
@@ -183,6 +205,11 @@ class ProductFeature(models.Model):
         verbose_name = "Product Feature"
         verbose_name_plural = "Product Features"
         ordering = ["order", "id"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "feature_name"], name="unique_product_feature_name"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.product.title} - {self.feature_name}: {self.feature_value}"
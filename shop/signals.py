@@ -0,0 +1,111 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from shop.attributes import sync_product_attributes
+from shop.cache import bump_catalog_generation
+from shop.category_counts import adjust_product_count, adjust_subtree_count
+from shop.models import Category, Product, ProductFeature
+from shop.stock import forget_stock, refresh_stock_mirror
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=ProductFeature)
+@receiver(post_delete, sender=ProductFeature)
+def invalidate_catalog_cache(sender, **kwargs):
+    """
+    Bump the catalog generation once the write is committed so every
+    cached card and listing page is invalidated at once.
+    """
+    transaction.on_commit(bump_catalog_generation)
+
+
+@receiver(post_save, sender=Product)
+def sync_stock_mirror(sender, instance, **kwargs):
+    """Copy stock edited through the model into the cache mirror."""
+    product_id = instance.pk
+    transaction.on_commit(lambda: refresh_stock_mirror([product_id]))
+
+
+@receiver(post_delete, sender=Product)
+def drop_stock_mirror(sender, instance, **kwargs):
+    """Remove a deleted product from the cache mirror."""
+    product_id = instance.pk
+    transaction.on_commit(lambda: forget_stock(product_id))
+
+
+@receiver(post_save, sender=ProductFeature)
+@receiver(post_delete, sender=ProductFeature)
+def sync_attribute_map(sender, instance, **kwargs):
+    """Keep the product's indexed attribute map in step with its features."""
+    sync_product_attributes([instance.product_id])
+
+
+@receiver(pre_save, sender=Product)
+def remember_counted_category(sender, instance, **kwargs):
+    """Note which category counted the product before this save."""
+    instance._counted_category_id = None
+    if instance.pk:
+        previous = (
+            Product.objects.filter(pk=instance.pk)
+            .values_list("category_id", "is_active")
+            .first()
+        )
+        if previous and previous[1]:
+            instance._counted_category_id = previous[0]
+
+
+@receiver(post_save, sender=Product)
+def update_category_counts(sender, instance, **kwargs):
+    """Move the product between category counters when it changes."""
+    previous = getattr(instance, "_counted_category_id", None)
+    current = instance.category_id if instance.is_active else None
+    if previous != current:
+        adjust_product_count(previous, -1)
+        adjust_product_count(current, 1)
+
+
+@receiver(post_delete, sender=Product)
+def discount_deleted_product(sender, instance, **kwargs):
+    """Remove a deleted product from its category counters."""
+    if instance.is_active:
+        adjust_product_count(instance.category_id, -1)
+
+
+@receiver(pre_save, sender=Category)
+def remember_parent(sender, instance, **kwargs):
+    """Note the parent a category had before this save."""
+    instance._previous_parent_id = (
+        Category.objects.filter(pk=instance.pk)
+        .values_list("parent_id", flat=True)
+        .first()
+        if instance.pk
+        else None
+    )
+
+
+@receiver(post_save, sender=Category)
+def move_subtree_counts(sender, instance, created, **kwargs):
+    """Carry a moved category's subtree total to its new ancestors."""
+    previous_parent_id = getattr(instance, "_previous_parent_id", None)
+    if created or previous_parent_id == instance.parent_id:
+        return
+    moved = (
+        Category.objects.filter(pk=instance.pk)
+        .values_list("subtree_product_count", flat=True)
+        .first()
+    )
+    adjust_subtree_count(previous_parent_id, -(moved or 0))
+    adjust_subtree_count(instance.parent_id, moved or 0)
+
+
+@receiver(post_delete, sender=Category)
+def discount_deleted_category(sender, instance, **kwargs):
+    """
+    Take a deleted category's products out of its ancestors' totals; its
+    products are left without a category.
+    """
+    adjust_subtree_count(instance.parent_id, -instance.subtree_product_count)
@@ -10,9 +10,12 @@ class ProductSitemap(Sitemap):
     changefreq = "daily"  # Prices or stock might change frequently
     priority = 1.0  # Products are high value for SEO
 
+    url_name = "shop:product_detail"
+    lastmod_field = "updated_at"
+
     def items(self):
         # Only index products that are active
-        return Product.objects.filter(is_active=True)
+        return Product.objects.filter(is_active=True).only("slug", "updated_at")
 
     def lastmod(self, obj):
         return obj.updated_at
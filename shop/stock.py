@@ -0,0 +1,154 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import (
+    Case,
+    F,
+    OuterRef,
+    PositiveIntegerField,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Greatest
+
+from shop.cache import bump_catalog_generation
+from shop.models import Product
+
+
+class InsufficientStock(Exception):
+    """Raised when a product cannot cover the requested quantity."""
+
+    def __init__(self, product_id, quantity):
+        self.product_id = product_id
+        self.quantity = quantity
+        super().__init__(f"Insufficient stock for product {product_id}")
+
+
+def _stock_key(product_id):
+    return f"shop:stock:{product_id}"
+
+
+def decrement_stock(product_id, quantity):
+    """
+    Take stock with a single conditional UPDATE ... WHERE stock >= quantity.
+
+    The check and the write happen in one statement, so concurrent
+    checkouts can never drive stock below zero and no row is locked for
+    longer than the surrounding transaction. Returns whether it succeeded.
+    """
+    return bool(
+        Product.objects.filter(pk=product_id, stock__gte=quantity).update(
+            stock=F("stock") - quantity
+        )
+    )
+
+
+def increment_stock(product_id, quantity):
+    """Give previously taken stock back to a product."""
+    Product.objects.filter(pk=product_id).update(stock=F("stock") + quantity)
+
+
+def adjust_stock(product_id, delta):
+    """
+    Apply a manual stock correction, e.g. from an admin form, as a delta
+    with one F() update. Product.save() never writes stock, so holds
+    taken since the editor loaded the product are kept.
+    """
+    if not delta:
+        return
+    Product.objects.filter(pk=product_id).update(stock=Greatest(F("stock") + delta, 0))
+    transaction.on_commit(lambda: refresh_stock_mirror([product_id]))
+
+
+def set_stock_levels(levels):
+    """
+    Set the stock of products from the units on hand {product_id: units},
+    e.g. from a supplier feed, with one UPDATE. Units held by active
+    reservations are taken off in the same statement; releasing a hold
+    gives them back, so they are never counted twice.
+    """
+    from orders.models import ReservationStatusChoices, StockReservation
+
+    if not levels:
+        return
+    held = (
+        StockReservation.objects.filter(
+            product=OuterRef("pk"), status=ReservationStatusChoices.ACTIVE
+        )
+        .values("product")
+        .annotate(total=Sum("quantity"))
+        .values("total")
+    )
+    on_hand = Case(
+        *[
+            When(pk=product_id, then=Value(units))
+            for product_id, units in levels.items()
+        ],
+        output_field=PositiveIntegerField(),
+    )
+    Product.objects.filter(pk__in=levels).update(
+        stock=Greatest(on_hand - Coalesce(Subquery(held), 0), 0)
+    )
+
+
+def get_available_stock(product_id):
+    """
+    Return the available stock of a product from the cache mirror,
+    falling back to the database when the mirror has no entry.
+    """
+    return get_available_stock_many([product_id]).get(product_id, 0)
+
+
+def get_available_stock_many(product_ids):
+    """Return {product_id: available stock} with one cache round-trip."""
+    keys = {_stock_key(product_id): product_id for product_id in product_ids}
+    mirrored = cache.get_many(keys)
+    stock = {keys[key]: value for key, value in mirrored.items()}
+
+    missing = [product_id for product_id in product_ids if product_id not in stock]
+    if missing:
+        stock.update(_load_stock(missing))
+        cache.set_many(
+            {
+                _stock_key(product_id): stock.get(product_id, 0)
+                for product_id in missing
+            },
+            timeout=None,
+        )
+    return stock
+
+
+def refresh_stock_mirror(product_ids):
+    """
+    Copy the committed stock of products into the cache mirror.
+
+    The catalog generation is bumped when a product runs out or comes
+    back, so cached cards and listings show the right availability.
+    """
+    product_ids = list(product_ids)
+    if not product_ids:
+        return
+
+    keys = {_stock_key(product_id): product_id for product_id in product_ids}
+    previous = {keys[key]: value for key, value in cache.get_many(keys).items()}
+    current = _load_stock(product_ids)
+    cache.set_many(
+        {key: current.get(product_id, 0) for key, product_id in keys.items()},
+        timeout=None,
+    )
+
+    if any(
+        (previous[product_id] > 0) != (current.get(product_id, 0) > 0)
+        for product_id in previous
+    ):
+        bump_catalog_generation()
+
+
+def forget_stock(product_id):
+    """Drop a product from the cache mirror."""
+    cache.delete(_stock_key(product_id))
+
+
+def _load_stock(product_ids):
+    return dict(Product.objects.filter(pk__in=product_ids).values_list("id", "stock"))
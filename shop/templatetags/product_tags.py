@@ -1,34 +1,80 @@
 from django import template
 from django.utils import timezone
 from datetime import timedelta
+from core.cache import get_cached_widget_items, get_random_items
+from core.trending import get_trending
 from ..models import Product
+from ..cache import CATALOG_CACHE_TIMEOUT, CATALOG_NAMESPACE, get_catalog_generation
 
 register = template.Library()
 
 
-@register.inclusion_tag("shop/product_card.html")
-def render_product_card(product):
+@register.inclusion_tag("shop/product_card.html", takes_context=True)
+def render_product_card(context, product):
     # Logic for "New" badge (e.g., created in the last 7 days)
     is_new = product.created_at >= timezone.now() - timedelta(days=7)
 
+    # Look the generation up once per render instead of once per card,
+    # reusing the one the view already fetched when there is one
+    if "catalog_generation" not in context.render_context:
+        context.render_context["catalog_generation"] = (
+            context.get("catalog_generation") or get_catalog_generation()
+        )
+
     return {
         "product": product,
         "is_new": is_new,
+        "catalog_generation": context.render_context["catalog_generation"],
+        "catalog_cache_timeout": CATALOG_CACHE_TIMEOUT,
     }
 
 
 @register.simple_tag
 def get_free_products(limit=3):
-    return Product.objects.filter(is_free=True, is_active=True)[:limit]
+    return get_cached_widget_items(
+        f"shop:free_products:{limit}",
+        CATALOG_NAMESPACE,
+        Product.objects.filter(is_free=True, is_active=True)[:limit],
+    )
 
 
 @register.simple_tag
 def get_latest_products(limit=3):
-    return Product.objects.filter(is_active=True).order_by("-created_at")[:limit]
+    return get_cached_widget_items(
+        f"shop:latest_products:{limit}",
+        CATALOG_NAMESPACE,
+        Product.objects.filter(is_active=True).order_by("-created_at")[:limit],
+    )
 
 
 @register.simple_tag
 def get_discounted_products(limit=3):
-    return Product.objects.filter(
-        discounted_price__isnull=False, is_active=True
-    ).exclude(discounted_price=0)[:limit]
+    return get_cached_widget_items(
+        f"shop:discounted_products:{limit}",
+        CATALOG_NAMESPACE,
+        Product.objects.filter(discounted_price__isnull=False, is_active=True).exclude(
+            discounted_price=0
+        )[:limit],
+    )
+
+
+@register.simple_tag
+def get_random_products(limit=3):
+    return get_random_items(
+        "shop:active_products",
+        CATALOG_NAMESPACE,
+        Product.objects.filter(is_active=True),
+        limit,
+    )
+
+
+@register.simple_tag
+def get_trending_products(limit=3, window="7d"):
+    products = Product.objects.filter(is_active=True)
+    return get_trending(
+        "products",
+        products,
+        limit,
+        window=window,
+        fallback=products.order_by("-created_at"),
+    )
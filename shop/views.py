@@ -1,8 +1,38 @@
 from django.views.generic import ListView, DetailView
+from django.core.cache import cache
 from django.db.models import Q
+from django.http import Http404
+from django.template.loader import render_to_string
 from decimal import Decimal
+from cart.cart import CartSession
+from core.conditional import ConditionalGetMixin
+from core.trending import record_view_once
+from core.cache import (
+    CSRF_PLACEHOLDER,
+    claim_rebuild,
+    fill_csrf_placeholder,
+    get_versioned,
+    set_versioned,
+)
+from orders.recommendations import get_recommended_items
+from .attributes import (
+    ATTRIBUTE_PARAM,
+    attribute_filter,
+    get_attribute_facets,
+    parse_attribute_params,
+)
 from .models import Product, Category
+from .stock import get_available_stock
 from .forms import ProductFilterForm
+from .cache import (
+    CATALOG_CACHE_TIMEOUT,
+    CATALOG_NAMESPACE,
+    get_catalog_generation,
+    normalize_listing_params,
+    product_detail_cache_key,
+    product_facets_cache_key,
+    product_listing_cache_key,
+)
 
 
 class ProductListView(ListView):
@@ -15,9 +45,11 @@ class ProductListView(ListView):
     context_object_name = "products"
     paginate_by = 12
 
-    def get_queryset(self):
+    def get_base_queryset(self):
         """
-        Filter products based on search, category, price range, and type
+        Filter products based on search, category, price range, and type,
+        leaving attribute selections to get_queryset() so facets can be
+        counted without them
         """
         queryset = Product.objects.filter(is_active=True).select_related("category")
 
@@ -69,6 +101,23 @@ class ProductListView(ListView):
         if is_free == "true":
             queryset = queryset.filter(is_free=True)
 
+        return queryset
+
+    def get_selected_attributes(self):
+        return parse_attribute_params(self.request.GET.getlist(ATTRIBUTE_PARAM))
+
+    def get_queryset(self):
+        """
+        Apply the selected feature attributes and sorting to the filtered
+        products
+        """
+        queryset = self.get_base_queryset()
+
+        # Filter by feature attributes (answered by the GIN index)
+        selected_attributes = self.get_selected_attributes()
+        if selected_attributes:
+            queryset = queryset.filter(attribute_filter(selected_attributes))
+
         # Sorting
         sort_by = self.request.GET.get("sort", "-created_at")
         valid_sort_options = [
@@ -84,39 +133,124 @@ class ProductListView(ListView):
 
         return queryset
 
-    def get_context_data(self, **kwargs):
+    def get(self, request, *args, **kwargs):
         """
-        Add extra context for filters and categories
+        Serve the listing from the versioned fragment cache when possible,
+        skipping the product queries and template rendering entirely.
         """
-        context = super().get_context_data(**kwargs)
-
-        # Add filter form
-        context["filter_form"] = ProductFilterForm(self.request.GET)
+        self.listing_params = normalize_listing_params(request.GET)
+        self.catalog_generation = get_catalog_generation()
+        self.listing_cache_key = product_listing_cache_key(
+            self.listing_params, self.catalog_generation
+        )
 
-        # Add all categories with their subcategories
-        context["categories"] = Category.objects.filter(
-            is_active=True, parent=None
-        ).prefetch_related("subcategories")
+        listing_html = cache.get(self.listing_cache_key)
+        if listing_html is None:
+            return super().get(request, *args, **kwargs)
 
-        # Add current filters for display
-        context["current_search"] = self.request.GET.get("search", "")
-        context["current_category"] = self.request.GET.get("category", "")
-        context["current_type"] = self.request.GET.get("type", "")
-        context["current_sort"] = self.request.GET.get("sort", "-created_at")
+        self.object_list = Product.objects.none()
+        context = self.get_filter_context()
+        context["listing_html"] = fill_csrf_placeholder(listing_html, request)
+        return self.render_to_response(context)
 
-        # Product types for filter
-        context["product_types"] = Product.PRODUCT_TYPE_CHOICES
+    def get_filter_context(self):
+        """
+        Build the context shared by cached and freshly rendered listings
+        """
+        params = self.listing_params
 
         # Pagination query string
-        query_params = self.request.GET.copy()
+        query_params = params.copy()
         if "page" in query_params:
             query_params.pop("page")
-        context["query_string"] = query_params.urlencode()
+
+        return {
+            "view": self,
+            # Add filter form
+            "filter_form": ProductFilterForm(self.request.GET),
+            # Categories are only evaluated when the sidebar fragment misses
+            "categories": Category.objects.filter(
+                is_active=True, parent=None
+            ).prefetch_related("subcategories"),
+            # Add current filters for display
+            "current_search": params.get("search", ""),
+            "current_category": params.get("category", ""),
+            "current_type": params.get("type", ""),
+            "current_sort": params.get("sort", "-created_at"),
+            "current_min_price": params.get("min_price", ""),
+            "current_max_price": params.get("max_price", ""),
+            "current_is_free": params.get("is_free") == "true",
+            # Product types for filter
+            "product_types": Product.PRODUCT_TYPE_CHOICES,
+            "query_string": query_params.urlencode(),
+            "current_attributes": params.getlist(ATTRIBUTE_PARAM),
+            "attribute_facets": self.get_attribute_facets(),
+            "catalog_generation": self.catalog_generation,
+            "catalog_cache_timeout": CATALOG_CACHE_TIMEOUT,
+        }
+
+    def get_attribute_facets(self):
+        """
+        Return attribute facets for the current filters, each value with
+        its product count and the query string that toggles it. A selected
+        attribute's values are counted without its own selection, so
+        alternatives can be added
+        """
+        cache_key = product_facets_cache_key(
+            self.listing_params, self.catalog_generation
+        )
+        facets = cache.get(cache_key)
+        if facets is None:
+            facets = get_attribute_facets(
+                self.get_base_queryset(), self.get_selected_attributes()
+            )
+            cache.set(cache_key, facets, CATALOG_CACHE_TIMEOUT)
+
+        base_params = self.listing_params.copy()
+        base_params.pop("page", None)
+        selected = set(base_params.getlist(ATTRIBUTE_PARAM))
+
+        attribute_facets = []
+        for name, values in facets:
+            options = []
+            for value, count in values:
+                token = f"{name}:{value}"
+                params = base_params.copy()
+                params.setlist(
+                    ATTRIBUTE_PARAM,
+                    [item for item in sorted(selected) if item != token]
+                    + ([] if token in selected else [token]),
+                )
+                options.append(
+                    {
+                        "value": value,
+                        "count": count,
+                        "selected": token in selected,
+                        "query_string": params.urlencode(),
+                    }
+                )
+            attribute_facets.append({"name": name, "options": options})
+        return attribute_facets
+
+    def get_context_data(self, **kwargs):
+        """
+        Add extra context for filters and render the cacheable listing
+        """
+        context = super().get_context_data(**kwargs)
+        context.update(self.get_filter_context())
+
+        # Render with a placeholder token so the fragment can be shared
+        listing_html = render_to_string(
+            "shop/partials/product_listing.html",
+            {**context, "csrf_token": CSRF_PLACEHOLDER},
+        )
+        cache.set(self.listing_cache_key, listing_html, CATALOG_CACHE_TIMEOUT)
+        context["listing_html"] = fill_csrf_placeholder(listing_html, self.request)
 
         return context
 
 
-class ProductDetailView(DetailView):
+class ProductDetailView(ConditionalGetMixin, DetailView):
     """
     Display detailed information about a single product
     """
@@ -133,24 +267,114 @@ class ProductDetailView(DetailView):
         """
         return Product.objects.filter(is_active=True).select_related("category")
 
-    def get_context_data(self, **kwargs):
+    def get_validators(self):
         """
-        Add related products and features
+        Validate against the cached payload the page is rendered from and
+        the live stock: two cache round-trips, no query. Pages whose
+        payload is missing or stale take the normal path, which rebuilds it.
         """
-        context = super().get_context_data(**kwargs)
-        product = self.object
+        payload, generation, is_current = get_versioned(
+            CATALOG_NAMESPACE,
+            product_detail_cache_key(self.kwargs[self.slug_url_kwarg]),
+        )
+        if not payload or not is_current:
+            return None
+        product = payload["product"]
+        self.product_id = product.pk
+        self.stock = get_available_stock(product.pk)
+        return [product.pk, generation, self.stock]
+
+    def not_modified(self, response):
+        """Count the view of a visitor served from their own cache."""
+        record_view_once(self.request, "products", self.product_id)
+        return response
+
+    def get(self, request, *args, **kwargs):
+        """
+        Serve the page from a cached payload: one cache round-trip fetches
+        it together with the catalog generation. A payload built under an
+        older generation keeps being served while one request rebuilds it,
+        so a burst of traffic to one product never reaches the database.
+        """
+        slug = kwargs.get(self.slug_url_kwarg)
+        cache_key = product_detail_cache_key(slug)
+        payload, self.catalog_generation, is_current = get_versioned(
+            CATALOG_NAMESPACE, cache_key
+        )
+
+        if payload is None or (not is_current and claim_rebuild(cache_key)):
+            payload = self.build_payload(slug)
+            set_versioned(
+                cache_key, payload, self.catalog_generation, CATALOG_CACHE_TIMEOUT
+            )
 
-        # Get product features
-        context["features"] = product.features.all()
+        if not payload:
+            raise Http404("محصول مورد نظر یافت نشد")
 
-        # Get related products (same category, excluding current product)
-        if product.category:
-            context["related_products"] = Product.objects.filter(
-                category=product.category, is_active=True
-            ).exclude(id=product.id)[:4]
-        else:
-            context["related_products"] = Product.objects.filter(
-                is_active=True
-            ).exclude(id=product.id)[:4]
+        self.payload = payload
+        self.object = payload["product"]
+        record_view_once(request, "products", self.object.pk)
+        context = self.get_context_data(object=self.object)
+        return self.render_to_response(context)
 
+    def build_payload(self, slug):
+        """
+        Collect everything the page needs about a product: the product
+        with its category, features, discount info, related products and
+        the category breadcrumb. Returns {} for unknown or inactive products.
+        """
+        product = self.get_queryset().filter(slug=slug).first()
+        if product is None:
+            return {}
+
+        # Customers-also-bought recommendations, topped up from the same
+        # category when there are not enough purchases to go on
+        related_products = get_recommended_items(product, limit=4, model=Product)
+        if len(related_products) < 4:
+            fallback = Product.objects.filter(is_active=True).exclude(
+                id__in=[product.id] + [item.id for item in related_products]
+            )
+            if product.category:
+                fallback = fallback.filter(category=product.category)
+            related_products += list(fallback[: 4 - len(related_products)])
+
+        breadcrumb = []
+        category = product.category
+        while category is not None:
+            breadcrumb.insert(0, {"name": category.name, "slug": category.slug})
+            category = category.parent
+
+        final_price = product.get_final_price()
+        return {
+            "product": product,
+            "features": list(product.features.values("feature_name", "feature_value")),
+            "discount": {
+                "is_discounted": bool(product.is_discounted()),
+                "percentage": product.get_discount_percentage(),
+                "amount": product.price - final_price,
+                "final_price": final_price,
+            },
+            "related_products": related_products,
+            "breadcrumb": breadcrumb,
+        }
+
+    def get_context_data(self, **kwargs):
+        """
+        Add the cached product details and whether the product is already
+        in the visitor's cart
+        """
+        context = super().get_context_data(**kwargs)
+        context["features"] = self.payload["features"]
+        context["discount"] = self.payload["discount"]
+        context["related_products"] = self.payload["related_products"]
+        context["breadcrumb"] = self.payload["breadcrumb"]
+        context["catalog_generation"] = self.catalog_generation
+        # Stock changes on every sale, so it is read live from the mirror
+        # rather than from the cached product
+        context["stock"] = getattr(self, "stock", None)
+        if context["stock"] is None:
+            context["stock"] = get_available_stock(self.object.pk)
+        context["in_cart"] = CartSession(self.request.session).is_product_in_cart(
+            self.object.id, "product"
+        )
         return context
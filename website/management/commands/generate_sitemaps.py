@@ -0,0 +1,77 @@
+import time
+
+from django.contrib.sites.models import Site
+from django.core.management.base import BaseCommand
+
+from website.sitemap_files import generate_sitemaps, get_sitemap_root
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the sitemap index and gzip-compressed section pages to "
+        "SITEMAP_ROOT for nginx, rewriting only sections that changed"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--protocol",
+            default="https",
+            help="Protocol of the URLs listed in the sitemaps",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=10000,
+            help="URLs per sitemap page (the protocol allows up to 50000)",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Rewrite every section even if its data did not change",
+        )
+        parser.add_argument(
+            "--watch",
+            action="store_true",
+            help=(
+                "Keep running and regenerate changed sections every "
+                "--interval seconds"
+            ),
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=300,
+            help="Seconds between checks while watching",
+        )
+
+    def handle(self, *args, **options):
+        changed = self.generate(
+            options["protocol"], options["page_size"], options["force"]
+        )
+        if not options["watch"]:
+            if not changed:
+                self.stdout.write(self.style.SUCCESS("Sitemaps are up to date."))
+            return
+
+        self.stdout.write("Watching for sitemap changes...")
+        while True:
+            time.sleep(options["interval"])
+            self.generate(options["protocol"], options["page_size"], force=False)
+
+    # --------------------------------------------------
+    # Helpers
+    # --------------------------------------------------
+
+    def generate(self, protocol, page_size, force):
+        """Regenerate changed sections; unchanged ones cost one aggregate."""
+        base_url = f"{protocol}://{Site.objects.get_current().domain}"
+        changed = generate_sitemaps(base_url, page_size=page_size, force=force)
+
+        if changed:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Rewrote sitemap sections {', '.join(changed)} "
+                    f"in {get_sitemap_root()}."
+                )
+            )
+        return changed
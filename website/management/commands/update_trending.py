@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.trending import update_rankings
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute time-decayed trending scores from the hourly view buckets "
+        "and refresh the top article, course and product rankings"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--watch",
+            action="store_true",
+            help="Keep running and refresh the rankings every --interval seconds",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=300,
+            help="Seconds between refreshes while watching",
+        )
+
+    def handle(self, *args, **options):
+        self.refresh()
+        if not options["watch"]:
+            return
+
+        self.stdout.write("Refreshing trending rankings...")
+        while True:
+            time.sleep(options["interval"])
+            self.refresh()
+
+    # --------------------------------------------------
+    # Helpers
+    # --------------------------------------------------
+
+    def refresh(self):
+        ranked = update_rankings()
+        summary = ", ".join(
+            f"{kind}/{window}: {count}" for (kind, window), count in ranked.items()
+        )
+        self.stdout.write(self.style.SUCCESS(f"Updated trending rankings ({summary})."))
@@ -0,0 +1,193 @@
+import gzip
+import json
+import os
+from itertools import islice
+from urllib.parse import quote
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.urls import reverse
+
+from articles.sitemaps import ArticleSitemap
+from courses.sitemaps import CourseSitemap
+from shop.sitemaps import ProductSitemap
+from website.sitemaps import StaticViewSitemap
+
+SITEMAP_SECTIONS = {
+    "static": StaticViewSitemap,
+    "articles": ArticleSitemap,
+    "courses": CourseSitemap,
+    "products": ProductSitemap,
+}
+
+INDEX_FILENAME = "sitemap.xml"
+MANIFEST_FILENAME = "manifest.json"
+
+# Stand-in slug reversed once per section; real slugs are swapped in
+SLUG_MARKER = "slug-marker"
+
+# Characters reverse() leaves unquoted in URL paths
+SAFE_PATH_CHARACTERS = "/~:@!$&'()*+,;="
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+SITEMAP_NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+
+def get_sitemap_root():
+    return getattr(
+        settings, "SITEMAP_ROOT", os.path.join(settings.BASE_DIR, "sitemaps")
+    )
+
+
+def page_filename(section, page):
+    return f"sitemap-{section}-{page}.xml.gz"
+
+
+def _write_atomic(path, data):
+    """Replace a file in one step so nginx never serves half of it."""
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def section_signature(sitemap):
+    """
+    Return a value that changes whenever the section's URLs or their
+    lastmod do: row count and newest timestamp for model sections, the
+    locations themselves for static ones.
+    """
+    if not hasattr(sitemap, "url_name"):
+        return [sitemap.location(item) for item in sitemap.items()]
+    summary = sitemap.items().aggregate(
+        total=Count("pk"), latest=Max(sitemap.lastmod_field)
+    )
+    latest = summary["latest"]
+    return [summary["total"], latest.isoformat() if latest else None]
+
+
+def iter_section_urls(sitemap):
+    """
+    Yield (path, lastmod) for every item of a section. Model sections
+    read only slug and timestamp columns and reverse their route once.
+    """
+    if not hasattr(sitemap, "url_name"):
+        for item in sitemap.items():
+            yield sitemap.location(item), None
+        return
+
+    template = reverse(sitemap.url_name, kwargs={"slug": SLUG_MARKER})
+    rows = (
+        sitemap.items()
+        .order_by("pk")
+        .values_list("slug", sitemap.lastmod_field)
+        .iterator(chunk_size=2000)
+    )
+    for slug, lastmod in rows:
+        path = template.replace(SLUG_MARKER, quote(slug, safe=SAFE_PATH_CHARACTERS))
+        yield path, lastmod
+
+
+def render_urlset(sitemap, base_url, urls):
+    """Render one sitemap page as gzip-compressed XML."""
+    lines = [XML_HEADER, f'<urlset xmlns="{SITEMAP_NAMESPACE}">\n']
+    for path, lastmod in urls:
+        lines.append(f"<url><loc>{escape(base_url + path)}</loc>")
+        if lastmod:
+            lines.append(f"<lastmod>{lastmod.date().isoformat()}</lastmod>")
+        if sitemap.changefreq:
+            lines.append(f"<changefreq>{sitemap.changefreq}</changefreq>")
+        if sitemap.priority is not None:
+            lines.append(f"<priority>{sitemap.priority}</priority>")
+        lines.append("</url>\n")
+    lines.append("</urlset>\n")
+    return gzip.compress("".join(lines).encode(), mtime=0)
+
+
+def write_section(name, sitemap, base_url, page_size, root, previous_pages=0):
+    """
+    Write the pages of one section and delete pages it no longer fills.
+    Returns the number of pages written.
+    """
+    urls = iter_section_urls(sitemap)
+    pages = 0
+    while True:
+        chunk = list(islice(urls, page_size))
+        if not chunk:
+            break
+        pages += 1
+        _write_atomic(
+            os.path.join(root, page_filename(name, pages)),
+            render_urlset(sitemap, base_url, chunk),
+        )
+
+    for page in range(pages + 1, previous_pages + 1):
+        try:
+            os.remove(os.path.join(root, page_filename(name, page)))
+        except FileNotFoundError:
+            pass
+    return pages
+
+
+def write_index(manifest, base_url, root):
+    """Write the sitemap index listing every page of every section."""
+    lines = [XML_HEADER, f'<sitemapindex xmlns="{SITEMAP_NAMESPACE}">\n']
+    for name, section in manifest.items():
+        for page in range(1, section["pages"] + 1):
+            lines.append(
+                f"<sitemap><loc>{escape(base_url)}/{page_filename(name, page)}</loc>"
+            )
+            if section["lastmod"]:
+                lines.append(f"<lastmod>{section['lastmod']}</lastmod>")
+            lines.append("</sitemap>\n")
+    lines.append("</sitemapindex>\n")
+    _write_atomic(os.path.join(root, INDEX_FILENAME), "".join(lines).encode())
+
+
+def generate_sitemaps(base_url, page_size=10000, force=False, root=None):
+    """
+    Regenerate the static sitemap files under root (SITEMAP_ROOT by
+    default). Sections whose signature matches the last run are left
+    alone. Returns the names of the sections that were rewritten.
+    """
+    root = root or get_sitemap_root()
+    os.makedirs(root, exist_ok=True)
+    manifest_path = os.path.join(root, MANIFEST_FILENAME)
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        manifest = {}
+    if manifest.get("base_url") != base_url or manifest.get("page_size") != page_size:
+        force = True
+    sections = manifest.get("sections", {})
+
+    changed = []
+    for name, sitemap_class in SITEMAP_SECTIONS.items():
+        sitemap = sitemap_class()
+        signature = section_signature(sitemap)
+        previous = sections.get(name, {})
+        if not force and previous.get("signature") == signature:
+            continue
+
+        pages = write_section(
+            name, sitemap, base_url, page_size, root, previous.get("pages", 0)
+        )
+        latest = signature[1] if hasattr(sitemap, "url_name") else None
+        sections[name] = {
+            "signature": signature,
+            "pages": pages,
+            "lastmod": latest[:10] if latest else None,
+        }
+        changed.append(name)
+
+    if changed or not os.path.exists(os.path.join(root, INDEX_FILENAME)):
+        write_index(sections, base_url, root)
+        _write_atomic(
+            manifest_path,
+            json.dumps(
+                {"base_url": base_url, "page_size": page_size, "sections": sections}
+            ).encode(),
+        )
+    return changed
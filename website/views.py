@@ -1,5 +1,8 @@
 from django.shortcuts import render
-from django.http import HttpResponse
+import os
+
+from django.contrib.sitemaps.views import sitemap
+from django.http import FileResponse, Http404, HttpResponse
 from django.contrib import messages
 from django.urls import reverse_lazy
 from django.views.generic import CreateView, FormView, TemplateView, View
@@ -10,6 +13,7 @@ from .forms import (
     JobApplicationForm,
 )
 from .models import ConsultationRequest, JobApplication
+from .sitemap_files import INDEX_FILENAME, SITEMAP_SECTIONS, get_sitemap_root
 
 
 class IndexView(TemplateView):
@@ -136,3 +140,19 @@ class Custom404View(View):
 def ads_txt(request):
     content = """google.com, pub-1234567890123456, DIRECT, f08c47fec0942fa0"""
     return HttpResponse(content, content_type="text/plain")
+
+
+def sitemap_file(request, filename=INDEX_FILENAME):
+    """
+    Serve a pre-generated sitemap file. nginx serves these directly in
+    production; until generate_sitemaps has run the index is rendered
+    from the database instead.
+    """
+    path = os.path.join(get_sitemap_root(), filename)
+    if not os.path.exists(path):
+        if filename == INDEX_FILENAME:
+            return sitemap(request, sitemaps=SITEMAP_SECTIONS)
+        raise Http404
+    if filename == INDEX_FILENAME:
+        return FileResponse(open(path, "rb"), content_type="application/xml")
+    return FileResponse(open(path, "rb"))